@@ -0,0 +1,38 @@
+from pathlib import Path
+from typing import Tuple
+
+import streamlit as st
+
+from src.compaction import compact_club_metrics, with_aliases
+from src.database import DB_PATH, build_database, source_matches
+from src.datastore import ClubMetricsStore, build_store
+from src.storage import CLUB_METRICS_CSV, club_metrics_signature, read_club_metrics
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_store(signature: Tuple) -> ClubMetricsStore:
+    return build_store(compact_club_metrics(read_club_metrics()))
+
+
+def get_store() -> ClubMetricsStore:
+    """Shared club metrics store, reloaded when the processed files change."""
+    if not CLUB_METRICS_CSV.exists():
+        from src.pipeline import run as run_pipeline
+
+        run_pipeline()
+    return _load_store(club_metrics_signature())
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _ensure_database(signature: Tuple) -> Path:
+    if not source_matches(signature, DB_PATH):
+        from src.features import load_raw_data
+
+        build_database(load_raw_data(), with_aliases(get_store().frame), source=signature)
+    return DB_PATH
+
+
+def get_database() -> Path:
+    """Path to the SQLite backend, rebuilt when it predates the processed club metrics files."""
+    get_store()  # Runs the pipeline first when the processed files are missing.
+    return _ensure_database(club_metrics_signature())
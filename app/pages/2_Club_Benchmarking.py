@@ -3,7 +3,6 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
-import pandas as pd
 import streamlit as st
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -13,27 +12,63 @@ for path in (ROOT, APP_DIR):
         sys.path.append(str(path))
 
 from components.charts import bar_chart
-from src.utils import PROCESSED_DIR
+from components.data import get_database, get_store
+from src import database
+from src.benchmarking import (
+    COMPONENTS,
+    TIER_LABELS,
+    WEIGHTS,
+    component_matrix,
+    cpi_for_weights,
+    season_ranks,
+    tier_codes,
+    weight_sweep,
+)
 
 st.set_page_config(page_title="Club Benchmarking", layout="wide")
 
-@st.cache_data
-def load_data() -> pd.DataFrame:
-    return pd.read_csv(PROCESSED_DIR / "club_metrics.csv")
+COLUMNS = ["team_name", "market_tier", "cpi", "cpi_tier", "fan_demand_score", "revenue_potential_score"]
+
+
+@st.cache_data(show_spinner=False)
+def load_rank_stability(season_df, weights: tuple, concentration: float):
+    # Keyed on the season's rows, so a pipeline rerun invalidates the sweep.
+    sweep = weight_sweep(season_df, concentration=concentration, center=dict(zip(COMPONENTS, weights)))
+    return sweep[["team_name", "cpi_base", "cpi_min", "cpi_max", "rank_min", "rank_max", "p_tier_flip"]]
+
+
+def reweighted_ranking(store, season: int, weights: dict):
+    """Season ranking under custom weights from precomputed component scores."""
+    season_df = store.season(season)
+    cpi = cpi_for_weights(component_matrix(season_df), weights)
+    tiers = TIER_LABELS[tier_codes(season_ranks(cpi, season_df["season"].to_numpy()))[:, 0]]
+    return season_df[COLUMNS].assign(cpi=cpi[:, 0], cpi_tier=tiers)
 
 
 def main() -> None:
     st.title("Club Benchmarking")
-    df = load_data()
+    store = get_store()
+    tiers = sorted(store.latest["market_tier"].unique())
 
-    season = st.sidebar.selectbox("Season", sorted(df["season"].unique()), index=len(df["season"].unique()) - 1)
-    market_filter = st.sidebar.multiselect("Market Tier", sorted(df["market_tier"].unique()), default=sorted(df["market_tier"].unique()))
+    season = st.sidebar.selectbox("Season", store.seasons, index=len(store.seasons) - 1)
+    market_filter = st.sidebar.multiselect("Market Tier", tiers, default=tiers)
+    with st.sidebar.expander("CPI weights"):
+        raw_weights = {
+            name: st.slider(name.replace("_", " ").title(), 0.0, 1.0, WEIGHTS[name], 0.05) for name in COMPONENTS
+        }
+    total = sum(raw_weights.values()) or 1.0
+    weights = {name: value / total for name, value in raw_weights.items()}
 
-    filtered = df[(df["season"] == season) & (df["market_tier"].isin(market_filter))]
-    ranking = filtered.sort_values("cpi", ascending=False)
+    if raw_weights == WEIGHTS:
+        ranking = database.club_metrics(season, market_filter, columns=COLUMNS, path=get_database())
+    else:
+        ranking = reweighted_ranking(store, season, weights)
+        ranking = ranking[ranking["market_tier"].isin(market_filter)]
+        st.caption("CPI re-ranked with custom weights: " + ", ".join(f"{k} {v:.0%}" for k, v in weights.items()))
+    ranking = ranking.sort_values("cpi", ascending=False)
 
     st.dataframe(
-        ranking[["team_name", "market_tier", "cpi", "cpi_tier", "fan_demand_score", "revenue_potential_score"]]
+        ranking[COLUMNS]
         .style
         .background_gradient(subset=["cpi"], cmap="Blues")
         .format({"cpi": "{:.1f}", "fan_demand_score": "{:.1f}", "revenue_potential_score": "{:.1f}"}),
@@ -43,6 +78,18 @@ def main() -> None:
     top10 = ranking.head(10)
     st.plotly_chart(bar_chart(top10, "team_name", "cpi", title="Top 10 CPI Clubs"), use_container_width=True)
 
+    st.subheader("Rank Stability")
+    concentration = st.slider(
+        "Weight certainty", 10.0, 200.0, 50.0, 10.0, help="Higher values sample weights closer to the ones above."
+    )
+    stability = load_rank_stability(store.season(season), tuple(weights[name] for name in COMPONENTS), concentration)
+    st.dataframe(
+        stability.sort_values("cpi_base", ascending=False)
+        .style
+        .format({"cpi_base": "{:.1f}", "cpi_min": "{:.1f}", "cpi_max": "{:.1f}", "p_tier_flip": "{:.0%}"}),
+        use_container_width=True,
+    )
+
 
 if __name__ == "__main__":
     main()
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
+from typing import Dict
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -13,39 +15,78 @@ for path in (ROOT, APP_DIR):
         sys.path.append(str(path))
 
 from components.charts import scatter_chart
-from src.features import build_price_sensitivity_model
-from src.utils import PROCESSED_DIR
+from components.data import get_store
+from src.datastore import file_signature
+from src.figures import load_plotly_figure
+from src.model_registry import PRICE_MODEL_PATH, get_price_model
+from src.screening import SCREENS, screen, screen_summary, threshold_sweep
+from src.storage import CLUB_METRICS_CSV, CLUB_METRICS_PARQUET
 
 st.set_page_config(page_title="Demand Insights", layout="wide")
 
-@st.cache_data
-def load_data() -> pd.DataFrame:
-    return pd.read_csv(PROCESSED_DIR / "club_metrics.csv")
+PAGE_SCREENS = ["under_monetized", "demand_constrained"]
+# (label, min, max, step) for each screened column's threshold slider.
+THRESHOLD_SLIDERS = {
+    "attendance_pct": ("attendance %", 0.30, 1.00, 0.01),
+    "ticket_price_proxy": ("price proxy", 20.0, 60.0, 0.5),
+}
+PRICE_SWEEP = np.arange(20.0, 60.5, 0.5)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def load_price_model(signature):
+    """Saved price model; refit only if the club metrics no longer match it."""
+    return get_price_model(get_store().frame)
+
+
+def threshold_controls() -> Dict[str, Dict[str, float]]:
+    """Sliders for every threshold of the page's screens, defaulting to ``SCREENS``."""
+    thresholds: Dict[str, Dict[str, float]] = {}
+    with st.expander("Screen thresholds"):
+        for name in PAGE_SCREENS:
+            spec = SCREENS[name]
+            columns = st.columns(len(spec.rules))
+            thresholds[name] = {}
+            for column, (param, rule) in zip(columns, spec.rules.items()):
+                label, low, high, step = THRESHOLD_SLIDERS[rule.column]
+                thresholds[name][param] = column.slider(
+                    f"{spec.label}: {label} {rule.op}", low, high, float(spec.thresholds[param]), step, key=f"{name}.{param}"
+                )
+    return thresholds
 
 
 def main() -> None:
     st.title("Demand Insights")
-    df = load_data()
-
-    latest = df[df["season"] == df["season"].max()]
-    st.plotly_chart(
-        scatter_chart(latest, "ticket_price_proxy", "attendance_pct", "market_tier", "team_name", "Demand vs Price Proxy"),
-        use_container_width=True,
-    )
+    store = get_store()
+    latest = store.latest
+    demand_fig = load_plotly_figure("demand_vs_price")
+    if demand_fig is None:
+        demand_fig = scatter_chart(
+            latest, "ticket_price_proxy", "attendance_pct", "market_tier", "team_name", "Demand vs Price Proxy"
+        )
+    st.plotly_chart(demand_fig, use_container_width=True)
 
-    model = build_price_sensitivity_model(df)
+    model = load_price_model(file_signature([CLUB_METRICS_PARQUET, CLUB_METRICS_CSV, PRICE_MODEL_PATH])).result
     st.subheader("Price Sensitivity Proxy")
     st.write(f"R2: {model.r2:.2f}")
     st.write(pd.DataFrame([model.coefficients]))
 
-    under = latest[(latest["attendance_pct"] > 0.8) & (latest["ticket_price_proxy"] < 34)]
-    constrained = latest[(latest["attendance_pct"] < 0.65) & (latest["ticket_price_proxy"] < 32)]
+    thresholds = threshold_controls()
+    for name in PAGE_SCREENS:
+        st.subheader(f"{SCREENS[name].label} Clubs")
+        members = screen(latest, name, thresholds=thresholds[name])
+        st.dataframe(members[["team_name", "attendance_pct", "ticket_price_proxy"]])
 
-    st.subheader("Under-monetized Clubs")
-    st.dataframe(under[["team_name", "attendance_pct", "ticket_price_proxy"]].sort_values("attendance_pct", ascending=False))
+    st.subheader("Screen Members by Season")
+    st.dataframe(screen_summary(store.frame, thresholds))
 
-    st.subheader("Demand-constrained Clubs")
-    st.dataframe(constrained[["team_name", "attendance_pct", "ticket_price_proxy"]].sort_values("attendance_pct"))
+    st.subheader(f"Price Threshold Sweep ({store.latest_season})")
+    sweeps = {
+        SCREENS[name].label: threshold_sweep(latest, name, {"max_ticket_price": PRICE_SWEEP}, thresholds[name])
+        .set_index("max_ticket_price")["members"]
+        for name in PAGE_SCREENS
+    }
+    st.line_chart(pd.DataFrame(sweeps))
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
+from typing import Optional, Tuple
 
 import pandas as pd
 import streamlit as st
@@ -13,43 +14,95 @@ for path in (ROOT, APP_DIR):
         sys.path.append(str(path))
 
 from components.charts import waterfall_chart
-from src.simulator import recommend_scenario, simulate_scenario
-from src.utils import PROCESSED_DIR
+from components.data import get_store
+from src.datastore import file_signature
+from src.elasticity import attach_elasticities, load_elasticities
+from src.simulator import recommend_scenarios, recommendation_from_frame, simulate_scenario
+from src.surfaces import ResponseSurface, load_surface, surface_paths
+from src.uncertainty import monte_carlo_bands
 
 st.set_page_config(page_title="Revenue Simulator", layout="wide")
 
 @st.cache_data
-def load_data() -> pd.DataFrame:
-    return pd.read_csv(PROCESSED_DIR / "club_metrics.csv")
+def load_recommendations(df: pd.DataFrame) -> pd.DataFrame:
+    return recommend_scenarios(df)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_response_surface(season: int, variant: str, signature: Tuple) -> Optional[ResponseSurface]:
+    return load_surface(season, variant)
 
 
 def main() -> None:
     st.title("Revenue Opportunity Simulator")
-    df = load_data()
+    store = get_store()
 
-    latest = df[df["season"] == df["season"].max()]
+    latest = store.latest
     club = st.sidebar.selectbox("Club", latest["team_name"].sort_values())
+    elasticities = load_elasticities()
+    use_club_elasticities = st.sidebar.checkbox(
+        "Per-club elasticities",
+        value=False,
+        disabled=elasticities is None,
+        help=(
+            "Use bootstrap-estimated price and win elasticities instead of the league defaults, "
+            "where the club's or its market tier's interval has the expected sign."
+        ),
+    )
+    if use_club_elasticities and elasticities is not None:
+        latest = attach_elasticities(latest, elasticities)
 
-    row = latest[latest["team_name"] == club].iloc[0]
+    row = latest.loc[store.club_row(club).name]
+    variant = "club" if use_club_elasticities and elasticities is not None else "default"
+    surface = load_response_surface(
+        store.latest_season, variant, file_signature(surface_paths(store.latest_season, variant))
+    )
+    if surface is not None and not surface.covers(row):
+        surface = None
+    if use_club_elasticities and elasticities is not None:
+        if row["elasticity_source"] == "default":
+            st.sidebar.caption("No plausible club or market-tier estimate; using the league defaults.")
+        else:
+            level = "club" if row["elasticity_source"] == "team_id" else "market-tier"
+            st.sidebar.caption(
+                f"Price elasticity {row['price_elasticity']:.2f}, win elasticity {row['win_elasticity']:.2f} "
+                f"({level} estimate)"
+            )
 
     price_change = st.sidebar.slider("Ticket price change %", -10, 15, 3) / 100
     marketing_lift = st.sidebar.slider("Marketing lift %", 0, 20, 5) / 100
     win_change = st.sidebar.slider("Win% change", -5, 10, 2) / 100
     market_condition = st.sidebar.selectbox("Market conditions", ["Strong", "Neutral", "Soft"])
-
-    result = simulate_scenario(row, price_change, marketing_lift, win_change, market_condition)
+    use_monte_carlo = st.sidebar.checkbox("Monte Carlo confidence band", value=False)
+
+    if surface is not None:
+        result = surface.simulate(row["team_id"], price_change, marketing_lift, win_change, market_condition)
+    else:
+        result = simulate_scenario(row, price_change, marketing_lift, win_change, market_condition)
+    band_low, band_high = result.confidence_low, result.confidence_high
+    band_label = "Confidence band"
+    if use_monte_carlo:
+        bands = monte_carlo_bands(
+            latest.loc[[row.name]], price_change, marketing_lift, win_change, market_condition, n_samples=50_000
+        ).iloc[0]
+        band_low, band_high = bands["revenue_p10"], bands["revenue_p90"]
+        band_label = "P10-P90 revenue band"
 
     col1, col2, col3 = st.columns(3)
     col1.metric("Projected attendance", f"{result.projected_attendance:,.0f}", f"{result.attendance_change_pct*100:.1f}%")
     col2.metric("Projected revenue proxy", f"${result.projected_revenue/1_000_000:.1f}M", f"{result.revenue_change_pct*100:.1f}%")
-    col3.metric("Confidence band", f"${result.confidence_low/1_000_000:.1f}M - ${result.confidence_high/1_000_000:.1f}M")
+    col3.metric(band_label, f"${band_low/1_000_000:.1f}M - ${band_high/1_000_000:.1f}M")
 
     base_revenue = row["home_attendance"] * row["ticket_price_proxy"]
     change = result.projected_revenue - base_revenue
     st.plotly_chart(waterfall_chart(base_revenue, change, "Revenue Proxy Impact"), use_container_width=True)
 
     st.subheader("Recommended Scenario (Risk-Adjusted)")
-    params, rec = recommend_scenario(row)
+    if surface is not None:
+        recommendation = surface.recommend().loc[str(row["team_id"])]
+    else:
+        recommendation = load_recommendations(latest).loc[row.name]
+    params, rec = recommendation_from_frame(recommendation)
     st.write(
         f"Price +{params['price_change_pct']*100:.0f}%, "
         f"Marketing +{params['marketing_lift_pct']*100:.0f}%, "
@@ -3,7 +3,6 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
-import pandas as pd
 import streamlit as st
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -12,27 +11,28 @@ for path in (ROOT, APP_DIR):
     if str(path) not in sys.path:
         sys.path.append(str(path))
 
+from components.data import get_store
 from src.memos import build_club_memo
-from src.utils import MEMOS_DIR, PROCESSED_DIR
+from src.utils import MEMOS_DIR
 
 st.set_page_config(page_title="Club Strategy Memos", layout="wide")
 
-@st.cache_data
-def load_data() -> pd.DataFrame:
-    return pd.read_csv(PROCESSED_DIR / "club_metrics.csv")
-
 
 def main() -> None:
     st.title("Club Strategy Memos")
-    df = load_data()
-    latest = df[df["season"] == df["season"].max()]
+    store = get_store()
 
-    club = st.selectbox("Select club", latest["team_name"].sort_values())
-    row = latest[latest["team_name"] == club].iloc[0]
+    club = st.selectbox("Select club", store.latest["team_name"].sort_values())
+    row = store.club_row(club)
 
     memo_text = build_club_memo(row)
     st.markdown(memo_text)
 
+    if "driver_1" in row.index:
+        st.caption("CPI points contributed by each key driver")
+        for column, i in zip(st.columns(3), range(1, 4)):
+            column.metric(row[f"driver_{i}"], f"{row[f'driver_{i}_contribution']:.1f}")
+
     file_name = f"{row['team_id']}_memo.md"
     st.download_button(
         label="Download memo",
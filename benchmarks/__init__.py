@@ -0,0 +1 @@
+"""Pipeline benchmark suite."""
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.service import DEFAULT_HOST, request
+from src.simulator import DEFAULT_GRID, MARKET_ADJUST
+from src.surfaces import SURFACE_LEVERS
+from src.utils import setup_logging
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parents[1]
+# Share of requests per endpoint; the rest are /simulate batches.
+MIX = {"clubs": 0.1, "rankings": 0.1, "recommend": 0.1}
+# Levers drawn from the default grid repeat often (warm cache); the
+# whole-percent slider lattice mostly misses.
+LATTICES = {"default": DEFAULT_GRID, "lattice": SURFACE_LEVERS}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((DEFAULT_HOST, 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(host: str, port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            await request(reader, writer, "GET", "/health")
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+def request_plan(
+    team_ids: Sequence[str], n_requests: int, batch: int, lattice: str, seed: int
+) -> List[Tuple[str, str, str, Optional[Dict[str, Any]]]]:
+    """Seeded list of (endpoint, method, target, payload)."""
+    rng = np.random.default_rng(seed)
+    levers = LATTICES[lattice]
+    conditions = list(MARKET_ADJUST)
+    endpoints = list(MIX) + ["simulate"]
+    choices = rng.choice(len(endpoints), size=n_requests, p=list(MIX.values()) + [1 - sum(MIX.values())])
+    plan = []
+    for choice in choices:
+        endpoint = endpoints[choice]
+        team_id = str(rng.choice(team_ids))
+        if endpoint == "clubs":
+            plan.append((endpoint, "GET", f"/clubs/{team_id}", None))
+        elif endpoint == "rankings":
+            plan.append((endpoint, "GET", "/rankings?n=10", None))
+        elif endpoint == "recommend":
+            plan.append((endpoint, "GET", f"/recommend?team_id={team_id}", None))
+        else:
+            scenarios = [
+                {
+                    "team_id": str(rng.choice(team_ids)),
+                    **{lever: float(rng.choice(values)) for lever, values in levers.items()},
+                    "market_condition": conditions[rng.integers(len(conditions))],
+                }
+                for _ in range(batch)
+            ]
+            plan.append((endpoint, "POST", "/simulate", {"scenarios": scenarios}))
+    return plan
+
+
+async def run_load(
+    host: str, port: int, plan: List[Tuple[str, str, str, Optional[Dict[str, Any]]]], connections: int
+) -> Tuple[Dict[str, List[float]], int, float]:
+    """Replay ``plan`` over ``connections`` keep-alive connections; latencies in ms per endpoint."""
+    latencies: Dict[str, List[float]] = {}
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in plan:
+        queue.put_nowait(item)
+
+    async def worker() -> None:
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while not queue.empty():
+                endpoint, method, target, payload = queue.get_nowait()
+                start = time.perf_counter()
+                status, _ = await request(reader, writer, method, target, payload)
+                latencies.setdefault(endpoint, []).append((time.perf_counter() - start) * 1000)
+                errors += status != 200
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(connections)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def summarize(latencies: Dict[str, List[float]], errors: int, elapsed: float) -> Dict[str, Any]:
+    rows = {"all": [x for values in latencies.values() for x in values], **latencies}
+    return {
+        "requests": len(rows["all"]),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "qps": round(len(rows["all"]) / elapsed, 1),
+        "latency_ms": {
+            name: {
+                "count": len(values),
+                "p50": round(float(np.percentile(values, 50)), 3),
+                "p99": round(float(np.percentile(values, 99)), 3),
+                "max": round(float(np.max(values)), 3),
+            }
+            for name, values in rows.items()
+        },
+    }
+
+
+async def load_test(args: argparse.Namespace) -> Dict[str, Any]:
+    host, port = args.host, args.port
+    server = None
+    if port is None:
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "src.service", "--host", host, "--port", str(port)], cwd=ROOT
+        )
+    try:
+        await wait_until_up(host, port)
+        reader, writer = await asyncio.open_connection(host, port)
+        _, clubs = await request(reader, writer, "GET", "/clubs")
+        team_ids = [club["team_id"] for club in clubs["clubs"]]
+        plan = request_plan(team_ids, args.requests, args.batch, args.lattice, args.seed)
+        report = summarize(*await run_load(host, port, plan, args.connections))
+        _, health = await request(reader, writer, "GET", "/health")
+        writer.close()
+        report.update({"connections": args.connections, "batch": args.batch, "lattice": args.lattice, "cache": health["cache"]})
+        return report
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the scenario service and report latency percentiles.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, help="Target a running service (default: start one).")
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=10, help="Scenarios per /simulate request.")
+    parser.add_argument("--lattice", choices=sorted(LATTICES), default="default")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Also write the report JSON to this path.")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    report = asyncio.run(load_test(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src import benchmarking
+from src.features import build_price_sensitivity_model
+from src.memos import write_memos
+from src.pipeline import build_dataset
+from src.simulator import recommend_scenarios
+from src.synthetic import synthetic_raw
+from src.utils import setup_logging
+
+logger = logging.getLogger(__name__)
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# Absolute changes below these floors are treated as timer/allocator noise.
+MIN_DELTA = {"seconds": 0.01, "peak_mb": 1.0}
+
+# name -> (n_teams, n_seasons)
+SCALES: Dict[str, Tuple[int, int]] = {
+    "small": (30, 10),
+    "medium": (300, 30),
+    "large": (1_000, 100),
+    "xlarge": (3_000, 100),
+}
+
+
+def measure(func: Callable[[], Any], repeats: int = 3) -> Dict[str, float]:
+    """Best-of-``repeats`` wall time, then one traced run for peak memory."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(min(timings), 6), "peak_mb": round(peak / 1_000_000, 3)}
+
+
+def benchmark_stages(n_teams: int, n_seasons: int, repeats: int = 5) -> Dict[str, Dict[str, float]]:
+    raw = synthetic_raw(n_teams, n_seasons)
+    dataset = build_dataset(raw)
+    scored = benchmarking.compute_cpi(dataset)
+    latest = dataset[dataset["season"] == dataset["season"].max()]
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        stages: List[Tuple[str, Callable[[], Any]]] = [
+            ("build_dataset", lambda: build_dataset(raw)),
+            ("compute_cpi", lambda: benchmarking.compute_cpi(dataset)),
+            ("assign_tiers", lambda: benchmarking.assign_tiers(scored)),
+            ("recommend_scenario", lambda: recommend_scenarios(latest)),
+            ("write_memos", lambda: write_memos(dataset, Path(tempfile.mkdtemp(dir=tmp)))),
+            ("build_price_sensitivity_model", lambda: build_price_sensitivity_model(dataset)),
+        ]
+        for name, func in stages:
+            results[name] = measure(func, repeats)
+            logger.info("%s: %.4fs, peak %.1f MB", name, results[name]["seconds"], results[name]["peak_mb"])
+    return results
+
+
+def find_regressions(
+    current: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+    min_delta: Optional[Dict[str, float]] = None,
+) -> List[str]:
+    """Describe every stage metric that grew by more than ``threshold``.
+
+    Growth smaller than the absolute ``min_delta`` for that metric is ignored.
+    """
+    min_delta = MIN_DELTA if min_delta is None else min_delta
+    regressions = []
+    for stage, metrics in current.items():
+        for metric, value in metrics.items():
+            base = baseline.get(stage, {}).get(metric)
+            if not base or value - base < min_delta.get(metric, 0.0):
+                continue
+            if value > base * (1 + threshold):
+                regressions.append(f"{stage}.{metric}: {value:g} vs baseline {base:g} (+{value / base - 1:.0%})")
+    return regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic leagues.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--save", action="store_true", help="Write results as the new baseline.")
+    parser.add_argument("--check", action="store_true", help="Fail if a stage regresses past the threshold.")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown (0.25 = 25%%).")
+    parser.add_argument("--output", type=Path, help="Also write results JSON to this path.")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    n_teams, n_seasons = SCALES[args.scale]
+    report = {
+        "scale": args.scale,
+        "n_teams": n_teams,
+        "n_seasons": n_seasons,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "results": benchmark_stages(n_teams, n_seasons, args.repeats),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+
+    baseline_path = BASELINE_DIR / f"{args.scale}.json"
+    if args.save:
+        BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(text + "\n", encoding="utf-8")
+        logger.info("Saved baseline to %s", baseline_path)
+
+    if args.check:
+        if not baseline_path.exists():
+            logger.error("No baseline at %s; run with --save first", baseline_path)
+            return 1
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+        regressions = find_regressions(report["results"], baseline, args.threshold)
+        for line in regressions:
+            logger.error("Regression: %s", line)
+        if regressions:
+            return 1
+        logger.info("No regressions beyond %.0f%%", args.threshold * 100)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import argparse
+import ast
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+APP_DIR = ROOT / "app"
+APP_ENTRYPOINTS = [APP_DIR / "app.py", *sorted(p for p in (APP_DIR / "pages").glob("*.py") if p.name != "__init__.py")]
+
+# Packages the app must not import at startup; each is loaded lazily where used.
+HEAVY_MODULES = ("sklearn", "scipy", "matplotlib", "seaborn", "pybaseball")
+# Cumulative import time of one entry point, including streamlit and pandas
+# (about 1s locally). Generous so the check is stable on slow CI runners.
+STARTUP_BUDGET_SECONDS = 4.0
+
+
+def app_imports(path: Path) -> List[str]:
+    """Third-party and project modules imported at module level by an app script."""
+    modules = []
+    for node in ast.parse(path.read_text(encoding="utf-8")).body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0 and node.module != "__future__":
+            modules.append(node.module)
+    return [m for m in dict.fromkeys(modules) if m.split(".")[0] not in sys.stdlib_module_names]
+
+
+def importtime(modules: Sequence[str]) -> pd.DataFrame:
+    """Import ``modules`` in a fresh interpreter under ``-X importtime``.
+
+    Returns one row per imported module with self and cumulative seconds
+    and its nesting depth (0 for imports not triggered by another module).
+    """
+    code = f"import sys; sys.path[:0] = [{str(ROOT)!r}, {str(APP_DIR)!r}]\n" + "".join(f"import {m}\n" for m in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, cwd=ROOT, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_seconds": int(self_us) / 1e6,
+            "cumulative_seconds": int(cumulative_us) / 1e6,
+        })
+    return pd.DataFrame(rows, columns=["module", "depth", "self_seconds", "cumulative_seconds"])
+
+
+def startup_report(path: Path) -> dict:
+    """Import time and heavy modules loaded when an app script starts."""
+    times = importtime(app_imports(path))
+    loaded = set(times["module"].str.split(".").str[0])
+    return {
+        "entrypoint": str(path.relative_to(ROOT)),
+        "seconds": round(float(times.loc[times["depth"] == 0, "cumulative_seconds"].sum()), 3),
+        "heavy_modules": sorted(loaded & set(HEAVY_MODULES)),
+        "slowest": times[times["depth"] == 0].nlargest(5, "cumulative_seconds")["module"].tolist(),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure Streamlit app import time per entry point.")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS, help="Seconds allowed per entry point.")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for path in APP_ENTRYPOINTS:
+        report = startup_report(path)
+        over = report["seconds"] > args.budget or report["heavy_modules"]
+        failed = failed or bool(over)
+        print(
+            f"{'FAIL' if over else 'ok  '} {report['entrypoint']}: {report['seconds']:.3f}s"
+            f" heavy={report['heavy_modules'] or '-'} slowest={', '.join(report['slowest'])}"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
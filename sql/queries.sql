@@ -1,14 +1,32 @@
--- Top 10 CPI clubs in latest season
-SELECT team_id, cpi, cpi_tier
+-- Named queries used by src/database.py. Each block starts with a
+-- "-- name:" line and takes sqlite named parameters.
+
+-- name: latest_season
+SELECT MAX(season) AS season
+FROM club_metrics;
+
+-- name: top_clubs
+-- Top N CPI clubs in a season
+SELECT team_id, team_name, market_tier, cpi, cpi_tier
 FROM club_metrics
-WHERE season = (SELECT MAX(season) FROM club_metrics)
+WHERE season = :season
 ORDER BY cpi DESC
-LIMIT 10;
+LIMIT :limit;
 
--- Under-monetized clubs
-SELECT team_id, attendance_pct, ticket_price_proxy, cpi
+-- name: under_monetized
+-- High attendance with a low ticket price proxy
+SELECT team_id, team_name, attendance_pct, ticket_price_proxy, cpi
 FROM club_metrics
-WHERE season = (SELECT MAX(season) FROM club_metrics)
-  AND attendance_pct >= 0.80
-  AND ticket_price_proxy <= 32
+WHERE season = :season
+  AND attendance_pct > :min_attendance_pct
+  AND ticket_price_proxy < :max_ticket_price
 ORDER BY attendance_pct DESC;
+
+-- name: demand_constrained
+-- Soft attendance even at a low ticket price proxy
+SELECT team_id, team_name, attendance_pct, ticket_price_proxy, cpi
+FROM club_metrics
+WHERE season = :season
+  AND attendance_pct < :max_attendance_pct
+  AND ticket_price_proxy < :max_ticket_price
+ORDER BY attendance_pct ASC;
@@ -8,7 +8,13 @@ CREATE TABLE teams (
 CREATE TABLE market_tiers (
   team_id TEXT,
   market_tier TEXT,
-  metro_population_m REAL
+  metro_population_m REAL,
+  source_note TEXT
+);
+
+CREATE TABLE stadium_capacity (
+  team_id TEXT PRIMARY KEY,
+  stadium_capacity INTEGER
 );
 
 CREATE TABLE attendance_by_team_year (
@@ -22,11 +28,51 @@ CREATE TABLE attendance_by_team_year (
 CREATE TABLE club_metrics (
   team_id TEXT,
   season INTEGER,
-  cpi REAL,
-  cpi_tier TEXT,
-  attendance_pct REAL,
+  team_name TEXT,
+  league TEXT,
+  division TEXT,
+  market_tier TEXT,
+  metro_population_m REAL,
+  stadium_capacity INTEGER,
+  home_attendance INTEGER,
+  wins INTEGER,
+  playoff_flag INTEGER,
+  market_base_price REAL,
+  market_multiplier REAL,
+  wins_percentile REAL,
   ticket_price_proxy REAL,
-  revenue_proxy REAL,
+  playoff_rate REAL,
+  sponsorship_proxy REAL,
+  attendance_pct REAL,
+  attendance_yoy_growth REAL,
+  attendance_consistency REAL,
+  wins_trend REAL,
   engagement_momentum REAL,
-  operational_efficiency REAL
+  revenue_potential REAL,
+  revenue_proxy REAL,
+  fan_demand REAL,
+  operational_efficiency REAL,
+  fan_demand_score REAL,
+  revenue_potential_score REAL,
+  engagement_momentum_score REAL,
+  operational_efficiency_score REAL,
+  cpi REAL,
+  cpi_rank REAL,
+  cpi_tier TEXT,
+  driver_1 TEXT,
+  driver_1_contribution REAL,
+  driver_2 TEXT,
+  driver_2_contribution REAL,
+  driver_3 TEXT,
+  driver_3_contribution REAL
+);
+
+CREATE INDEX idx_attendance_season_team ON attendance_by_team_year (season, team_id);
+CREATE UNIQUE INDEX idx_club_metrics_season_team ON club_metrics (season, team_id);
+CREATE INDEX idx_club_metrics_season_cpi ON club_metrics (season, cpi);
+
+-- Signature of the club metrics files the database was built from.
+CREATE TABLE build_info (
+  key TEXT PRIMARY KEY,
+  value TEXT
 );
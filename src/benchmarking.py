@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import Dict, Tuple
+from typing import Dict, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
 WEIGHTS: Dict[str, float] = {
@@ -10,6 +11,18 @@ WEIGHTS: Dict[str, float] = {
     "engagement_momentum": 0.20,
     "operational_efficiency": 0.15,
 }
+COMPONENTS = list(WEIGHTS)
+
+# assign_tiers: ranks 1-5 are "Top 5", ranks above 25 are "Bottom 5".
+TOP_TIER_MAX_RANK = 5
+BOTTOM_TIER_MIN_RANK = 25
+TIER_LABELS = np.array(["Top 5", "Middle 20", "Bottom 5"])
+DRIVER_LABELS = {
+    "fan_demand": "Fan Demand",
+    "revenue_potential": "Revenue Potential",
+    "engagement_momentum": "Engagement Momentum",
+    "operational_efficiency": "Operational Efficiency",
+}
 
 
 def normalize_by_season(df: pd.DataFrame, column: str) -> pd.Series:
@@ -45,19 +58,162 @@ def assign_tiers(df: pd.DataFrame) -> pd.DataFrame:
     """Assign Top 5, Middle 20, Bottom 5 tiers based on CPI rank."""
     df = df.copy()
     df["cpi_rank"] = df.groupby("season")["cpi"].rank(ascending=False, method="first")
-    df["cpi_tier"] = "Middle 20"
-    df.loc[df["cpi_rank"] <= 5, "cpi_tier"] = "Top 5"
-    df.loc[df["cpi_rank"] > 25, "cpi_tier"] = "Bottom 5"
+    df["cpi_tier"] = TIER_LABELS[1]
+    df.loc[df["cpi_rank"] <= TOP_TIER_MAX_RANK, "cpi_tier"] = TIER_LABELS[0]
+    df.loc[df["cpi_rank"] > BOTTOM_TIER_MIN_RANK, "cpi_tier"] = TIER_LABELS[2]
     return df
 
 
+def component_matrix(df: pd.DataFrame) -> np.ndarray:
+    """(rows, components) matrix of 0-100 component scores in ``WEIGHTS`` order.
+
+    Uses the ``*_score`` columns when present, so ranks are computed once.
+    """
+    columns = [f"{name}_score" for name in COMPONENTS]
+    if not set(columns) <= set(df.columns):
+        df = compute_component_scores(df)
+    return df[columns].to_numpy(dtype=float)
+
+
+def weight_matrix(weights: Dict[str, float] | Sequence[Dict[str, float]] | np.ndarray) -> np.ndarray:
+    """(components, k) matrix from one weights dict, a list of dicts or a (k, components) array."""
+    if isinstance(weights, dict):
+        weights = [weights]
+    if isinstance(weights, np.ndarray):
+        return np.atleast_2d(weights).astype(float).T
+    return np.array([[w[name] for name in COMPONENTS] for w in weights], dtype=float).T
+
+
+def cpi_for_weights(scores: np.ndarray, weights) -> np.ndarray:
+    """CPI for every row and weight vector as one matrix product, rounded like ``compute_cpi``."""
+    return np.round(scores @ weight_matrix(weights), 2)
+
+
+def season_ranks(cpi: np.ndarray, seasons: np.ndarray) -> np.ndarray:
+    """Descending CPI rank within each season for every column, ties in row order (``method="first"``)."""
+    cpi = cpi.reshape(len(seasons), -1)
+    ranks = np.empty(cpi.shape, dtype=np.int64)
+    codes, uniques = pd.factorize(seasons)
+    by_season = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[by_season], np.arange(len(uniques) + 1))
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        rows = by_season[lo:hi]
+        order = np.argsort(-cpi[rows], axis=0, kind="stable")
+        season_rank = np.empty_like(order)
+        np.put_along_axis(season_rank, order, np.arange(1, rows.size + 1)[:, None], axis=0)
+        ranks[rows] = season_rank
+    return ranks
+
+
+def tier_codes(ranks: np.ndarray) -> np.ndarray:
+    """Index into ``TIER_LABELS`` per rank, using the ``assign_tiers`` cut-offs."""
+    return np.where(ranks <= TOP_TIER_MAX_RANK, 0, np.where(ranks > BOTTOM_TIER_MIN_RANK, 2, 1))
+
+
+def sample_weights(
+    n_samples: int, concentration: float = 50.0, seed: int = 0, center: Dict[str, float] | None = None
+) -> np.ndarray:
+    """(n_samples, components) Dirichlet weight vectors centred on ``center``.
+
+    Larger ``concentration`` keeps samples closer to the centre weights.
+    """
+    center = center or WEIGHTS
+    alpha = concentration * np.array([center[name] for name in COMPONENTS]) / sum(center.values())
+    return np.random.default_rng(seed).dirichlet(alpha, size=n_samples)
+
+
+def weight_sweep(
+    df: pd.DataFrame,
+    weights: np.ndarray | None = None,
+    n_samples: int = 2000,
+    concentration: float = 50.0,
+    seed: int = 0,
+    chunk_size: int = 512,
+    center: Dict[str, float] | None = None,
+) -> pd.DataFrame:
+    """CPI distribution, rank range and tier-flip probability per club-season.
+
+    Component scores are computed once; each chunk of weight vectors is a
+    single matrix product followed by per-season ranking, and only running
+    statistics are kept between chunks. ``weights`` defaults to
+    ``sample_weights(n_samples, concentration, seed, center)``; tier flips
+    are measured against the tiers under ``center`` (default ``WEIGHTS``).
+    """
+    center = center or WEIGHTS
+    weights = sample_weights(n_samples, concentration, seed, center) if weights is None else np.atleast_2d(weights)
+    scores = component_matrix(df)
+    seasons = df["season"].to_numpy()
+    base_cpi = cpi_for_weights(scores, center)
+    base_tier = tier_codes(season_ranks(base_cpi, seasons))[:, 0]
+
+    n = len(df)
+    total = np.zeros(n)
+    total_sq = np.zeros(n)
+    cpi_min = np.full(n, np.inf)
+    cpi_max = np.full(n, -np.inf)
+    rank_min = np.full(n, np.iinfo(np.int64).max)
+    rank_max = np.zeros(n, dtype=np.int64)
+    tier_counts = np.zeros((n, 3))
+    for start in range(0, len(weights), chunk_size):
+        cpi = cpi_for_weights(scores, weights[start : start + chunk_size])
+        ranks = season_ranks(cpi, seasons)
+        tiers = tier_codes(ranks)
+        total += cpi.sum(axis=1)
+        total_sq += (cpi**2).sum(axis=1)
+        cpi_min = np.minimum(cpi_min, cpi.min(axis=1))
+        cpi_max = np.maximum(cpi_max, cpi.max(axis=1))
+        rank_min = np.minimum(rank_min, ranks.min(axis=1))
+        rank_max = np.maximum(rank_max, ranks.max(axis=1))
+        for code in range(3):
+            tier_counts[:, code] += (tiers == code).sum(axis=1)
+
+    k = len(weights)
+    mean = total / k
+    probs = tier_counts / k
+    keys = [c for c in ("team_id", "team_name", "season") if c in df.columns]
+    out = df[keys].reset_index(drop=True).copy()
+    out["cpi_base"] = base_cpi[:, 0]
+    out["cpi_mean"] = mean
+    out["cpi_std"] = np.sqrt(np.maximum(total_sq / k - mean**2, 0))
+    out["cpi_min"] = cpi_min
+    out["cpi_max"] = cpi_max
+    out["rank_min"] = rank_min
+    out["rank_max"] = rank_max
+    out["p_top"] = probs[:, 0]
+    out["p_bottom"] = probs[:, 2]
+    out["p_tier_flip"] = 1 - probs[np.arange(n), base_tier]
+    return out
+
+
+def driver_attribution(df: pd.DataFrame, weights: Dict[str, float] | None = None, n_drivers: int = 3) -> pd.DataFrame:
+    """Add ``driver_1..n`` and ``driver_i_contribution`` columns for all rows at once.
+
+    Drivers are the components with the highest percentile scores (ties in
+    ``WEIGHTS`` order, as ``top_drivers`` did); each contribution is the
+    component's CPI points, score x weight, under ``weights``.
+    """
+    weights = weights or WEIGHTS
+    scores = component_matrix(df)
+    order = np.argsort(-scores, axis=1, kind="stable")[:, :n_drivers]
+    component_weights = np.array([weights[name] for name in COMPONENTS])
+    labels = [DRIVER_LABELS[name] for name in COMPONENTS]
+    rows = np.arange(len(df))
+    columns = {}
+    for i in range(order.shape[1]):
+        codes = order[:, i]
+        columns[f"driver_{i + 1}"] = pd.Categorical.from_codes(codes, labels)
+        columns[f"driver_{i + 1}_contribution"] = scores[rows, codes] * component_weights[codes]
+    drivers = pd.DataFrame(columns, index=df.index)
+    # Appended without copying ``df``: the pipeline's peak memory is set here.
+    existing = [c for c in drivers.columns if c in df.columns]
+    if existing:
+        df = df.drop(columns=existing)
+    return pd.concat([df, drivers], axis=1, copy=False)
+
+
 def top_drivers(row: pd.Series) -> Tuple[str, str, str]:
     """Return the top three CPI component drivers for a club."""
-    drivers = {
-        "Fan Demand": row["fan_demand_score"],
-        "Revenue Potential": row["revenue_potential_score"],
-        "Engagement Momentum": row["engagement_momentum_score"],
-        "Operational Efficiency": row["operational_efficiency_score"],
-    }
-    sorted_drivers = sorted(drivers.items(), key=lambda x: x[1], reverse=True)
-    return tuple([d[0] for d in sorted_drivers[:3]])
+    if "driver_3" in row.index:
+        return row["driver_1"], row["driver_2"], row["driver_3"]
+    drivers = driver_attribution(row.to_frame().T).iloc[0]
+    return drivers["driver_1"], drivers["driver_2"], drivers["driver_3"]
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import argparse
+import io
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.elasticity import attach_elasticities, load_elasticities
+from src.simulator import MARKET_ADJUST, RESULT_FIELDS, SCENARIO_COLUMNS, simulate_pairs
+from src.utils import setup_logging
+
+logger = logging.getLogger(__name__)
+
+SCENARIO_DTYPES = {
+    "team_id": str,
+    "season": "Int64",
+    "price_change_pct": float,
+    "marketing_lift_pct": float,
+    "win_change_pct": float,
+    "market_condition": str,
+}
+CLUB_COLUMNS = ["team_id", "season", "home_attendance", "ticket_price_proxy"]
+ELASTICITY_COLUMNS = ["price_elasticity", "marketing_elasticity", "win_elasticity"]
+DEFAULT_CHUNKSIZE = 50_000
+
+# Club inputs for the current worker process, set once by ``_init_worker``.
+_CLUBS: Optional[pd.DataFrame] = None
+
+
+@dataclass
+class BulkStats:
+    rows: int = 0
+    unmatched: int = 0
+    unknown_conditions: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def club_inputs(df: pd.DataFrame, elasticities: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Simulator inputs per club-season, indexed by ``(team_id, season)``."""
+    clubs = df[CLUB_COLUMNS].assign(team_id=df["team_id"].astype(str), season=df["season"].astype(int))
+    if elasticities is not None:
+        clubs = attach_elasticities(clubs.assign(market_tier=df["market_tier"]), elasticities)
+    columns = [c for c in ["home_attendance", "ticket_price_proxy"] + ELASTICITY_COLUMNS if c in clubs.columns]
+    return clubs.set_index(["team_id", "season"])[columns]
+
+
+def evaluate_chunk(chunk: pd.DataFrame, clubs: pd.DataFrame, default_season: int) -> pd.DataFrame:
+    """Join scenarios to their club-season inputs and simulate them row by row.
+
+    Missing lever columns default to zero and the market condition to
+    Neutral. Rows whose club-season is not in ``clubs`` or whose market
+    condition is not in ``MARKET_ADJUST`` get NaN results.
+    """
+    out = chunk.reset_index(drop=True)
+    season = out["season"].fillna(default_season) if "season" in out.columns else pd.Series(default_season, index=out.index)
+    out["season"] = season.astype(int)
+    for lever in SCENARIO_COLUMNS[:3]:
+        if lever not in out.columns:
+            out[lever] = 0.0
+    out["market_condition"] = out["market_condition"].fillna("Neutral") if "market_condition" in out.columns else "Neutral"
+
+    keys = pd.MultiIndex.from_arrays([out["team_id"].astype(str), out["season"]])
+    matched = clubs.reindex(keys).reset_index(drop=True)
+    matched.loc[~out["market_condition"].isin(MARKET_ADJUST).to_numpy()] = np.nan
+    results = simulate_pairs(matched, out[SCENARIO_COLUMNS])
+    for field in RESULT_FIELDS:
+        out[field] = results[field]
+    return out
+
+
+def csv_bytes(frame: pd.DataFrame, header: bool = True) -> bytes:
+    """Encode ``frame`` as CSV, with pyarrow's writer when available (several times faster)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        return frame.to_csv(index=False, header=header).encode("utf-8")
+    sink = io.BytesIO()
+    options = pa_csv.WriteOptions(include_header=header, quoting_style="needed")
+    pa_csv.write_csv(pa.Table.from_pandas(frame, preserve_index=False), sink, options)
+    return sink.getvalue()
+
+
+def process_chunk(
+    chunk: pd.DataFrame, clubs: pd.DataFrame, default_season: int, header: bool
+) -> Tuple[bytes, int, int, int]:
+    """Evaluate one chunk and encode it; returns ``(csv, rows, unmatched rows, unknown-condition rows)``.
+
+    Encoding happens here, in the worker, since formatting numbers as text
+    costs more than the simulation itself.
+    """
+    result = evaluate_chunk(chunk, clubs, default_season)
+    unknown = ~result["market_condition"].isin(MARKET_ADJUST).to_numpy()
+    unmatched = int((np.isnan(result["projected_revenue"].to_numpy()) & ~unknown).sum())
+    return csv_bytes(result, header), len(result), unmatched, int(unknown.sum())
+
+
+def _init_worker(clubs: pd.DataFrame) -> None:
+    global _CLUBS
+    _CLUBS = clubs
+
+
+def _process_in_worker(chunk: pd.DataFrame, default_season: int, header: bool) -> Tuple[bytes, int, int, int]:
+    return process_chunk(chunk, _CLUBS, default_season, header)
+
+
+def read_scenarios(path: Path, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {col: dtype for col, dtype in SCENARIO_DTYPES.items() if col in header}
+    yield from pd.read_csv(path, chunksize=chunksize, dtype=dtypes)
+
+
+def run_bulk(
+    chunks: Iterable[pd.DataFrame],
+    output_path: Path,
+    clubs: pd.DataFrame,
+    default_season: Optional[int] = None,
+    workers: Optional[int] = None,
+    max_pending: Optional[int] = None,
+) -> BulkStats:
+    """Evaluate scenario chunks across worker processes, streaming results to CSV in input order.
+
+    At most ``max_pending`` chunks (default: two per worker) are in flight,
+    and each finished chunk is appended to ``output_path`` as soon as every
+    chunk before it is written, so memory stays bounded by the chunk size
+    rather than the input size.
+    """
+    default_season = int(clubs.index.get_level_values("season").max()) if default_season is None else default_season
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    max_pending = max_pending or 2 * max(workers, 1)
+    stats = BulkStats()
+    start = time.perf_counter()
+
+    with output_path.open("wb") as out:
+
+        def write(processed: Tuple[bytes, int, int, int]) -> None:
+            data, rows, unmatched, unknown_conditions = processed
+            out.write(data)
+            stats.rows += rows
+            stats.unmatched += unmatched
+            stats.unknown_conditions += unknown_conditions
+            stats.chunks += 1
+            stats.seconds = time.perf_counter() - start
+            logger.info("Wrote %d scenarios (%.0f rows/s)", stats.rows, stats.rows_per_second)
+
+        if workers <= 1:
+            for i, chunk in enumerate(chunks):
+                write(process_chunk(chunk, clubs, default_season, header=i == 0))
+        else:
+            pending: Deque[Future] = deque()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(clubs,)) as pool:
+                for i, chunk in enumerate(chunks):
+                    pending.append(pool.submit(_process_in_worker, chunk, default_season, i == 0))
+                    if len(pending) >= max_pending:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+
+    stats.seconds = time.perf_counter() - start
+    if stats.unmatched:
+        logger.warning("%d scenarios named a club-season not in club_metrics; their results are empty", stats.unmatched)
+    if stats.unknown_conditions:
+        logger.warning(
+            "%d scenarios have a market_condition other than %s; their results are empty",
+            stats.unknown_conditions,
+            ", ".join(MARKET_ADJUST),
+        )
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from src.storage import read_club_metrics
+
+    parser = argparse.ArgumentParser(description="Simulate a CSV of club scenarios in bulk.")
+    parser.add_argument("scenarios", type=Path, help="CSV with team_id, price_change_pct, marketing_lift_pct, win_change_pct, market_condition[, season].")
+    parser.add_argument("output", type=Path, help="CSV to write, one result row per input row in input order.")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count; 1 runs in-process).")
+    parser.add_argument("--season", type=int, help="Season for rows without one (default: latest).")
+    parser.add_argument("--club-elasticities", action="store_true", help="Use per-club elasticities from the pipeline.")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    metrics = read_club_metrics(columns=CLUB_COLUMNS + ["market_tier"])
+    clubs = club_inputs(metrics, load_elasticities() if args.club_elasticities else None)
+    stats = run_bulk(read_scenarios(args.scenarios, args.chunksize), args.output, clubs, args.season, args.workers)
+    logger.info("Done: %s, %.0f rows/s", asdict(stats), stats.rows_per_second)
+
+
+if __name__ == "__main__":
+    main()
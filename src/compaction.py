@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_COLUMNS = [
+    "team_id",
+    "team_name",
+    "league",
+    "division",
+    "market_tier",
+    "source_note",
+    "cpi_tier",
+    "driver_1",
+    "driver_2",
+    "driver_3",
+]
+
+# Other string columns become categoricals when unique values are at most
+# this share of rows.
+CATEGORY_MAX_RATIO = 0.5
+
+# Floats are stored as float32 only when every value round-trips within this
+# relative error. float32 keeps ~7 significant digits (relative error
+# <= 2**-24, about 6e-8), so in practice this only rejects columns with
+# values outside the float32 range.
+FLOAT32_RTOL = 1e-6
+
+# Columns that duplicate another column. They are dropped on compaction;
+# ``with_aliases`` restores them as references to the source column.
+COLUMN_ALIASES: Dict[str, str] = {"revenue_proxy": "revenue_potential"}
+
+
+def _fits_float32(values: pd.Series) -> bool:
+    x = values.to_numpy(dtype=float)
+    with np.errstate(over="ignore", invalid="ignore"):
+        back = x.astype(np.float32).astype(float)
+    finite = np.isfinite(x)
+    if not np.array_equal(np.isfinite(back), finite):
+        return False
+    return bool(np.all(np.abs(back[finite] - x[finite]) <= FLOAT32_RTOL * np.abs(x[finite])))
+
+
+def _is_integral(values: pd.Series) -> bool:
+    x = values.to_numpy(dtype=float)
+    return bool(np.isfinite(x).all() and np.abs(x).max() <= 2**53 and np.array_equal(x, np.round(x)))
+
+
+def compact_club_metrics(df: pd.DataFrame, categorical: Iterable[str] = CATEGORICAL_COLUMNS) -> pd.DataFrame:
+    """Memory-compact copy of a club metrics frame.
+
+    - ``CATEGORICAL_COLUMNS`` and other low-cardinality strings become categoricals.
+    - Integers, and floats that hold only whole numbers (e.g. ``cpi_rank``),
+      are downcast to the smallest integer type.
+    - Other floats become float32 within ``FLOAT32_RTOL``.
+    - Alias columns in ``COLUMN_ALIASES`` are dropped when they equal their source.
+    """
+    categorical = set(categorical)
+    drop = [
+        alias
+        for alias, source in COLUMN_ALIASES.items()
+        if alias in df.columns and source in df.columns and df[alias].equals(df[source])
+    ]
+    df = df.drop(columns=drop)
+    out = {}
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            out[col] = values
+        elif col in categorical or (
+            values.dtype == object and values.nunique(dropna=False) <= CATEGORY_MAX_RATIO * max(len(values), 1)
+        ):
+            out[col] = values.astype("category")
+        elif pd.api.types.is_bool_dtype(values):
+            out[col] = values
+        elif pd.api.types.is_integer_dtype(values):
+            out[col] = pd.to_numeric(values, downcast="integer")
+        elif pd.api.types.is_float_dtype(values):
+            if len(values) and _is_integral(values):
+                out[col] = pd.to_numeric(values.astype("int64"), downcast="integer")
+            elif _fits_float32(values):
+                out[col] = values.astype("float32")
+            else:
+                out[col] = values
+        else:
+            out[col] = values
+    return pd.DataFrame(out, index=df.index)
+
+
+def with_aliases(df: pd.DataFrame) -> pd.DataFrame:
+    """Add back alias columns dropped by ``compact_club_metrics``."""
+    missing = {alias: source for alias, source in COLUMN_ALIASES.items() if alias not in df.columns and source in df.columns}
+    return df.assign(**{alias: df[source] for alias, source in missing.items()}) if missing else df
+
+
+def memory_report(before: pd.DataFrame, after: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Per-column dtype and deep memory use, before and after compaction."""
+    after = compact_club_metrics(before) if after is None else after
+    before_bytes = before.memory_usage(deep=True, index=False)
+    after_bytes = after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        "column": before.columns,
+        "dtype_before": [str(before[c].dtype) for c in before.columns],
+        "dtype_after": [str(after[c].dtype) if c in after.columns else f"alias of {COLUMN_ALIASES.get(c)}" for c in before.columns],
+        "bytes_before": before_bytes.to_numpy(),
+        "bytes_after": [int(after_bytes.get(c, 0)) for c in before.columns],
+    })
+    total = pd.DataFrame([{
+        "column": "TOTAL",
+        "dtype_before": "",
+        "dtype_after": "",
+        "bytes_before": int(report["bytes_before"].sum()),
+        "bytes_after": int(report["bytes_after"].sum()),
+    }])
+    report = pd.concat([report, total], ignore_index=True)
+    report["ratio"] = (report["bytes_after"] / report["bytes_before"]).round(3)
+    return report
+
+
+def write_memory_report(before: pd.DataFrame, after: pd.DataFrame, path: Path) -> pd.DataFrame:
+    report = memory_report(before, after)
+    report.to_csv(path, index=False)
+    return report
+
+
+if __name__ == "__main__":
+    from src.storage import CLUB_METRICS_CSV
+
+    print(memory_report(pd.read_csv(CLUB_METRICS_CSV)).to_string(index=False))
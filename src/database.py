@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import pandas as pd
+
+from src.screening import SCREENS
+from src.utils import PROCESSED_DIR, ROOT
+
+DB_PATH = PROCESSED_DIR / "club_metrics.db"
+SCHEMA_PATH = ROOT / "sql" / "schema.sql"
+QUERIES_PATH = ROOT / "sql" / "queries.sql"
+
+RAW_TABLES = {
+    "teams": "teams",
+    "market": "market_tiers",
+    "capacity": "stadium_capacity",
+    "attendance": "attendance_by_team_year",
+}
+
+
+def load_queries(path: Path = QUERIES_PATH) -> Dict[str, str]:
+    """Parse ``-- name: <query>`` blocks from a SQL file."""
+    queries: Dict[str, str] = {}
+    for block in re.split(r"^-- name:\s*", path.read_text(encoding="utf-8"), flags=re.M)[1:]:
+        name, _, body = block.partition("\n")
+        queries[name.strip()] = body.strip()
+    return queries
+
+
+QUERIES = load_queries()
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _insert(conn: sqlite3.Connection, table: str, df: pd.DataFrame) -> None:
+    columns = [c for c in _table_columns(conn, table) if c in df.columns]
+    frame = df[columns].copy()
+    for col in frame.columns:
+        if isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = frame[col].astype(object)
+    frame.to_sql(table, conn, if_exists="append", index=False, chunksize=10_000)
+
+
+def build_database(
+    raw: Mapping[str, pd.DataFrame], club_metrics: pd.DataFrame, path: Path = DB_PATH, source: Sequence[Any] = ()
+) -> Path:
+    """Create the SQLite file from ``sql/schema.sql`` and load all tables.
+
+    The database is written to a temporary file and swapped in atomically so
+    readers never see a half-built file. ``source`` (a ``file_signature`` of
+    the club metrics files) is recorded for ``source_matches``.
+    """
+    tmp_path = path.with_suffix(".db.tmp")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    with closing(sqlite3.connect(tmp_path)) as conn:
+        conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+        for key, table in RAW_TABLES.items():
+            _insert(conn, table, raw[key])
+        _insert(conn, "club_metrics", club_metrics)
+        conn.execute("INSERT INTO build_info (key, value) VALUES ('source', ?)", (json.dumps(source),))
+        conn.execute("ANALYZE")
+        conn.commit()
+    os.replace(tmp_path, path)
+    return path
+
+
+def source_matches(source: Sequence[Any], path: Path = DB_PATH) -> bool:
+    """Whether the database at ``path`` was built from files with signature ``source``."""
+    if not path.exists():
+        return False
+    try:
+        with closing(connect(path)) as conn:
+            row = conn.execute("SELECT value FROM build_info WHERE key = 'source'").fetchone()
+    except sqlite3.Error:
+        return False
+    return row is not None and row[0] == json.dumps(source)
+
+
+def connect(path: Path = DB_PATH) -> sqlite3.Connection:
+    """Open a read-only connection."""
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def query(sql: str, params: Mapping | Sequence = (), path: Path = DB_PATH) -> pd.DataFrame:
+    with closing(connect(path)) as conn:
+        return pd.read_sql_query(sql, conn, params=params)
+
+
+def latest_season(path: Path = DB_PATH) -> int:
+    return int(query(QUERIES["latest_season"], path=path)["season"].iloc[0])
+
+
+def club_metrics(
+    season: Optional[int] = None,
+    market_tiers: Optional[Sequence[str]] = None,
+    team_id: Optional[str] = None,
+    columns: Optional[Sequence[str]] = None,
+    path: Path = DB_PATH,
+) -> pd.DataFrame:
+    """Select club metrics rows, filtering in SQLite rather than pandas."""
+    with closing(connect(path)) as conn:
+        available = _table_columns(conn, "club_metrics")
+        selected = list(columns) if columns else available
+        unknown = [c for c in selected if c not in available]
+        if unknown:
+            raise ValueError(f"Unknown club_metrics columns: {unknown}")
+
+        clauses, params = [], []
+        if season is not None:
+            clauses.append("season = ?")
+            params.append(int(season))
+        if team_id is not None:
+            clauses.append("team_id = ?")
+            params.append(team_id)
+        if market_tiers is not None:
+            tiers = list(market_tiers)
+            if not tiers:
+                return pd.DataFrame(columns=selected)
+            clauses.append(f"market_tier IN ({', '.join('?' for _ in tiers)})")
+            params.extend(tiers)
+
+        sql = f"SELECT {', '.join(selected)} FROM club_metrics"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return pd.read_sql_query(sql + " ORDER BY season, team_id", conn, params=params)
+
+
+def top_clubs(season: Optional[int] = None, n: int = 10, path: Path = DB_PATH) -> pd.DataFrame:
+    season = latest_season(path) if season is None else season
+    return query(QUERIES["top_clubs"], {"season": int(season), "limit": int(n)}, path)
+
+
+def under_monetized(
+    season: Optional[int] = None,
+    min_attendance_pct: float = SCREENS["under_monetized"].thresholds["min_attendance_pct"],
+    max_ticket_price: float = SCREENS["under_monetized"].thresholds["max_ticket_price"],
+    path: Path = DB_PATH,
+) -> pd.DataFrame:
+    season = latest_season(path) if season is None else season
+    params = {"season": int(season), "min_attendance_pct": min_attendance_pct, "max_ticket_price": max_ticket_price}
+    return query(QUERIES["under_monetized"], params, path)
+
+
+def demand_constrained(
+    season: Optional[int] = None,
+    max_attendance_pct: float = SCREENS["demand_constrained"].thresholds["max_attendance_pct"],
+    max_ticket_price: float = SCREENS["demand_constrained"].thresholds["max_ticket_price"],
+    path: Path = DB_PATH,
+) -> pd.DataFrame:
+    season = latest_season(path) if season is None else season
+    params = {"season": int(season), "max_attendance_pct": max_attendance_pct, "max_ticket_price": max_ticket_price}
+    return query(QUERIES["demand_constrained"], params, path)
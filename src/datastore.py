@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class ClubMetricsStore:
+    """Club metrics frame with precomputed season and team indexes.
+
+    Index values are row positions into ``frame``, so lookups slice the
+    frame directly instead of scanning a boolean mask on every rerun.
+    Consumers must treat ``frame`` and ``latest`` as read-only: one
+    instance is shared across app pages and sessions.
+    """
+
+    frame: pd.DataFrame
+    season_positions: Dict[int, np.ndarray]
+    team_positions: Dict[str, np.ndarray]
+    club_positions: Dict[Tuple[str, int], int]
+    latest_season: int
+    latest: pd.DataFrame
+
+    @property
+    def seasons(self) -> List[int]:
+        return sorted(self.season_positions)
+
+    def season(self, season: int) -> pd.DataFrame:
+        return self.frame.iloc[self.season_positions.get(int(season), np.array([], dtype=int))]
+
+    def team(self, team_id: str) -> pd.DataFrame:
+        return self.frame.iloc[self.team_positions.get(team_id, np.array([], dtype=int))]
+
+    def club_row(self, team_name: str, season: Optional[int] = None) -> pd.Series:
+        season = self.latest_season if season is None else int(season)
+        return self.frame.iloc[self.club_positions[(team_name, season)]]
+
+
+def _positions(values: pd.Series) -> Dict:
+    codes, uniques = pd.factorize(values, sort=True)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    return {
+        (key.item() if hasattr(key, "item") else key): order[bounds[i] : bounds[i + 1]]
+        for i, key in enumerate(uniques)
+    }
+
+
+def _club_positions(df: pd.DataFrame) -> Dict[Tuple[str, int], int]:
+    """``(team_name, season) -> row position``, keeping the first row of any duplicate."""
+    keys = list(zip(df["team_name"].astype(str).tolist(), df["season"].astype(int).tolist()))
+    return dict(zip(reversed(keys), range(len(keys) - 1, -1, -1)))
+
+
+def build_store(df: pd.DataFrame) -> ClubMetricsStore:
+    df = df.reset_index(drop=True)
+    season_positions = _positions(df["season"])
+    latest_season = int(max(season_positions))
+    return ClubMetricsStore(
+        frame=df,
+        season_positions=season_positions,
+        team_positions=_positions(df["team_id"].astype(str)),
+        club_positions=_club_positions(df),
+        latest_season=latest_season,
+        latest=df.iloc[season_positions[latest_season]],
+    )
+
+
+def file_signature(paths: Iterable[Path]) -> Tuple[Tuple[str, int, int], ...]:
+    """(path, mtime_ns, size) for each existing file, used as a cache key."""
+    signature = []
+    for path in paths:
+        if path.exists():
+            stat = path.stat()
+            signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
@@ -1,13 +1,26 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Optional
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
 
-from src.utils import RAW_DIR
+from src.utils import CACHE_DIR, RAW_DIR
+
+if TYPE_CHECKING:
+    from sklearn.linear_model import LinearRegression
+
+logger = logging.getLogger(__name__)
+
+STANDINGS_CACHE_DIR = CACHE_DIR / "standings"
+STANDINGS_TTL_SECONDS = 6 * 60 * 60
 
 
 @dataclass
@@ -15,13 +28,19 @@ class PriceModelResult:
     model: LinearRegression
     coefficients: Dict[str, float]
     r2: float
+    feature_names: List[str] = field(default_factory=list)
+
 
+def load_raw_data(raw_dir: Path = RAW_DIR, games: bool = False) -> Dict[str, pd.DataFrame]:
+    """Read the raw CSVs; with ``games``, season attendance is aggregated from per-game rows."""
+    teams = pd.read_csv(raw_dir / "teams_master.csv")
+    market = pd.read_csv(raw_dir / "market_tiers.csv")
+    attendance = pd.read_csv(raw_dir / "attendance_by_team_year.csv")
+    capacity = pd.read_csv(raw_dir / "stadium_capacity.csv")
+    if games:
+        from src.ingest import GAME_FILE, attendance_from_games
 
-def load_raw_data() -> Dict[str, pd.DataFrame]:
-    teams = pd.read_csv(RAW_DIR / "teams_master.csv")
-    market = pd.read_csv(RAW_DIR / "market_tiers.csv")
-    attendance = pd.read_csv(RAW_DIR / "attendance_by_team_year.csv")
-    capacity = pd.read_csv(RAW_DIR / "stadium_capacity.csv")
+        attendance = attendance_from_games(attendance, capacity, raw_dir / GAME_FILE)
     attendance = maybe_update_with_pybaseball(attendance, teams)
     return {
         "teams": teams,
@@ -31,12 +50,14 @@ def load_raw_data() -> Dict[str, pd.DataFrame]:
     }
 
 
+TIER_BASE_PRICE = {"Large": 45, "Medium": 35, "Small": 28}
+TIER_MULTIPLIER = {"Large": 1.15, "Medium": 1.0, "Small": 0.9}
+
+
 def add_market_features(df: pd.DataFrame) -> pd.DataFrame:
-    tier_base = {"Large": 45, "Medium": 35, "Small": 28}
-    tier_mult = {"Large": 1.15, "Medium": 1.0, "Small": 0.9}
     df = df.copy()
-    df["market_base_price"] = df["market_tier"].map(tier_base).fillna(30)
-    df["market_multiplier"] = df["market_tier"].map(tier_mult).fillna(1.0)
+    df["market_base_price"] = df["market_tier"].map(TIER_BASE_PRICE).fillna(30)
+    df["market_multiplier"] = df["market_tier"].map(TIER_MULTIPLIER).fillna(1.0)
     return df
 
 
@@ -49,11 +70,76 @@ def compute_ticket_price_proxy(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def compute_sponsorship_proxy(df: pd.DataFrame) -> pd.DataFrame:
+def attendance_pct(df: pd.DataFrame) -> pd.Series:
+    return (df["home_attendance"] / (df["stadium_capacity"] * 81)).clip(0, 1)
+
+
+# output column -> (source column, operation, window, min_periods)
+TEAM_WINDOWS: Dict[str, Tuple[str, str, int, int]] = {
+    "playoff_rate": ("playoff_flag", "mean", 3, 1),
+    "attendance_yoy_growth": ("home_attendance", "pct_change", 2, 2),
+    "attendance_pct_std": ("attendance_pct", "std", 4, 2),
+    "wins_rolling_mean": ("wins", "mean", 3, 1),
+}
+
+
+def _lagged(values: np.ndarray, position: np.ndarray, window: int) -> np.ndarray:
+    """(n, window) matrix of each row and its prior values within the team; NaN past the team's first season."""
+    lagged = np.full((values.size, window), np.nan)
+    for lag in range(window):
+        lagged[lag:, lag] = values[: values.size - lag]
+        lagged[position < lag, lag] = np.nan
+    return lagged
+
+
+def team_windows(df: pd.DataFrame, names: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Per-team rolling, lag and pct-change features in one pass.
+
+    Rows are put in (team_id, season) order with a single stable sort, so
+    windows always run over consecutive seasons whatever the frame's row
+    order. Each team is then a contiguous segment, and every window in
+    ``TEAM_WINDOWS`` (or the ``names`` subset) is computed from a lag matrix
+    of that segment rather than a separate groupby/rolling. The result is
+    aligned to ``df.index``.
+    """
+    names = list(TEAM_WINDOWS) if names is None else list(names)
+    team_codes, _ = pd.factorize(df["team_id"])
+    order = np.lexsort((df["season"].to_numpy(), team_codes))
+    team = team_codes[order]
+    index = np.arange(team.size)
+    starts = np.r_[True, team[1:] != team[:-1]] if team.size else np.array([], dtype=bool)
+    position = index - np.maximum.accumulate(np.where(starts, index, 0))
+
+    sources: Dict[str, np.ndarray] = {}
+    out: Dict[str, np.ndarray] = {}
+    for name in names:
+        source, op, window, min_periods = TEAM_WINDOWS[name]
+        if source not in sources:
+            column = df[source] if source in df.columns else attendance_pct(df)
+            depth = max(w for s, _, w, _ in TEAM_WINDOWS.values() if s == source)
+            sources[source] = _lagged(column.to_numpy(dtype=float)[order], position, depth)
+        lagged = sources[source][:, :window]
+        count = np.count_nonzero(~np.isnan(lagged), axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if op == "mean":
+                values = np.nansum(lagged, axis=1) / count
+            elif op == "std":
+                mean = np.nansum(lagged, axis=1) / count
+                values = np.sqrt(np.nansum((lagged - mean[:, None]) ** 2, axis=1) / (count - 1))
+            elif op == "pct_change":
+                values = lagged[:, 0] / lagged[:, 1] - 1
+            else:
+                raise ValueError(f"Unknown window operation: {op}")
+        values = np.where(count >= min_periods, values, np.nan)
+        out[name] = np.empty_like(values)
+        out[name][order] = values
+    return pd.DataFrame(out, index=df.index)
+
+
+def compute_sponsorship_proxy(df: pd.DataFrame, windows: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     df = df.copy()
-    df["playoff_rate"] = (
-        df.groupby("team_id")["playoff_flag"].rolling(3, min_periods=1).mean().reset_index(level=0, drop=True)
-    )
+    windows = team_windows(df, ["playoff_rate"]) if windows is None else windows
+    df["playoff_rate"] = windows["playoff_rate"]
     df["sponsorship_proxy"] = (
         100
         * df["market_multiplier"]
@@ -62,95 +148,158 @@ def compute_sponsorship_proxy(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def compute_attendance_metrics(df: pd.DataFrame) -> pd.DataFrame:
+def compute_attendance_metrics(df: pd.DataFrame, windows: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     df = df.copy()
-    df["attendance_pct"] = (df["home_attendance"] / (df["stadium_capacity"] * 81)).clip(0, 1)
-    df["attendance_yoy_growth"] = (
-        df.groupby("team_id")["home_attendance"].pct_change().fillna(0)
-    )
-    df["attendance_consistency"] = (
-        1
-        - df.groupby("team_id")["attendance_pct"].rolling(4, min_periods=2).std().reset_index(level=0, drop=True).fillna(0)
-    )
-    df["attendance_consistency"] = df["attendance_consistency"].clip(0, 1)
+    windows = team_windows(df, ["attendance_yoy_growth", "attendance_pct_std"]) if windows is None else windows
+    df["attendance_pct"] = attendance_pct(df)
+    df["attendance_yoy_growth"] = windows["attendance_yoy_growth"].fillna(0)
+    df["attendance_consistency"] = (1 - windows["attendance_pct_std"].fillna(0)).clip(0, 1)
     return df
 
 
-def compute_engagement_momentum(df: pd.DataFrame) -> pd.DataFrame:
+def compute_engagement_momentum(df: pd.DataFrame, windows: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     df = df.copy()
-    rolling_wins = (
-        df.groupby("team_id")["wins"].rolling(3, min_periods=1).mean().reset_index(level=0, drop=True)
-    )
-    df["wins_trend"] = (df["wins"] - rolling_wins) / 20
+    windows = team_windows(df, ["wins_rolling_mean"]) if windows is None else windows
+    df["wins_trend"] = (df["wins"] - windows["wins_rolling_mean"]) / 20
     df["engagement_momentum"] = (df["wins_trend"] + 0.5 * df["playoff_rate"]).clip(-1, 1)
     return df
 
 
+PRICE_MODEL_COLUMNS = ["attendance_pct", "ticket_price_proxy", "wins", "market_tier"]
+
+
+def price_model_training_frame(df: pd.DataFrame) -> pd.DataFrame:
+    return df[PRICE_MODEL_COLUMNS].dropna().copy()
+
+
 def build_price_sensitivity_model(df: pd.DataFrame) -> PriceModelResult:
-    model_df = df[["attendance_pct", "ticket_price_proxy", "wins", "market_tier"]].dropna().copy()
+    model_df = price_model_training_frame(df)
     dummies = pd.get_dummies(model_df["market_tier"], prefix="tier", drop_first=True)
     x = pd.concat([model_df[["ticket_price_proxy", "wins"]], dummies], axis=1)
     y = model_df["attendance_pct"]
+    # Imported here so the app and pipeline only load scikit-learn when fitting.
+    from sklearn.linear_model import LinearRegression
+
     model = LinearRegression()
     model.fit(x, y)
     r2 = model.score(x, y)
     coefficients = {"ticket_price_proxy": model.coef_[0], "wins": model.coef_[1]}
     for i, col in enumerate(dummies.columns, start=2):
         coefficients[col] = model.coef_[i]
-    return PriceModelResult(model=model, coefficients=coefficients, r2=r2)
+    return PriceModelResult(model=model, coefficients=coefficients, r2=r2, feature_names=list(x.columns))
 
 
-def maybe_update_with_pybaseball(
-    attendance: pd.DataFrame, teams: pd.DataFrame
+def normalize_standings(result: Any, year: int) -> pd.DataFrame:
+    """Flatten a pybaseball ``standings`` result to team_name/wins/season rows."""
+    dfs = []
+    if isinstance(result, pd.DataFrame):
+        dfs = [result]
+    elif isinstance(result, (list, tuple)):
+        for item in result:
+            if isinstance(item, pd.DataFrame):
+                dfs.append(item)
+            elif isinstance(item, list):
+                dfs.extend([df for df in item if isinstance(df, pd.DataFrame)])
+
+    frames = []
+    for df in dfs:
+        team_col = next((c for c in df.columns if c.lower() in {"tm", "team", "club"}), None)
+        wins_col = next((c for c in df.columns if c.lower() in {"w", "wins"}), None)
+        if not team_col or not wins_col:
+            continue
+        temp = df[[team_col, wins_col]].copy()
+        temp.columns = ["team_name", "wins"]
+        temp["season"] = year
+        frames.append(temp)
+    if not frames:
+        return pd.DataFrame(columns=["team_name", "wins", "season"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def _standings_cache_fresh(path: Path, year: int, ttl_seconds: float, current_season: int) -> bool:
+    if not path.exists():
+        return False
+    if year < current_season:
+        return True
+    return time.time() - path.stat().st_mtime < ttl_seconds
+
+
+def _fetch_year(
+    year: int, fetcher: Callable[[int], Any], cache_dir: Path, ttl_seconds: float, current_season: int
 ) -> pd.DataFrame:
-    """Optionally update wins/playoff flags via pybaseball standings."""
-    import os
-    import logging
+    path = cache_dir / f"standings_{year}.csv"
+    if _standings_cache_fresh(path, year, ttl_seconds, current_season):
+        return pd.read_csv(path)
+    standings_df = normalize_standings(fetcher(year), year)
+    if not standings_df.empty:
+        standings_df.to_csv(path, index=False)
+    return standings_df
 
-    logger = logging.getLogger(__name__)
-    if os.getenv("USE_PYBASEBALL", "0") != "1":
-        return attendance
 
-    try:
-        from pybaseball import standings  # type: ignore
-    except Exception as exc:  # pragma: no cover - optional dependency path
-        logger.warning("pybaseball unavailable: %s", exc)
-        return attendance
+def fetch_standings(
+    years: Iterable[int],
+    fetcher: Callable[[int], Any],
+    cache_dir: Path = STANDINGS_CACHE_DIR,
+    ttl_seconds: float = STANDINGS_TTL_SECONDS,
+    max_workers: int = 4,
+    current_season: Optional[int] = None,
+) -> Dict[int, pd.DataFrame]:
+    """Fetch normalized standings per year on a bounded thread pool.
 
-    years = sorted(attendance["season"].unique())
-    frames = []
-    for year in years:
+    Each year is cached on disk. Completed past seasons are never refetched;
+    the current season is refetched once its cache is older than
+    ``ttl_seconds``. Years that fail or return nothing are logged and left
+    out of the result instead of failing the whole fetch.
+    """
+    current_season = current_season or date.today().year
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    results: Dict[int, pd.DataFrame] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_fetch_year, int(year), fetcher, cache_dir, ttl_seconds, current_season): int(year)
+            for year in years
+        }
+        for future in as_completed(futures):
+            year = futures[future]
+            try:
+                standings_df = future.result()
+            except Exception as exc:
+                logger.warning("pybaseball standings failed for %s: %s", year, exc)
+                continue
+            if standings_df.empty:
+                logger.warning("pybaseball returned no usable standings for %s", year)
+                continue
+            results[year] = standings_df
+    return results
+
+
+def maybe_update_with_pybaseball(
+    attendance: pd.DataFrame,
+    teams: pd.DataFrame,
+    fetcher: Optional[Callable[[int], Any]] = None,
+    cache_dir: Path = STANDINGS_CACHE_DIR,
+) -> pd.DataFrame:
+    """Optionally update wins/playoff flags via pybaseball standings.
+
+    Live standings are used when ``USE_PYBASEBALL=1`` or when a ``fetcher``
+    (any callable taking a season year) is passed explicitly.
+    """
+    if fetcher is None:
+        if os.getenv("USE_PYBASEBALL", "0") != "1":
+            return attendance
         try:
-            result = standings(year)
+            from pybaseball import standings as fetcher  # type: ignore
         except Exception as exc:  # pragma: no cover - optional dependency path
-            logger.warning("pybaseball standings failed for %s: %s", year, exc)
+            logger.warning("pybaseball unavailable: %s", exc)
             return attendance
 
-        dfs = []
-        if isinstance(result, pd.DataFrame):
-            dfs = [result]
-        elif isinstance(result, (list, tuple)):
-            for item in result:
-                if isinstance(item, pd.DataFrame):
-                    dfs.append(item)
-                elif isinstance(item, list):
-                    dfs.extend([df for df in item if isinstance(df, pd.DataFrame)])
-
-        for df in dfs:
-            team_col = next((c for c in df.columns if c.lower() in {"tm", "team", "club"}), None)
-            wins_col = next((c for c in df.columns if c.lower() in {"w", "wins"}), None)
-            if not team_col or not wins_col:
-                continue
-            temp = df[[team_col, wins_col]].copy()
-            temp.columns = ["team_name", "wins"]
-            temp["season"] = year
-            frames.append(temp)
-
-    if not frames:
+    years = sorted(attendance["season"].unique())
+    fetched = fetch_standings(years, fetcher, cache_dir=cache_dir)
+    if not fetched:
         logger.warning("pybaseball returned no usable standings; using raw data")
         return attendance
 
-    standings_df = pd.concat(frames, ignore_index=True)
+    standings_df = pd.concat([fetched[year] for year in sorted(fetched)], ignore_index=True)
     standings_df["team_name_norm"] = (
         standings_df["team_name"].astype(str).str.replace("*", "", regex=False).str.lower()
     )
@@ -161,8 +310,9 @@ def maybe_update_with_pybaseball(
     standings_df = standings_df[["team_id", "season", "wins"]]
 
     updated = attendance.merge(standings_df, on=["team_id", "season"], how="left", suffixes=("", "_pyb"))
+    has_update = updated["wins_pyb"].notna()
     updated["wins"] = updated["wins_pyb"].fillna(updated["wins"]).astype(int)
-    updated["playoff_flag"] = (updated["wins"] >= 88).astype(int)
+    updated.loc[has_update, "playoff_flag"] = (updated.loc[has_update, "wins"] >= 88).astype(int)
     updated = updated.drop(columns=["wins_pyb"])
-    logger.info("pybaseball wins updates applied")
+    logger.info("pybaseball wins updates applied for seasons: %s", sorted(fetched))
     return updated
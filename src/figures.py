@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import inspect
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.stages import hash_value
+from src.utils import FIGURES_DIR
+
+MANIFEST_NAME = "figures_manifest.json"
+
+
+def league_attendance_trend_data(df: pd.DataFrame) -> pd.DataFrame:
+    return df.groupby("season")["home_attendance"].sum().reset_index()
+
+
+def demand_vs_price_data(df: pd.DataFrame) -> pd.DataFrame:
+    latest = df[df["season"] == df["season"].max()]
+    return latest[["team_name", "market_tier", "ticket_price_proxy", "attendance_pct"]].reset_index(drop=True)
+
+
+def _plot_league_attendance_trend(plt, data: pd.DataFrame) -> None:
+    plt.figure(figsize=(8, 4))
+    plt.plot(data["season"], data["home_attendance"] / 1_000_000)
+    plt.title("League Attendance Trend")
+    plt.xlabel("Season")
+    plt.ylabel("Attendance (M)")
+
+
+def _plot_demand_vs_price(plt, data: pd.DataFrame) -> None:
+    plt.figure(figsize=(6, 4))
+    plt.scatter(data["ticket_price_proxy"], data["attendance_pct"], alpha=0.8)
+    plt.title("Demand vs Price Proxy")
+    plt.xlabel("Ticket Price Proxy")
+    plt.ylabel("Attendance %")
+
+
+def _plotly_league_attendance_trend(px, data: pd.DataFrame):
+    return px.line(data, x="season", y="home_attendance", title="League Attendance Trend")
+
+
+def _plotly_demand_vs_price(px, data: pd.DataFrame):
+    return px.scatter(
+        data,
+        x="ticket_price_proxy",
+        y="attendance_pct",
+        color="market_tier",
+        hover_name="team_name",
+        title="Demand vs Price Proxy",
+    )
+
+
+# name -> (aggregate builder, matplotlib renderer, plotly renderer)
+FIGURES: Dict[str, Tuple[Callable, Callable, Callable]] = {
+    "league_attendance_trend": (
+        league_attendance_trend_data,
+        _plot_league_attendance_trend,
+        _plotly_league_attendance_trend,
+    ),
+    "demand_vs_price": (demand_vs_price_data, _plot_demand_vs_price, _plotly_demand_vs_price),
+}
+
+
+def figure_paths(figures_dir: Path, name: str, plotly: bool = True) -> List[Path]:
+    paths = [figures_dir / f"{name}.png"]
+    if plotly:
+        paths += [figures_dir / f"{name}.json", figures_dir / f"{name}.html"]
+    return paths
+
+
+def _render_figure(name: str, data: pd.DataFrame, figures_dir: Path, plotly: bool) -> str:
+    """Render one figure; runs in a worker process."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    _, plot, plotly_plot = FIGURES[name]
+    plot(plt, data)
+    plt.tight_layout()
+    plt.savefig(figures_dir / f"{name}.png", dpi=150)
+    plt.close()
+
+    if plotly:
+        import plotly.express as px
+
+        fig = plotly_plot(px, data)
+        fig.update_layout(margin=dict(l=10, r=10, t=40, b=10))
+        (figures_dir / f"{name}.json").write_text(fig.to_json(), encoding="utf-8")
+        fig.write_html(figures_dir / f"{name}.html", include_plotlyjs="cdn")
+    return name
+
+
+def save_figures(
+    df: pd.DataFrame,
+    figures_dir: Path = FIGURES_DIR,
+    workers: Optional[int] = None,
+    plotly: bool = True,
+) -> Dict[str, str]:
+    """Render figures whose source aggregates changed since the last run.
+
+    Each figure's aggregate is hashed together with this module's source and
+    compared against ``figures_manifest.json``; unchanged figures with their
+    files on disk are skipped. Pending figures render in parallel worker
+    processes with the non-interactive Agg backend. Returns the status
+    ("rendered" or "unchanged") per figure.
+    """
+    figures_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = figures_dir / MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+    code_hash = hash_value(inspect.getsource(sys.modules[__name__]))
+
+    status: Dict[str, str] = {}
+    pending: Dict[str, pd.DataFrame] = {}
+    hashes: Dict[str, str] = {}
+    for name, (build, _, _) in FIGURES.items():
+        data = build(df)
+        hashes[name] = hash_value([data, code_hash, plotly])
+        files_exist = all(p.exists() for p in figure_paths(figures_dir, name, plotly))
+        if manifest.get(name) == hashes[name] and files_exist:
+            status[name] = "unchanged"
+        else:
+            pending[name] = data
+
+    workers = min(len(pending), os.cpu_count() or 1) if workers is None else workers
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_render_figure, n, d, figures_dir, plotly) for n, d in pending.items()]
+            for future in futures:
+                status[future.result()] = "rendered"
+    else:
+        for name, data in pending.items():
+            status[_render_figure(name, data, figures_dir, plotly)] = "rendered"
+
+    manifest.update({name: hashes[name] for name in pending})
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return status
+
+
+def load_plotly_figure(name: str, figures_dir: Path = FIGURES_DIR):
+    """Return the pre-rendered Plotly figure, or None if it was not emitted."""
+    path = figures_dir / f"{name}.json"
+    if not path.exists():
+        return None
+    import plotly.io as pio
+
+    return pio.from_json(path.read_text(encoding="utf-8"))
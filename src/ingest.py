@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+GAME_FILE = "attendance_by_game.csv"
+GAME_DTYPES = {"team_id": "category", "season": "int32", "is_weekend": "int8", "attendance": "int64"}
+GAME_FEATURES = ["games", "sellout_rate", "weekday_avg_attendance", "weekend_avg_attendance"]
+
+# Running per (team_id, season) sums; every feature is derived from these.
+_PARTIALS = ["home_attendance", "games", "sellouts", "weekend_attendance", "weekend_games"]
+
+
+def iter_game_chunks(path: Path, chunksize: int = 1_000_000) -> Iterator[pd.DataFrame]:
+    """Read a per-game attendance file in chunks of ``chunksize`` rows."""
+    reader = pd.read_csv(path, usecols=list(GAME_DTYPES), dtype=GAME_DTYPES, chunksize=chunksize)
+    with reader:
+        yield from reader
+
+
+def _chunk_partials(chunk: pd.DataFrame, capacity: pd.Series) -> pd.DataFrame:
+    team = chunk["team_id"].astype("category")
+    attendance = chunk["attendance"].to_numpy()
+    weekend = chunk["is_weekend"].to_numpy().astype(bool)
+    cap = capacity.reindex(team.cat.categories.astype(str)).to_numpy()[team.cat.codes.to_numpy()]
+    parts = pd.DataFrame({
+        "team_id": team,
+        "season": chunk["season"].to_numpy(),
+        "home_attendance": attendance,
+        "games": 1,
+        "sellouts": (attendance >= cap).astype("int64"),
+        "weekend_attendance": np.where(weekend, attendance, 0),
+        "weekend_games": weekend.astype("int64"),
+    })
+    partial = parts.groupby(["team_id", "season"], sort=False, observed=True).sum()
+    partial.index = partial.index.set_levels(partial.index.levels[0].astype(str), level=0)
+    return partial
+
+
+def aggregate_games(chunks: Iterable[pd.DataFrame], capacity: pd.DataFrame) -> pd.DataFrame:
+    """Fold per-game chunks into one row per ``(team_id, season)``.
+
+    ``chunks`` can be any iterable of game frames, such as ``iter_game_chunks``
+    or a generator over gate-scan batches. Only the running sums per team
+    season are held between chunks, so memory is bounded by the number of
+    team seasons rather than the number of games. A game is a sellout when
+    attendance reaches ``stadium_capacity``.
+    """
+    cap = capacity.set_index(capacity["team_id"].astype(str))["stadium_capacity"]
+    totals: Optional[pd.DataFrame] = None
+    rows = 0
+    for chunk in chunks:
+        partial = _chunk_partials(chunk, cap)
+        totals = partial if totals is None else totals.add(partial, fill_value=0)
+        rows += len(chunk)
+    if totals is None:
+        return pd.DataFrame(columns=["team_id", "season", "home_attendance", *GAME_FEATURES])
+    logger.info("Aggregated %d game rows into %d team seasons", rows, len(totals))
+
+    totals = totals.astype("int64").sort_index()
+    weekday_games = totals["games"] - totals["weekend_games"]
+    out = pd.DataFrame({
+        "home_attendance": totals["home_attendance"],
+        "games": totals["games"],
+        "sellout_rate": totals["sellouts"] / totals["games"],
+        "weekday_avg_attendance": (totals["home_attendance"] - totals["weekend_attendance"]) / weekday_games.where(weekday_games > 0),
+        "weekend_avg_attendance": totals["weekend_attendance"] / totals["weekend_games"].where(totals["weekend_games"] > 0),
+    })
+    return out.reset_index()
+
+
+def attendance_from_games(
+    seasons: pd.DataFrame,
+    capacity: pd.DataFrame,
+    path: Path,
+    chunksize: int = 1_000_000,
+) -> pd.DataFrame:
+    """Season attendance frame built from a per-game file.
+
+    ``home_attendance`` is replaced by the summed gate counts and the game
+    features are appended; ``wins`` and ``playoff_flag`` still come from
+    ``seasons``. Team seasons without game rows keep their reported total.
+    """
+    games = aggregate_games(iter_game_chunks(path, chunksize), capacity)
+    games["team_id"] = games["team_id"].astype(seasons["team_id"].dtype)
+    merged = seasons.merge(games, on=["team_id", "season"], how="left", suffixes=("", "_games"))
+    merged["home_attendance"] = (
+        merged.pop("home_attendance_games").fillna(merged["home_attendance"]).astype("int64")
+    )
+    return merged
@@ -1,58 +1,126 @@
 from __future__ import annotations
 
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from string import Template
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
-from src.benchmarking import top_drivers
-from src.simulator import recommend_scenario
+from src.benchmarking import driver_attribution
+from src.screening import screen, screen_masks
+from src.simulator import (
+    SimulationResult,
+    recommend_scenarios,
+)
+
+TICKETING_RECS = (
+    "Ticketing: test targeted price lifts on high-demand sections to close value gap.",
+    "Ticketing: expand dynamic bundles to lift yield without suppressing demand.",
+)
+MARKETING_RECS = (
+    "Marketing: invest in fan acquisition around key series to stabilize demand.",
+    "Marketing: scale always-on content and CRM to convert momentum into renewals.",
+)
+SPONSORSHIP_RECS = (
+    "Sponsorship: package digital inventory with local partner activations.",
+    "Sponsorship: pursue premium category exclusives tied to broadcast reach.",
+)
+
+CLUB_MEMO_TEMPLATE = Template(
+    "# $team_name | Club Strategy Memo ($season)\n\n"
+    "**Tier:** $cpi_tier  \n**CPI:** $cpi\n\n"
+    "## Key Drivers\n"
+    "- $driver_1\n- $driver_2\n- $driver_3\n\n"
+    "## Recommendations\n"
+    "- $ticketing_rec\n- $marketing_rec\n- $sponsorship_rec\n\n"
+    "## Expected Impact\n"
+    "- Scenario: price +$price_change%, marketing +$marketing_lift%, wins +$win_change%\n"
+    "- Revenue proxy change: $revenue_change%\n"
+)
 
 
 def generate_recommendations(row: pd.Series) -> List[str]:
-    recs = []
-    if row["attendance_pct"] >= 0.82 and row["ticket_price_proxy"] < 35:
-        recs.append("Ticketing: test targeted price lifts on high-demand sections to close value gap.")
-    else:
-        recs.append("Ticketing: expand dynamic bundles to lift yield without suppressing demand.")
-
-    if row["engagement_momentum"] < 0:
-        recs.append("Marketing: invest in fan acquisition around key series to stabilize demand.")
-    else:
-        recs.append("Marketing: scale always-on content and CRM to convert momentum into renewals.")
-
-    if row["sponsorship_proxy"] < 95:
-        recs.append("Sponsorship: package digital inventory with local partner activations.")
-    else:
-        recs.append("Sponsorship: pursue premium category exclusives tied to broadcast reach.")
-    return recs
-
-
-def build_club_memo(row: pd.Series) -> str:
-    drivers = top_drivers(row)
-    params, sim = recommend_scenario(row)
-
-    memo = f"# {row['team_name']} | Club Strategy Memo ({int(row['season'])})\n\n"
-    memo += f"**Tier:** {row['cpi_tier']}  \n**CPI:** {row['cpi']:.1f}\n\n"
-    memo += "## Key Drivers\n"
-    memo += f"- {drivers[0]}\n- {drivers[1]}\n- {drivers[2]}\n\n"
-    memo += "## Recommendations\n"
-    for rec in generate_recommendations(row):
-        memo += f"- {rec}\n"
-    memo += "\n"
-    memo += "## Expected Impact\n"
-    memo += (
-        f"- Scenario: price +{params['price_change_pct']*100:.0f}%, marketing +{params['marketing_lift_pct']*100:.0f}%, wins +{params['win_change_pct']*100:.0f}%\n"
-        f"- Revenue proxy change: {sim.revenue_change_pct*100:.1f}%\n"
+    ticketing = bool(screen_masks(row.to_frame().T, ["price_lift"])["price_lift"].iloc[0])
+    return [
+        TICKETING_RECS[0] if ticketing else TICKETING_RECS[1],
+        MARKETING_RECS[0] if row["engagement_momentum"] < 0 else MARKETING_RECS[1],
+        SPONSORSHIP_RECS[0] if row["sponsorship_proxy"] < 95 else SPONSORSHIP_RECS[1],
+    ]
+
+
+def build_memo_facts(
+    df: pd.DataFrame, recommendations: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """Compute every club memo input for all rows as one table.
+
+    Drivers come from the pipeline's ``driver_*`` columns (computed with
+    ``driver_attribution`` when absent); recommendation flags and the best
+    grid scenario are evaluated column-wise. ``recommendations`` may pass a
+    precomputed ``recommend_scenarios`` frame aligned to ``df``.
+    """
+    best = recommendations if recommendations is not None else recommend_scenarios(df)
+    facts = pd.DataFrame(index=df.index)
+    facts["team_id"] = df["team_id"].astype(str)
+    facts["team_name"] = df["team_name"].astype(str)
+    facts["season"] = df["season"].astype(int)
+    facts["cpi_tier"] = df["cpi_tier"].astype(str)
+    facts["cpi"] = df["cpi"].astype(float)
+
+    drivers = df if "driver_3" in df.columns else driver_attribution(df)
+    for col in ("driver_1", "driver_2", "driver_3"):
+        facts[col] = drivers[col].astype(str)
+
+    ticketing = screen_masks(df, ["price_lift"])["price_lift"].to_numpy()
+    facts["ticketing_rec"] = np.where(ticketing, *TICKETING_RECS)
+    facts["marketing_rec"] = np.where(df["engagement_momentum"] < 0, *MARKETING_RECS)
+    facts["sponsorship_rec"] = np.where(df["sponsorship_proxy"] < 95, *SPONSORSHIP_RECS)
+
+    for col in ("price_change_pct", "marketing_lift_pct", "win_change_pct", "revenue_change_pct"):
+        facts[col] = best[col].astype(float)
+    return facts
+
+
+def render_club_memo(facts: Mapping) -> str:
+    """Fill the precompiled club memo template from one facts row."""
+    return CLUB_MEMO_TEMPLATE.substitute(
+        team_name=facts["team_name"],
+        season=int(facts["season"]),
+        cpi_tier=facts["cpi_tier"],
+        cpi=f"{facts['cpi']:.1f}",
+        driver_1=facts["driver_1"],
+        driver_2=facts["driver_2"],
+        driver_3=facts["driver_3"],
+        ticketing_rec=facts["ticketing_rec"],
+        marketing_rec=facts["marketing_rec"],
+        sponsorship_rec=facts["sponsorship_rec"],
+        price_change=f"{facts['price_change_pct']*100:.0f}",
+        marketing_lift=f"{facts['marketing_lift_pct']*100:.0f}",
+        win_change=f"{facts['win_change_pct']*100:.0f}",
+        revenue_change=f"{facts['revenue_change_pct']*100:.1f}",
     )
-    return memo
 
 
-def build_league_memo(df: pd.DataFrame) -> str:
-    latest_season = df["season"].max()
+def build_club_memo(
+    row: pd.Series,
+    recommendation: Optional[Tuple[Dict[str, float], SimulationResult]] = None,
+) -> str:
+    frame = row.to_frame().T
+    best = None
+    if recommendation is not None:
+        params, sim = recommendation
+        best = pd.DataFrame([{**params, "revenue_change_pct": sim.revenue_change_pct}], index=frame.index)
+    facts = build_memo_facts(frame, best)
+    return render_club_memo(facts.iloc[0])
+
+
+def build_league_memo(df: pd.DataFrame, season: Optional[int] = None) -> str:
+    latest_season = df["season"].max() if season is None else season
     latest = df[df["season"] == latest_season].copy()
-    under_monetized = latest[(latest["attendance_pct"] > 0.8) & (latest["ticket_price_proxy"] < 34)]
-    demand_constrained = latest[(latest["attendance_pct"] < 0.65) & (latest["ticket_price_proxy"] < 32)]
+    under_monetized = screen(latest, "under_monetized", sort=False)
+    demand_constrained = screen(latest, "demand_constrained", sort=False)
 
     memo = f"# League Opportunity Memo ({int(latest_season)})\n\n"
     memo += "## Top Opportunities\n"
@@ -70,14 +138,73 @@ def build_league_memo(df: pd.DataFrame) -> str:
     return memo
 
 
-def write_memos(df: pd.DataFrame, output_dir: Path) -> None:
+def _render_batch(records: Sequence[Mapping]) -> List[str]:
+    return [render_club_memo(record) for record in records]
+
+
+def render_memos(facts: pd.DataFrame, workers: Optional[int] = None) -> List[str]:
+    """Render memos for every facts row, optionally across worker processes."""
+    records = facts.to_dict("records")
+    if not workers or workers <= 1 or len(records) < 2 * workers:
+        return _render_batch(records)
+    size = -(-len(records) // workers)
+    batches = [records[i : i + size] for i in range(0, len(records), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [memo for batch in pool.map(_render_batch, batches) for memo in batch]
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Write ``text`` unless the file already holds identical content."""
+    data = text.encode("utf-8")
+    if path.exists() and hashlib.sha256(path.read_bytes()).digest() == hashlib.sha256(data).digest():
+        return False
+    path.write_bytes(data)
+    return True
+
+
+def memo_paths(df: pd.DataFrame, output_dir: Path, all_seasons: bool = False) -> List[Path]:
+    """Every file ``write_memos`` writes for ``df`` with the same arguments."""
+    latest_season = int(df["season"].max())
+    latest = df.loc[df["season"] == latest_season, "team_id"].unique()
+    paths = [output_dir / f"{team_id}.md" for team_id in latest] + [output_dir / "league_memo.md"]
+    if all_seasons:
+        for season, team_ids in df.groupby("season", sort=True)["team_id"]:
+            season_dir = output_dir / str(season)
+            paths += [season_dir / f"{team_id}.md" for team_id in team_ids.unique()]
+            paths.append(season_dir / "league_memo.md")
+    return paths
+
+
+def write_memos(
+    df: pd.DataFrame,
+    output_dir: Path,
+    all_seasons: bool = False,
+    workers: Optional[int] = None,
+) -> int:
+    """Write club and league memos, skipping files whose content is unchanged.
+
+    Latest-season memos go directly in ``output_dir``. With ``all_seasons``
+    every season is also written to ``output_dir/<season>/``. Returns the
+    number of files actually written.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
-    latest_season = df["season"].max()
-    latest = df[df["season"] == latest_season]
-
-    for _, row in latest.iterrows():
-        memo = build_club_memo(row)
-        (output_dir / f"{row['team_id']}.md").write_text(memo, encoding="utf-8")
-
-    league_memo = build_league_memo(df)
-    (output_dir / "league_memo.md").write_text(league_memo, encoding="utf-8")
+    latest_season = int(df["season"].max())
+    rows = df if all_seasons else df[df["season"] == latest_season]
+
+    facts = build_memo_facts(rows)
+    memos = render_memos(facts, workers)
+
+    written = 0
+    for team_id, season, memo in zip(facts["team_id"], facts["season"], memos):
+        if season == latest_season:
+            written += write_if_changed(output_dir / f"{team_id}.md", memo)
+        if all_seasons:
+            season_dir = output_dir / str(season)
+            season_dir.mkdir(exist_ok=True)
+            written += write_if_changed(season_dir / f"{team_id}.md", memo)
+
+    written += write_if_changed(output_dir / "league_memo.md", build_league_memo(df))
+    if all_seasons:
+        for season in sorted(df["season"].unique()):
+            written += write_if_changed(output_dir / str(season) / "league_memo.md", build_league_memo(df, season))
+    return written
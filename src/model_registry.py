@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.features import PriceModelResult, build_price_sensitivity_model, price_model_training_frame
+from src.stages import hash_value
+from src.utils import PROCESSED_DIR
+
+logger = logging.getLogger(__name__)
+
+MODELS_DIR = PROCESSED_DIR / "models"
+PRICE_MODEL_PATH = MODELS_DIR / "price_model.pkl"
+# Bump when the price model's features or fit change so old artifacts are refit.
+PRICE_MODEL_VERSION = 1
+
+
+@dataclass
+class ModelArtifact:
+    result: PriceModelResult
+    data_hash: str
+    version: int
+    trained_at: str
+
+
+def training_data_hash(df: pd.DataFrame) -> str:
+    """Hash of the price model's training rows.
+
+    Numbers are hashed at float32 precision and tiers as strings, so the
+    pipeline's float64 frame and the app's compacted frame agree.
+    """
+    frame = price_model_training_frame(df)
+    frame = frame.assign(market_tier=frame["market_tier"].astype(str))
+    numeric = ["attendance_pct", "ticket_price_proxy", "wins"]
+    frame[numeric] = frame[numeric].astype("float32")
+    return hash_value(frame.reset_index(drop=True))
+
+
+def save_model(artifact: ModelArtifact, path: Path = PRICE_MODEL_PATH) -> Path:
+    """Pickle the artifact, swapping the file in atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with tmp_path.open("wb") as fh:
+        pickle.dump(artifact, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_model(path: Path = PRICE_MODEL_PATH) -> Optional[ModelArtifact]:
+    """Saved artifact, or None when missing, unreadable or from another version."""
+    if not path.exists():
+        return None
+    try:
+        with path.open("rb") as fh:
+            artifact = pickle.load(fh)
+    except Exception as exc:
+        logger.warning("Ignoring unreadable model artifact %s: %s", path, exc)
+        return None
+    if getattr(artifact, "version", None) != PRICE_MODEL_VERSION:
+        return None
+    return artifact
+
+
+def get_price_model(df: pd.DataFrame, path: Path = PRICE_MODEL_PATH) -> ModelArtifact:
+    """Load the saved price model, refitting and saving only when ``df``'s training data changed."""
+    data_hash = training_data_hash(df)
+    artifact = load_model(path)
+    if artifact is not None and artifact.data_hash == data_hash:
+        return artifact
+    logger.info("Fitting price model (training data changed or no saved model)")
+    artifact = ModelArtifact(
+        result=build_price_sensitivity_model(df),
+        data_hash=data_hash,
+        version=PRICE_MODEL_VERSION,
+        trained_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    )
+    save_model(artifact, path)
+    return artifact
+
+
+def predict(result: PriceModelResult, frame: pd.DataFrame, chunk_size: int = 1_000_000) -> np.ndarray:
+    """Predicted attendance % for every row of ``frame``.
+
+    ``frame`` needs ``ticket_price_proxy``, ``wins`` and ``market_tier``.
+    The linear model is applied directly to NumPy chunks of ``chunk_size``
+    rows, so scoring large scenario frames needs no per-row work and does
+    not touch scikit-learn.
+    """
+    coef = np.asarray(result.model.coef_, dtype=float)
+    intercept = float(result.model.intercept_)
+    price = frame["ticket_price_proxy"].to_numpy(dtype=float)
+    wins = frame["wins"].to_numpy(dtype=float)
+    tiers = frame["market_tier"].astype(str).to_numpy()
+    out = np.empty(len(frame))
+    for start in range(0, len(frame), chunk_size):
+        stop = start + chunk_size
+        columns = [price[start:stop], wins[start:stop]]
+        for name in result.feature_names[2:]:
+            columns.append((tiers[start:stop] == name[len("tier_"):]).astype(float))
+        out[start:stop] = np.column_stack(columns) @ coef + intercept
+    return out
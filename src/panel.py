@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.features import TIER_BASE_PRICE, TIER_MULTIPLIER
+
+
+@dataclass
+class Panel:
+    """Dense ``[team, season]`` view of the long club-season frame.
+
+    Every column becomes a 2-D array with teams on axis 0 and sorted seasons
+    on axis 1; ``mask`` marks the cells that have a row in the long frame.
+    Numeric columns are float arrays with NaN in missing cells, other columns
+    are object arrays with None. ``rows`` keeps each long row's cell so
+    ``to_long`` restores the original row order, index and dtypes.
+    """
+
+    teams: np.ndarray
+    seasons: np.ndarray
+    mask: np.ndarray
+    data: Dict[str, np.ndarray]
+    rows: tuple
+    index: pd.Index
+    dtypes: Dict[str, Any]
+
+    @classmethod
+    def from_long(cls, df: pd.DataFrame) -> "Panel":
+        team_idx, teams = pd.factorize(df["team_id"], sort=True)
+        season_idx, seasons = pd.factorize(df["season"], sort=True)
+        shape = (len(teams), len(seasons))
+        mask = np.zeros(shape, dtype=bool)
+        mask[team_idx, season_idx] = True
+        if mask.sum() != len(df):
+            raise ValueError("Panel requires one row per (team_id, season)")
+
+        data: Dict[str, np.ndarray] = {}
+        for col in df.columns:
+            values = df[col].to_numpy()
+            if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+                grid = np.full(shape, np.nan)
+            else:
+                grid = np.full(shape, None, dtype=object)
+            grid[team_idx, season_idx] = values
+            data[col] = grid
+        return cls(
+            teams=np.asarray(teams),
+            seasons=np.asarray(seasons),
+            mask=mask,
+            data=data,
+            rows=(team_idx, season_idx),
+            index=df.index,
+            dtypes=df.dtypes.to_dict(),
+        )
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.data[name]
+
+    def __setitem__(self, name: str, values: np.ndarray) -> None:
+        self.data[name] = np.where(self.mask, values, np.nan)
+
+    def to_long(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        columns = list(self.data) if columns is None else list(columns)
+        out = {}
+        for col in columns:
+            values = self.data[col][self.rows]
+            dtype = self.dtypes.get(col)
+            out[col] = pd.Series(values, index=self.index).astype(dtype) if dtype is not None else values
+        return pd.DataFrame(out, index=self.index)
+
+
+def _map(values: np.ndarray, mapping: Dict[str, float], default: float) -> np.ndarray:
+    flat = pd.Series(values.ravel()).map(mapping).fillna(default)
+    return flat.to_numpy(dtype=float).reshape(values.shape)
+
+
+def rank_pct(x: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Average-tie percentile rank within each season (axis 0), like ``rank(pct=True)``."""
+    x = np.where(mask, x, np.nan)
+    n = x.shape[0]
+    order = np.argsort(x, axis=0, kind="stable")
+    ordered = np.take_along_axis(x, order, axis=0)
+    position = np.broadcast_to(np.arange(n)[:, None], x.shape)
+    tie_start = np.r_[np.ones((1, x.shape[1]), dtype=bool), ordered[1:] != ordered[:-1]]
+    tie_end = np.r_[ordered[1:] != ordered[:-1], np.ones((1, x.shape[1]), dtype=bool)]
+    first = np.maximum.accumulate(np.where(tie_start, position, 0), axis=0)
+    last = np.minimum.accumulate(np.where(tie_end, position, n - 1)[::-1], axis=0)[::-1]
+    ranks = np.empty_like(x)
+    np.put_along_axis(ranks, order, (first + last) / 2 + 1, axis=0)
+    count = np.count_nonzero(~np.isnan(x), axis=0)
+    return np.where(np.isnan(x), np.nan, ranks / count)
+
+
+def _shift(x: np.ndarray, lag: int) -> np.ndarray:
+    out = np.full(x.shape, np.nan)
+    out[:, lag:] = x[:, : x.shape[1] - lag]
+    return out
+
+
+def along_observed(func: Callable[[np.ndarray], np.ndarray], x: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Apply a season-axis operation over each team's observed seasons only.
+
+    Observed cells are packed to the left in season order before ``func``
+    runs, so a team missing a season windows over its previous row, as the
+    long-format groupby does.
+    """
+    order = np.argsort(~mask, axis=1, kind="stable")
+    packed = np.where(np.take_along_axis(mask, order, axis=1), np.take_along_axis(x, order, axis=1), np.nan)
+    out = np.full(x.shape, np.nan)
+    np.put_along_axis(out, order, func(packed), axis=1)
+    return np.where(mask, out, np.nan)
+
+
+def rolling(x: np.ndarray, mask: np.ndarray, window: int, min_periods: int, op: str = "mean") -> np.ndarray:
+    """Trailing rolling mean or sample std along the season axis."""
+
+    def apply(packed: np.ndarray) -> np.ndarray:
+        lagged = np.stack([_shift(packed, lag) for lag in range(window)], axis=-1)
+        count = np.count_nonzero(~np.isnan(lagged), axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.nansum(lagged, axis=-1) / count
+            if op == "std":
+                values = np.sqrt(np.nansum((lagged - mean[..., None]) ** 2, axis=-1) / (count - 1))
+            elif op == "mean":
+                values = mean
+            else:
+                raise ValueError(f"Unknown rolling operation: {op}")
+        return np.where(count >= min_periods, values, np.nan)
+
+    return along_observed(apply, x, mask)
+
+
+def pct_change(x: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Change versus each team's previous observed season."""
+
+    def apply(packed: np.ndarray) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return packed / _shift(packed, 1) - 1
+
+    return along_observed(apply, x, mask)
+
+
+def add_market_features(panel: Panel) -> Panel:
+    panel["market_base_price"] = _map(panel["market_tier"], TIER_BASE_PRICE, 30)
+    panel["market_multiplier"] = _map(panel["market_tier"], TIER_MULTIPLIER, 1.0)
+    return panel
+
+
+def compute_ticket_price_proxy(panel: Panel) -> Panel:
+    panel["wins_percentile"] = rank_pct(panel["wins"], panel.mask)
+    panel["ticket_price_proxy"] = np.round(panel["market_base_price"] * (0.9 + 0.3 * panel["wins_percentile"]), 2)
+    return panel
+
+
+def compute_sponsorship_proxy(panel: Panel) -> Panel:
+    panel["playoff_rate"] = rolling(panel["playoff_flag"], panel.mask, 3, 1)
+    panel["sponsorship_proxy"] = np.round(
+        100 * panel["market_multiplier"] * (1 + 0.2 * panel["playoff_rate"] + 0.15 * panel["wins_percentile"]),
+        1,
+    )
+    return panel
+
+
+def compute_attendance_metrics(panel: Panel) -> Panel:
+    panel["attendance_pct"] = np.clip(panel["home_attendance"] / (panel["stadium_capacity"] * 81), 0, 1)
+    growth = pct_change(panel["home_attendance"], panel.mask)
+    panel["attendance_yoy_growth"] = np.nan_to_num(growth, nan=0.0, posinf=np.inf, neginf=-np.inf)
+    std = rolling(panel["attendance_pct"], panel.mask, 4, 2, op="std")
+    panel["attendance_consistency"] = np.clip(1 - np.nan_to_num(std, nan=0.0), 0, 1)
+    return panel
+
+
+def compute_engagement_momentum(panel: Panel) -> Panel:
+    rolling_wins = rolling(panel["wins"], panel.mask, 3, 1)
+    panel["wins_trend"] = (panel["wins"] - rolling_wins) / 20
+    panel["engagement_momentum"] = np.clip(panel["wins_trend"] + 0.5 * panel["playoff_rate"], -1, 1)
+    return panel
+
+
+PANEL_STEPS: List[Callable[[Panel], Panel]] = [
+    add_market_features,
+    compute_ticket_price_proxy,
+    compute_sponsorship_proxy,
+    compute_attendance_metrics,
+    compute_engagement_momentum,
+]
+
+
+def build_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Panel-native equivalent of the long-format feature steps in ``build_dataset``."""
+    panel = Panel.from_long(df)
+    for step in PANEL_STEPS:
+        panel = step(panel)
+    return panel.to_long()
@@ -1,40 +1,68 @@
 from __future__ import annotations
 
+import argparse
 import logging
+import os
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Dict, List, Optional, Sequence
 
-import matplotlib.pyplot as plt
 import pandas as pd
 
-from src import benchmarking
+from src import (
+    benchmarking,
+    compaction,
+    database,
+    elasticity,
+    features,
+    figures,
+    ingest,
+    memos,
+    model_registry,
+    panel,
+    screening,
+    simulator,
+    surfaces,
+)
+from src.compaction import compact_club_metrics, write_memory_report
 from src.features import (
     add_market_features,
-    build_price_sensitivity_model,
     compute_attendance_metrics,
     compute_engagement_momentum,
     compute_sponsorship_proxy,
     compute_ticket_price_proxy,
     load_raw_data,
+    team_windows,
+)
+from src.memos import memo_paths, write_memos
+from src.profiling import profiler_from_env
+from src.stages import Stage, StageReport, run_stages, write_report
+from src.storage import CLUB_METRICS_PARQUET, club_metrics_signature, write_columnar
+from src.utils import (
+    CACHE_DIR,
+    FIGURES_DIR,
+    MEMOS_DIR,
+    OUTPUTS_DIR,
+    PROCESSED_DIR,
+    RAW_DIR,
+    ensure_dirs,
+    setup_logging,
 )
-from src.memos import write_memos
-from src.utils import FIGURES_DIR, MEMOS_DIR, PROCESSED_DIR, ensure_dirs, setup_logging
 
 logger = logging.getLogger(__name__)
 
 
-def build_dataset() -> pd.DataFrame:
-    """Build the club metrics dataset from raw inputs and feature engineering."""
-    raw = load_raw_data()
+def merge_raw(raw: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Join attendance to team, market and capacity reference tables."""
     df = raw["attendance"].merge(raw["teams"], on="team_id", how="left")
     df = df.merge(raw["market"], on="team_id", how="left")
     df = df.merge(raw["capacity"], on="team_id", how="left")
+    return df
 
-    df = add_market_features(df)
-    df = compute_ticket_price_proxy(df)
-    df = compute_sponsorship_proxy(df)
-    df = compute_attendance_metrics(df)
-    df = compute_engagement_momentum(df)
 
+def add_composite_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """Derive revenue, fan demand and efficiency metrics feeding the CPI."""
+    df = df.copy()
     df["revenue_potential"] = (
         df["ticket_price_proxy"] * df["home_attendance"] * df["market_multiplier"]
     )
@@ -45,53 +73,173 @@ def build_dataset() -> pd.DataFrame:
     )
 
     df["operational_efficiency"] = df["attendance_consistency"]
+    return df
+
+
+def build_dataset(raw: Optional[Dict[str, pd.DataFrame]] = None, use_panel: bool = False) -> pd.DataFrame:
+    """Build the club metrics dataset from raw inputs and feature engineering.
+
+    ``use_panel`` computes the features on a dense team x season panel
+    (``src.panel``) instead of the long frame; the numbers are the same.
+    """
+    df = merge_raw(raw if raw is not None else load_raw_data())
+
+    if use_panel:
+        df = panel.build_features(df)
+    else:
+        df = add_market_features(df)
+        windows = team_windows(df)
+        df = compute_ticket_price_proxy(df)
+        df = compute_sponsorship_proxy(df, windows)
+        df = compute_attendance_metrics(df, windows)
+        df = compute_engagement_momentum(df, windows)
+    df = add_composite_metrics(df)
 
     df = benchmarking.compute_cpi(df)
     df = benchmarking.assign_tiers(df)
+    df = benchmarking.driver_attribution(df)
 
     return df
 
 
-def save_figures(df: pd.DataFrame, figures_dir: Path) -> None:
-    """Create and save core figures used in the README and app."""
-    figures_dir.mkdir(parents=True, exist_ok=True)
-
-    attendance_trend = df.groupby("season")["home_attendance"].sum().reset_index()
-    plt.figure(figsize=(8, 4))
-    plt.plot(attendance_trend["season"], attendance_trend["home_attendance"] / 1_000_000)
-    plt.title("League Attendance Trend")
-    plt.xlabel("Season")
-    plt.ylabel("Attendance (M)")
-    plt.tight_layout()
-    plt.savefig(figures_dir / "league_attendance_trend.png", dpi=150)
-    plt.close()
-
-    latest = df[df["season"] == df["season"].max()]
-    plt.figure(figsize=(6, 4))
-    plt.scatter(latest["ticket_price_proxy"], latest["attendance_pct"], alpha=0.8)
-    plt.title("Demand vs Price Proxy")
-    plt.xlabel("Ticket Price Proxy")
-    plt.ylabel("Attendance %")
-    plt.tight_layout()
-    plt.savefig(figures_dir / "demand_vs_price.png", dpi=150)
-    plt.close()
-
-
-def main() -> None:
-    """Run end-to-end pipeline: process data, save figures, write memos."""
-    setup_logging()
-    ensure_dirs([PROCESSED_DIR, FIGURES_DIR, MEMOS_DIR])
-
-    df = build_dataset()
+def write_club_metrics(df: pd.DataFrame) -> None:
     df.to_csv(PROCESSED_DIR / "club_metrics.csv", index=False)
 
-    model = build_price_sensitivity_model(df)
+
+def write_price_coefficients(model: features.PriceModelResult) -> None:
     coeffs = pd.DataFrame([model.coefficients])
     coeffs["r2"] = model.r2
     coeffs.to_csv(PROCESSED_DIR / "price_sensitivity_coeffs.csv", index=False)
 
-    save_figures(df, FIGURES_DIR)
-    write_memos(df, MEMOS_DIR)
+
+def write_memo_files(df: pd.DataFrame) -> List[Path]:
+    """Write club and league memos for every season and return their paths."""
+    write_memos(df, MEMOS_DIR, all_seasons=True)
+    return memo_paths(df, MEMOS_DIR, all_seasons=True)
+
+
+def pipeline_stages(games: bool = False) -> List[Stage]:
+    """Declare the pipeline as a stage graph in execution order."""
+    raw_files = sorted(RAW_DIR.glob("*.csv"))
+    use_pybaseball = os.getenv("USE_PYBASEBALL", "0")
+    return [
+        # Live standings always reload: fetch_standings applies its own disk
+        # cache and TTL, and unchanged data still lets downstream stages hit.
+        Stage(
+            "raw",
+            lambda: load_raw_data(games=games),
+            files=raw_files,
+            params={"USE_PYBASEBALL": use_pybaseball, "games": games},
+            code=[features, ingest],
+            cache=use_pybaseball != "1",
+        ),
+        Stage("merged", merge_raw, ["raw"]),
+        Stage("market_features", add_market_features, ["merged"]),
+        Stage("ticket_price", compute_ticket_price_proxy, ["market_features"]),
+        Stage("team_windows", team_windows, ["merged"]),
+        Stage("sponsorship", compute_sponsorship_proxy, ["ticket_price", "team_windows"]),
+        Stage("attendance", compute_attendance_metrics, ["sponsorship", "team_windows"]),
+        Stage("engagement", compute_engagement_momentum, ["attendance", "team_windows"]),
+        Stage("composites", add_composite_metrics, ["engagement"]),
+        Stage("cpi", benchmarking.compute_cpi, ["composites"]),
+        Stage("tiers", benchmarking.assign_tiers, ["cpi"]),
+        Stage("dataset", benchmarking.driver_attribution, ["tiers"]),
+        Stage("club_metrics_csv", write_club_metrics, ["dataset"], outputs=[PROCESSED_DIR / "club_metrics.csv"]),
+        Stage("compact", compact_club_metrics, ["dataset"], code=[compaction]),
+        Stage("club_metrics_parquet", write_columnar, ["compact"], outputs=[CLUB_METRICS_PARQUET]),
+        Stage(
+            "memory_report",
+            lambda df, compact: write_memory_report(df, compact, OUTPUTS_DIR / "memory_report.csv"),
+            ["dataset", "compact"],
+            outputs=[OUTPUTS_DIR / "memory_report.csv"],
+            code=[compaction],
+        ),
+        Stage(
+            "database",
+            lambda raw, df: database.build_database(raw, df, source=club_metrics_signature()),
+            ["raw", "dataset"],
+            files=[database.SCHEMA_PATH],
+            outputs=[database.DB_PATH],
+        ),
+        Stage(
+            "price_model",
+            lambda df: model_registry.get_price_model(df).result,
+            ["dataset"],
+            outputs=[model_registry.PRICE_MODEL_PATH],
+            code=[features, model_registry],
+        ),
+        Stage(
+            "price_coeffs_csv",
+            write_price_coefficients,
+            ["price_model"],
+            outputs=[PROCESSED_DIR / "price_sensitivity_coeffs.csv"],
+        ),
+        Stage(
+            "elasticities",
+            elasticity.write_elasticities,
+            ["dataset"],
+            outputs=[elasticity.ELASTICITIES_PATH],
+            code=[simulator],
+        ),
+        Stage(
+            "surfaces",
+            surfaces.write_surfaces,
+            ["dataset", "elasticities"],
+            outputs=[surfaces.SURFACE_INDEX],
+            code=[elasticity, simulator, surfaces],
+        ),
+        Stage(
+            "figures",
+            lambda df: figures.save_figures(df, FIGURES_DIR),
+            ["dataset"],
+            outputs=[path for name in figures.FIGURES for path in figures.figure_paths(FIGURES_DIR, name)],
+            code=[figures],
+        ),
+        Stage(
+            "memos",
+            write_memo_files,
+            ["dataset"],
+            outputs=[MEMOS_DIR / "league_memo.md"],
+            result_outputs=True,
+            code=[memos, screening, simulator, benchmarking],
+        ),
+    ]
+
+
+def run(
+    use_cache: bool = True, games: bool = False, profile: bool = False, cprofile: bool = False
+) -> List[StageReport]:
+    """Run the stage graph, reusing cached stages whose inputs are unchanged.
+
+    ``profile`` (or ``PIPELINE_PROFILE=1``) appends per-stage timings and
+    memory to ``outputs/pipeline_profile.jsonl``; ``cprofile`` (or
+    ``PIPELINE_PROFILE=cprofile``) also dumps ``outputs/profiles/<stage>.prof``.
+    """
+    ensure_dirs([PROCESSED_DIR, FIGURES_DIR, MEMOS_DIR])
+    profiler = profiler_from_env(
+        OUTPUTS_DIR / "pipeline_profile.jsonl", OUTPUTS_DIR / "profiles", enabled=profile, cprofile=cprofile
+    )
+    with profiler if profiler is not None else nullcontext():
+        _, report = run_stages(pipeline_stages(games), CACHE_DIR / "stages", use_cache=use_cache, profiler=profiler)
+    write_report(report, OUTPUTS_DIR / "pipeline_report.json")
+    ran = [r.name for r in report if r.status == "ran"]
+    logger.info("Stages run: %s; cache hits: %d", ", ".join(ran) or "none", len(report) - len(ran))
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run end-to-end pipeline: process data, save figures, write memos."""
+    parser = argparse.ArgumentParser(description="Build club metrics, figures and memos.")
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every stage.")
+    parser.add_argument(
+        "--games", action="store_true", help="Aggregate attendance from data/raw/attendance_by_game.csv."
+    )
+    parser.add_argument("--profile", action="store_true", help="Record per-stage time and memory as JSON lines.")
+    parser.add_argument("--cprofile", action="store_true", help="Also dump a cProfile file per stage.")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    run(use_cache=not args.no_cache, games=args.games, profile=args.profile, cprofile=args.cprofile)
     logger.info("Pipeline completed: processed data, figures, memos")
 
 
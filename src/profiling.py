@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = "PIPELINE_PROFILE"
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Process high-water resident set size, or None where ``resource`` is unavailable."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _cpu_seconds() -> float:
+    # Includes reaped worker processes, e.g. the figure and memo pools.
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def shape_of(value: Any) -> Tuple[Optional[int], Optional[int]]:
+    if isinstance(value, pd.DataFrame):
+        return value.shape
+    if isinstance(value, pd.Series):
+        return len(value), 1
+    if isinstance(value, dict) and value and all(isinstance(v, pd.DataFrame) for v in value.values()):
+        return sum(len(v) for v in value.values()), None
+    return None, None
+
+
+class StageProfiler:
+    """Record wall/CPU time, memory and output shape per pipeline stage.
+
+    Each ``measure`` block appends one JSON line to ``path``. tracemalloc
+    runs from construction until ``close`` (or the end of a ``with`` block),
+    so the Python allocation delta and peak cover only profiled runs. With ``cprofile_dir`` set, every stage also dumps
+    ``<stage>.prof`` for ``pstats`` or snakeviz.
+    """
+
+    def __init__(self, path: Path, cprofile_dir: Optional[Path] = None) -> None:
+        self.path = path
+        self.cprofile_dir = cprofile_dir
+        self.run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if cprofile_dir is not None:
+            cprofile_dir.mkdir(parents=True, exist_ok=True)
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    def close(self) -> None:
+        """Stop tracemalloc if this profiler started it."""
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+
+    def __enter__(self) -> StageProfiler:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[Dict[str, Any]]:
+        """Profile the enclosed block; the caller may add fields (status, result) to the yielded record."""
+        record: Dict[str, Any] = {"run_id": self.run_id, "stage": name}
+        profiler = cProfile.Profile() if self.cprofile_dir is not None else None
+        traced_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), _cpu_seconds()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            traced_after, traced_peak = tracemalloc.get_traced_memory()
+            rows, columns = shape_of(record.pop("result", None))
+            record.update({
+                "wall_seconds": round(time.perf_counter() - wall, 4),
+                "cpu_seconds": round(_cpu_seconds() - cpu, 4),
+                "peak_rss_mb": peak_rss_mb(),
+                "tracemalloc_delta_mb": round((traced_after - traced_before) / 1e6, 3),
+                "tracemalloc_peak_mb": round((traced_peak - traced_before) / 1e6, 3),
+                "rows": rows,
+                "columns": columns,
+            })
+            if profiler is not None:
+                dump = self.cprofile_dir / f"{name}.prof"
+                profiler.dump_stats(dump)
+                record["cprofile"] = str(dump)
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(record) + "\n")
+            logger.info(
+                "Profile %s: %.3fs wall, %.3fs cpu, peak RSS %s MB, traced %+.1f MB",
+                name,
+                record["wall_seconds"],
+                record["cpu_seconds"],
+                record["peak_rss_mb"],
+                record["tracemalloc_delta_mb"],
+            )
+
+
+def profiler_from_env(path: Path, cprofile_dir: Path, enabled: bool = False, cprofile: bool = False) -> Optional[StageProfiler]:
+    """Build a profiler when requested by flag or ``PIPELINE_PROFILE`` (``1`` or ``cprofile``)."""
+    env = os.getenv(PROFILE_ENV, "0").lower()
+    cprofile = cprofile or env == "cprofile"
+    if not (enabled or cprofile or env in ("1", "true")):
+        return None
+    return StageProfiler(path, cprofile_dir if cprofile else None)
+
+
+def load_profile(path: Path, run_id: Optional[str] = None) -> pd.DataFrame:
+    """Read profile lines back, by default for the latest run only."""
+    frame = pd.read_json(path, lines=True, dtype={"run_id": str})
+    run_id = run_id or frame["run_id"].iloc[-1]
+    return frame[frame["run_id"] == run_id].reset_index(drop=True)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+OPERATORS: Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+}
+
+
+@dataclass(frozen=True)
+class Rule:
+    column: str
+    op: str
+
+
+@dataclass
+class Screen:
+    """A named opportunity screen: every rule must hold for a club-season to qualify.
+
+    ``rules`` maps each threshold name to the column and comparison it
+    applies; ``thresholds`` holds the default value of each.
+    """
+
+    label: str
+    rules: Dict[str, Rule]
+    thresholds: Dict[str, float]
+    sort_by: str = "attendance_pct"
+    ascending: bool = False
+
+
+SCREENS: Dict[str, Screen] = {
+    "under_monetized": Screen(
+        "Under-monetized",
+        {"min_attendance_pct": Rule("attendance_pct", ">"), "max_ticket_price": Rule("ticket_price_proxy", "<")},
+        {"min_attendance_pct": 0.80, "max_ticket_price": 34.0},
+    ),
+    "demand_constrained": Screen(
+        "Demand-constrained",
+        {"max_attendance_pct": Rule("attendance_pct", "<"), "max_ticket_price": Rule("ticket_price_proxy", "<")},
+        {"max_attendance_pct": 0.65, "max_ticket_price": 32.0},
+        ascending=True,
+    ),
+    # Clubs whose memo recommends targeted price lifts.
+    "price_lift": Screen(
+        "Price-lift candidates",
+        {"min_attendance_pct": Rule("attendance_pct", ">="), "max_ticket_price": Rule("ticket_price_proxy", "<")},
+        {"min_attendance_pct": 0.82, "max_ticket_price": 35.0},
+    ),
+}
+
+
+def resolve_thresholds(name: str, overrides: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+    """Default thresholds of screen ``name`` updated with ``overrides``."""
+    screen = SCREENS[name]
+    overrides = dict(overrides or {})
+    unknown = sorted(set(overrides) - set(screen.rules))
+    if unknown:
+        raise ValueError(f"Unknown thresholds for {name}: {unknown}")
+    return {**screen.thresholds, **{key: float(value) for key, value in overrides.items()}}
+
+
+def screen_masks(
+    df: pd.DataFrame,
+    names: Optional[Iterable[str]] = None,
+    thresholds: Optional[Mapping[str, Mapping[str, float]]] = None,
+) -> pd.DataFrame:
+    """Membership of every row in every screen, as one boolean column per screen.
+
+    Each rule column is converted to NumPy once and shared across screens;
+    rows with a missing value fail the rule, as in SQL.
+    """
+    names = list(SCREENS) if names is None else list(names)
+    thresholds = thresholds or {}
+    values: Dict[str, np.ndarray] = {}
+    masks = {}
+    for name in names:
+        mask = np.ones(len(df), dtype=bool)
+        for param, value in resolve_thresholds(name, thresholds.get(name)).items():
+            rule = SCREENS[name].rules[param]
+            if rule.column not in values:
+                values[rule.column] = df[rule.column].to_numpy(dtype=float)
+            mask &= OPERATORS[rule.op](values[rule.column], value)
+        masks[name] = mask
+    return pd.DataFrame(masks, index=df.index)
+
+
+def screen(
+    df: pd.DataFrame,
+    name: str,
+    season: Optional[int] = None,
+    thresholds: Optional[Mapping[str, float]] = None,
+    sort: bool = True,
+) -> pd.DataFrame:
+    """Rows of ``df`` (optionally one season) that pass screen ``name``."""
+    rows = df if season is None else df[df["season"] == season]
+    members = rows[screen_masks(rows, [name], {name: thresholds or {}})[name].to_numpy()]
+    if sort:
+        spec = SCREENS[name]
+        members = members.sort_values(spec.sort_by, ascending=spec.ascending, kind="stable")
+    return members
+
+
+def sweep_membership(
+    df: pd.DataFrame, name: str, grid: Mapping[str, Sequence[float]], thresholds: Optional[Mapping[str, float]] = None
+) -> np.ndarray:
+    """Membership for every row and every threshold combination in ``grid``.
+
+    Returns a boolean array shaped ``(rows, len(grid[p1]), len(grid[p2]), ...)``
+    in ``grid`` order; thresholds not in ``grid`` come from ``thresholds`` or
+    the screen defaults. Each rule is compared against all of its levels at
+    once and the rules are combined by broadcasting.
+    """
+    spec = SCREENS[name]
+    fixed = resolve_thresholds(name, thresholds)
+    unknown = sorted(set(grid) - set(spec.rules))
+    if unknown:
+        raise ValueError(f"Unknown thresholds for {name}: {unknown}")
+    swept = list(grid)
+    shape = (len(df),) + tuple(len(grid[param]) for param in swept)
+    membership = np.ones(shape, dtype=bool)
+    for param, rule in spec.rules.items():
+        x = df[rule.column].to_numpy(dtype=float)
+        if param in grid:
+            axis = swept.index(param)
+            levels = np.asarray(grid[param], dtype=float).reshape([-1 if i == axis else 1 for i in range(len(swept))])
+            membership &= OPERATORS[rule.op](x.reshape((-1,) + (1,) * len(swept)), levels[None, ...])
+        else:
+            membership &= OPERATORS[rule.op](x, fixed[param]).reshape((-1,) + (1,) * len(swept))
+    return membership
+
+
+def threshold_sweep(
+    df: pd.DataFrame,
+    name: str,
+    grid: Mapping[str, Sequence[float]],
+    thresholds: Optional[Mapping[str, float]] = None,
+) -> pd.DataFrame:
+    """Member count per season for every threshold combination in ``grid``.
+
+    Every rule is a monotone threshold, so each row passes a contiguous run
+    of a swept rule's sorted levels: a prefix for ``>``/``>=`` and a suffix
+    for ``<``/``<=``, with the boundary found by ``np.searchsorted``. Counts
+    are a per-season histogram of those boundaries followed by cumulative
+    sums, O(rows + seasons x combinations) rather than a membership array
+    of rows x combinations.
+    """
+    spec = SCREENS[name]
+    fixed = resolve_thresholds(name, thresholds)
+    unknown = sorted(set(grid) - set(spec.rules))
+    if unknown:
+        raise ValueError(f"Unknown thresholds for {name}: {unknown}")
+    swept = list(grid)
+    levels = [np.asarray(grid[param], dtype=float) for param in swept]
+    seasons, codes = np.unique(df["season"].to_numpy(), return_inverse=True)
+
+    values = {param: df[rule.column].to_numpy(dtype=float) for param, rule in spec.rules.items()}
+    keep = np.ones(len(df), dtype=bool)
+    for param, rule in spec.rules.items():
+        keep &= ~np.isnan(values[param]) if param in grid else OPERATORS[rule.op](values[param], fixed[param])
+
+    shape = (len(seasons),) + tuple(len(level) + 1 for level in levels)
+    boundaries = [codes[keep]]
+    for param, level in zip(swept, levels):
+        side = "left" if spec.rules[param].op in (">", "<=") else "right"
+        boundaries.append(np.searchsorted(np.sort(level), values[param][keep], side=side))
+    counts = np.bincount(np.ravel_multi_index(boundaries, shape), minlength=int(np.prod(shape))).reshape(shape)
+
+    for axis, (param, level) in enumerate(zip(swept, levels), start=1):
+        if spec.rules[param].op in (">", ">="):
+            counts = np.flip(np.cumsum(np.flip(counts, axis), axis), axis).take(np.arange(1, len(level) + 1), axis)
+        else:
+            counts = np.cumsum(counts, axis).take(np.arange(len(level)), axis)
+        # Back from sorted order to the order given in ``grid``.
+        counts = counts.take(np.argsort(np.argsort(level, kind="stable"), kind="stable"), axis)
+
+    mesh = np.meshgrid(*levels, indexing="ij")
+    n_combos = int(np.prod([len(level) for level in levels]))
+    return pd.DataFrame({
+        "season": np.repeat(seasons, n_combos),
+        **{param: np.tile(level.ravel(), len(seasons)) for param, level in zip(swept, mesh)},
+        "members": counts.reshape(len(seasons), n_combos).ravel(),
+    })
+
+
+def screen_summary(df: pd.DataFrame, thresholds: Optional[Mapping[str, Mapping[str, float]]] = None) -> pd.DataFrame:
+    """Members per season for every screen, from one ``screen_masks`` call."""
+    masks = screen_masks(df, thresholds=thresholds)
+    summary = masks.groupby(df["season"].to_numpy()).sum()
+    summary.index.name = "season"
+    return summary.rename(columns={name: SCREENS[name].label for name in summary.columns})
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from http import HTTPStatus
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from src.compaction import compact_club_metrics, with_aliases
+from src.datastore import build_store
+from src.simulator import (
+    MARKET_ADJUST,
+    RESULT_FIELDS,
+    SCENARIO_COLUMNS,
+    recommend_scenarios,
+    simulate_pairs,
+)
+from src.utils import setup_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 100_000
+# Upper bound on scenarios in one /simulate request.
+MAX_BATCH = 10_000
+RANKING_COLUMNS = ["season", "team_id", "team_name", "market_tier", "cpi", "cpi_rank", "cpi_tier"]
+LEVERS = SCENARIO_COLUMNS[:3]
+
+Message = Tuple[str, Dict[str, str], bytes]
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+def _records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    # to_json handles NumPy scalars, categoricals and NaN (as null).
+    return json.loads(frame.to_json(orient="records"))
+
+
+class ScenarioService:
+    """Club metrics, CPI rankings and scenario simulation over an in-memory dataset.
+
+    ``handle`` maps one request to ``(status, payload)`` and does no I/O, so
+    it can be tested or embedded without a socket; ``serve`` puts it behind
+    an asyncio HTTP/1.1 server with keep-alive. Simulation results are
+    cached per (club, season, levers) in an LRU, and each request's cache
+    misses are simulated together with ``simulate_pairs``.
+    """
+
+    def __init__(self, df: pd.DataFrame, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self.store = build_store(df)
+        self.cache = LRUCache(cache_size)
+        frame = self.store.frame
+        self._rows = {
+            (str(team_id), int(season)): position
+            for position, (team_id, season) in enumerate(zip(frame["team_id"], frame["season"]))
+        }
+        simulated = ["team_id", "home_attendance", "ticket_price_proxy", "price_elasticity", "marketing_elasticity", "win_elasticity"]
+        self._simulation_inputs = frame[[c for c in simulated if c in frame.columns]]
+        self._club_records: Dict[int, Dict[str, Any]] = {}
+        self._rankings: Dict[int, List[Dict[str, Any]]] = {}
+        self._recommendations: Dict[int, Dict[str, Dict[str, Any]]] = {}
+
+    @classmethod
+    def from_processed(cls, cache_size: int = DEFAULT_CACHE_SIZE) -> "ScenarioService":
+        from src.storage import read_club_metrics
+
+        return cls(with_aliases(compact_club_metrics(read_club_metrics())), cache_size)
+
+    def _season(self, value: Any) -> int:
+        if value is None:
+            return self.store.latest_season
+        season = int(value)
+        if season not in self.store.season_positions:
+            raise LookupError(f"Unknown season: {season}")
+        return season
+
+    def _position(self, team_id: Any, season: int) -> int:
+        position = self._rows.get((str(team_id), season))
+        if position is None:
+            raise LookupError(f"Unknown club {team_id} in {season}")
+        return position
+
+    def health(self) -> Dict[str, Any]:
+        return {"status": "ok", "rows": len(self.store.frame), "latest_season": self.store.latest_season, "cache": self.cache.stats()}
+
+    def clubs(self, season: Any = None) -> Dict[str, Any]:
+        season = self._season(season)
+        frame = self.store.season(season)[["team_id", "team_name", "market_tier"]]
+        return {"season": season, "clubs": _records(frame)}
+
+    def club(self, team_id: str, season: Any = None, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        position = self._position(team_id, self._season(season))
+        if position not in self._club_records:
+            self._club_records[position] = _records(self.store.frame.iloc[[position]])[0]
+        record = self._club_records[position]
+        if columns:
+            unknown = [c for c in columns if c not in record]
+            if unknown:
+                raise ValueError(f"Unknown club_metrics columns: {unknown}")
+            record = {c: record[c] for c in columns}
+        return record
+
+    def rankings(self, season: Any = None, n: Any = None) -> Dict[str, Any]:
+        season = self._season(season)
+        if season not in self._rankings:
+            frame = self.store.season(season)
+            self._rankings[season] = _records(frame.sort_values("cpi_rank")[RANKING_COLUMNS])
+        ranked = self._rankings[season]
+        return {"season": season, "rankings": ranked if n is None else ranked[: int(n)]}
+
+    def simulate(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Simulate a batch of scenarios; each may name its own club and season.
+
+        ``body`` is ``{"scenarios": [...], "team_id": ..., "season": ...}``;
+        top-level ``team_id``/``season`` are defaults for the scenarios.
+        """
+        scenarios = body.get("scenarios")
+        if not isinstance(scenarios, list) or not scenarios:
+            raise ValueError("Request body needs a non-empty 'scenarios' list")
+        if len(scenarios) > MAX_BATCH:
+            raise ValueError(f"At most {MAX_BATCH} scenarios per request")
+
+        keys = []
+        results: List[Optional[Dict[str, float]]] = [None] * len(scenarios)
+        misses: List[Tuple[int, int]] = []
+        for i, scenario in enumerate(scenarios):
+            team_id = str(scenario.get("team_id", body.get("team_id")))
+            season = self._season(scenario.get("season", body.get("season")))
+            position = self._position(team_id, season)
+            condition = scenario.get("market_condition", "Neutral")
+            if condition not in MARKET_ADJUST:
+                raise ValueError(f"Unknown market_condition: {condition}")
+            key = (team_id, season, *(float(scenario.get(lever, 0.0)) for lever in LEVERS), condition)
+            keys.append(key)
+            results[i] = self.cache.get(key)
+            if results[i] is None:
+                misses.append((i, position))
+
+        if misses:
+            indexes, positions = zip(*misses)
+            clubs = self._simulation_inputs.iloc[list(positions)]
+            simulated = simulate_pairs(clubs, pd.DataFrame([keys[i][2:] for i in indexes], columns=SCENARIO_COLUMNS))
+            columns = [simulated[field].tolist() for field in RESULT_FIELDS]
+            for j, i in enumerate(indexes):
+                results[i] = {field: values[j] for field, values in zip(RESULT_FIELDS, columns)}
+                self.cache.put(keys[i], results[i])
+
+        return {
+            "results": [
+                {"team_id": key[0], "season": key[1], **dict(zip(SCENARIO_COLUMNS, key[2:])), **result}
+                for key, result in zip(keys, results)
+            ]
+        }
+
+    def recommend(self, team_ids: Sequence[str], season: Any = None) -> Dict[str, Any]:
+        """Best risk-adjusted default-grid scenario per club, computed once per season."""
+        season = self._season(season)
+        if season not in self._recommendations:
+            clubs = self.store.season(season)
+            frame = recommend_scenarios(clubs)
+            frame.insert(0, "team_id", clubs["team_id"].astype(str))
+            frame.insert(1, "season", season)
+            self._recommendations[season] = {record["team_id"]: record for record in _records(frame)}
+        team_ids = [str(team_id) for team_id in team_ids if team_id is not None]
+        if not team_ids:
+            raise ValueError("Request needs 'team_id' or 'team_ids'")
+        for team_id in team_ids:
+            self._position(team_id, season)
+        records = self._recommendations[season]
+        return {"season": season, "recommendations": [records[team_id] for team_id in team_ids]}
+
+    def handle(self, method: str, target: str, body: bytes = b"") -> Tuple[int, Dict[str, Any]]:
+        """Route one request to ``(HTTP status, JSON payload)``."""
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+        try:
+            payload = json.loads(body) if body else {}
+            route = (method, parts[0] if parts else "", len(parts))
+            if route == ("GET", "health", 1):
+                return HTTPStatus.OK, self.health()
+            if route == ("GET", "clubs", 1):
+                return HTTPStatus.OK, self.clubs(query.get("season"))
+            if route == ("GET", "clubs", 2):
+                columns = query["columns"].split(",") if query.get("columns") else None
+                return HTTPStatus.OK, self.club(parts[1], query.get("season"), columns)
+            if route == ("GET", "rankings", 1):
+                return HTTPStatus.OK, self.rankings(query.get("season"), query.get("n"))
+            if route == ("POST", "simulate", 1):
+                return HTTPStatus.OK, self.simulate(payload)
+            if route == ("GET", "recommend", 1) and "team_id" in query:
+                return HTTPStatus.OK, self.recommend(query["team_id"].split(","), query.get("season"))
+            if route == ("POST", "recommend", 1):
+                team_ids = payload.get("team_ids") or [payload.get("team_id")]
+                return HTTPStatus.OK, self.recommend(team_ids, payload.get("season"))
+            return HTTPStatus.NOT_FOUND, {"error": f"No route for {method} {url.path}"}
+        except LookupError as exc:
+            return HTTPStatus.NOT_FOUND, {"error": str(exc).strip("'\"")}
+        except (ValueError, TypeError, AttributeError) as exc:
+            return HTTPStatus.BAD_REQUEST, {"error": str(exc)}
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                start, headers, body = message
+                try:
+                    method, target, _ = start.split(" ", 2)
+                    status, payload = self.handle(method.upper(), target, body)
+                except ValueError:
+                    status, payload = HTTPStatus.BAD_REQUEST, {"error": "Malformed request line"}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.Server:
+        return await asyncio.start_server(self._connection, host, port)
+
+
+async def read_message(reader: asyncio.StreamReader) -> Optional[Message]:
+    """Read one HTTP/1.1 request or response: start line, lower-cased headers, body."""
+    start = await reader.readline()
+    if not start:
+        return None
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(length) if length else b""
+    return start.decode("latin-1").strip(), headers, body
+
+
+def encode_response(status: int, payload: Dict[str, Any], keep_alive: bool = True) -> bytes:
+    body = json.dumps(payload).encode("utf-8")
+    status = HTTPStatus(status)
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    method: str,
+    target: str,
+    payload: Optional[Dict[str, Any]] = None,
+) -> Tuple[int, Dict[str, Any]]:
+    """Send one request on an open keep-alive connection and read the JSON reply."""
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    head = f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+    message = await read_message(reader)
+    if message is None:
+        raise ConnectionError("Server closed the connection")
+    start, _, response = message
+    return int(start.split(" ", 2)[1]), json.loads(response)
+
+
+async def serve(service: ScenarioService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    server = await service.start(host, port)
+    logger.info("Serving %d club-seasons on http://%s:%d", len(service.store.frame), host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve club metrics, CPI rankings and scenario simulations as JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="Simulation results kept in the LRU.")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    service = ScenarioService.from_processed(args.cache_size)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,34 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Dict, Mapping, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+PRICE_ELASTICITY = -0.35
+MARKETING_ELASTICITY = 0.18
+WIN_ELASTICITY = 0.25
+MARKET_ADJUST: Dict[str, float] = {"Strong": 1.1, "Neutral": 1.0, "Soft": 0.9}
+ATTENDANCE_CHANGE_BOUNDS = (-0.25, 0.30)
+SCENARIO_COLUMNS = ["price_change_pct", "marketing_lift_pct", "win_change_pct", "market_condition"]
+
+RESULT_FIELDS = [
+    "projected_attendance",
+    "projected_revenue",
+    "attendance_change_pct",
+    "revenue_change_pct",
+    "confidence_low",
+    "confidence_high",
+]
+DEFAULT_GRID: Dict[str, Sequence[float]] = {
+    "price_change_pct": [0.0, 0.03, 0.05, 0.07],
+    "marketing_lift_pct": [0.0, 0.05, 0.10],
+    "win_change_pct": [0.0, 0.02, 0.04],
+}
+
+ScenarioInput = Union[pd.DataFrame, np.ndarray, Sequence[Sequence], Mapping[str, Sequence]]
+
 
 @dataclass
 class SimulationResult:
@@ -17,6 +40,38 @@ class SimulationResult:
     confidence_high: float
 
 
+@dataclass
+class BatchSimulationResult:
+    """Struct-of-arrays simulation output shaped ``(n_clubs, n_scenarios)``."""
+
+    team_ids: np.ndarray
+    scenarios: pd.DataFrame
+    projected_attendance: np.ndarray
+    projected_revenue: np.ndarray
+    attendance_change_pct: np.ndarray
+    revenue_change_pct: np.ndarray
+    confidence_low: np.ndarray
+    confidence_high: np.ndarray
+
+    def to_frame(self) -> pd.DataFrame:
+        """Flatten to one row per club-scenario pair (club-major order)."""
+        n_clubs, n_scenarios = self.projected_revenue.shape
+        frame = pd.DataFrame({
+            "team_id": np.repeat(self.team_ids, n_scenarios),
+            "scenario_id": np.tile(np.arange(n_scenarios), n_clubs),
+        })
+        for col in SCENARIO_COLUMNS:
+            frame[col] = np.tile(self.scenarios[col].to_numpy(), n_clubs)
+        for col in RESULT_FIELDS:
+            frame[col] = getattr(self, col).ravel()
+        return frame
+
+
+def _row_value(row: pd.Series, column: str, default: float) -> float:
+    value = row.get(column)
+    return default if value is None or pd.isna(value) else float(value)
+
+
 def simulate_scenario(
     row: pd.Series,
     price_change_pct: float,
@@ -27,11 +82,11 @@ def simulate_scenario(
     base_attendance = row["home_attendance"]
     base_price = row["ticket_price_proxy"]
 
-    price_elasticity = -0.35
-    marketing_elasticity = 0.18
-    win_elasticity = 0.25
+    price_elasticity = _row_value(row, "price_elasticity", PRICE_ELASTICITY)
+    marketing_elasticity = _row_value(row, "marketing_elasticity", MARKETING_ELASTICITY)
+    win_elasticity = _row_value(row, "win_elasticity", WIN_ELASTICITY)
 
-    market_adjust = {"Strong": 1.1, "Neutral": 1.0, "Soft": 0.9}.get(market_condition, 1.0)
+    market_adjust = MARKET_ADJUST.get(market_condition, 1.0)
 
     attendance_change_pct = (
         price_elasticity * price_change_pct
@@ -39,7 +94,7 @@ def simulate_scenario(
         + win_elasticity * win_change_pct
     ) * market_adjust
 
-    attendance_change_pct = float(np.clip(attendance_change_pct, -0.25, 0.30))
+    attendance_change_pct = float(np.clip(attendance_change_pct, *ATTENDANCE_CHANGE_BOUNDS))
     projected_attendance = base_attendance * (1 + attendance_change_pct)
     projected_price = base_price * (1 + price_change_pct)
 
@@ -61,14 +116,189 @@ def simulate_scenario(
     )
 
 
-def recommend_scenario(row: pd.Series) -> Tuple[Dict[str, float], SimulationResult]:
-    scenarios = []
-    for price in [0.0, 0.03, 0.05, 0.07]:
-        for marketing in [0.0, 0.05, 0.10]:
-            for win in [0.0, 0.02, 0.04]:
-                result = simulate_scenario(row, price, marketing, win, "Neutral")
-                risk_adjusted = result.projected_revenue / (1 + 0.5 * abs(price))
-                scenarios.append((risk_adjusted, price, marketing, win, result))
-    best = max(scenarios, key=lambda x: x[0])
-    params = {"price_change_pct": best[1], "marketing_lift_pct": best[2], "win_change_pct": best[3]}
-    return params, best[4]
+def scenario_frame(scenarios: ScenarioInput) -> pd.DataFrame:
+    """Coerce scenarios to a frame with the four ``SCENARIO_COLUMNS``."""
+    if isinstance(scenarios, pd.DataFrame):
+        frame = scenarios.copy()
+    elif isinstance(scenarios, Mapping):
+        frame = pd.DataFrame(dict(scenarios))
+    else:
+        frame = pd.DataFrame(list(scenarios))
+        frame.columns = SCENARIO_COLUMNS[: frame.shape[1]]
+    if "market_condition" not in frame.columns:
+        frame["market_condition"] = "Neutral"
+    missing = [c for c in SCENARIO_COLUMNS if c not in frame.columns]
+    if missing:
+        raise ValueError(f"Scenarios missing columns: {missing}")
+    return frame[SCENARIO_COLUMNS].reset_index(drop=True)
+
+
+def club_elasticities(clubs: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-club elasticity columns, falling back to the league defaults."""
+    out = []
+    for col, default in (
+        ("price_elasticity", PRICE_ELASTICITY),
+        ("marketing_elasticity", MARKETING_ELASTICITY),
+        ("win_elasticity", WIN_ELASTICITY),
+    ):
+        if col in clubs.columns:
+            out.append(clubs[col].fillna(default).to_numpy(dtype=float)[:, None])
+        else:
+            out.append(np.full((len(clubs), 1), default))
+    return out[0], out[1], out[2]
+
+
+def _simulate_arrays(
+    base_attendance: np.ndarray,
+    base_price: np.ndarray,
+    elasticities: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    price: np.ndarray,
+    marketing: np.ndarray,
+    win: np.ndarray,
+    market_adjust: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """``RESULT_FIELDS`` for broadcastable club and scenario arrays."""
+    price_elasticity, marketing_elasticity, win_elasticity = elasticities
+    attendance_change_pct = (
+        price_elasticity * price + marketing_elasticity * marketing + win_elasticity * win
+    ) * market_adjust
+    attendance_change_pct = np.clip(attendance_change_pct, *ATTENDANCE_CHANGE_BOUNDS)
+
+    projected_attendance = base_attendance * (1 + attendance_change_pct)
+    projected_revenue = projected_attendance * (base_price * (1 + price))
+    base_revenue = base_attendance * base_price
+    revenue_change_pct = (projected_revenue - base_revenue) / base_revenue
+
+    confidence_band = 0.08 + 0.1 * np.abs(price)
+    return {
+        "projected_attendance": projected_attendance,
+        "projected_revenue": projected_revenue,
+        "attendance_change_pct": attendance_change_pct,
+        "revenue_change_pct": revenue_change_pct,
+        "confidence_low": projected_revenue * (1 - confidence_band),
+        "confidence_high": projected_revenue * (1 + confidence_band),
+    }
+
+
+def _scenario_arrays(scenarios: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    return (
+        scenarios["price_change_pct"].to_numpy(dtype=float),
+        scenarios["marketing_lift_pct"].to_numpy(dtype=float),
+        scenarios["win_change_pct"].to_numpy(dtype=float),
+        scenarios["market_condition"].map(MARKET_ADJUST).fillna(1.0).to_numpy(dtype=float),
+    )
+
+
+def simulate_batch(
+    clubs: pd.DataFrame,
+    scenarios: ScenarioInput,
+) -> BatchSimulationResult:
+    """Simulate every club against every scenario with NumPy broadcasting.
+
+    Uses the same elasticities, clipping and confidence band as
+    ``simulate_scenario``. Clubs may carry ``price_elasticity``,
+    ``marketing_elasticity`` or ``win_elasticity`` columns to override the
+    league defaults per club.
+    """
+    scenarios = scenario_frame(scenarios)
+    results = _simulate_arrays(
+        clubs["home_attendance"].to_numpy(dtype=float)[:, None],
+        clubs["ticket_price_proxy"].to_numpy(dtype=float)[:, None],
+        club_elasticities(clubs),
+        *(values[None, :] for values in _scenario_arrays(scenarios)),
+    )
+    team_ids = clubs["team_id"].to_numpy() if "team_id" in clubs.columns else clubs.index.to_numpy()
+    return BatchSimulationResult(team_ids=team_ids, scenarios=scenarios, **results)
+
+
+def simulate_pairs(clubs: pd.DataFrame, scenarios: ScenarioInput) -> Dict[str, np.ndarray]:
+    """Simulate row ``i`` of ``clubs`` against row ``i`` of ``scenarios``.
+
+    The element-wise counterpart of ``simulate_batch`` for mixed requests
+    where each scenario names its own club; returns ``RESULT_FIELDS`` arrays.
+    """
+    scenarios = scenario_frame(scenarios)
+    if len(clubs) != len(scenarios):
+        raise ValueError(f"Got {len(clubs)} clubs for {len(scenarios)} scenarios")
+    elasticities = tuple(values[:, 0] for values in club_elasticities(clubs))
+    return _simulate_arrays(
+        clubs["home_attendance"].to_numpy(dtype=float),
+        clubs["ticket_price_proxy"].to_numpy(dtype=float),
+        elasticities,
+        *_scenario_arrays(scenarios),
+    )
+
+
+def scenario_grid(
+    grid: Mapping[str, Sequence[float]] | None = None, market_condition: str = "Neutral"
+) -> pd.DataFrame:
+    """Expand a lever grid into a scenario frame in price-major order."""
+    grid = grid or DEFAULT_GRID
+    price, marketing, win = np.meshgrid(
+        np.asarray(grid["price_change_pct"], dtype=float),
+        np.asarray(grid["marketing_lift_pct"], dtype=float),
+        np.asarray(grid["win_change_pct"], dtype=float),
+        indexing="ij",
+    )
+    return pd.DataFrame({
+        "price_change_pct": price.ravel(),
+        "marketing_lift_pct": marketing.ravel(),
+        "win_change_pct": win.ravel(),
+        "market_condition": market_condition,
+    })
+
+
+def stepped_grid(step: float = 0.01) -> Dict[str, np.ndarray]:
+    """Grid spanning the default lever ranges at a uniform step size."""
+    return {
+        lever: np.round(np.arange(min(values), max(values) + step / 2, step), 6)
+        for lever, values in DEFAULT_GRID.items()
+    }
+
+
+def risk_adjusted_revenue(projected_revenue: np.ndarray, price_change_pct: np.ndarray) -> np.ndarray:
+    """Penalize projected revenue for the size of the price move."""
+    return projected_revenue / (1 + 0.5 * np.abs(price_change_pct))
+
+
+def recommend_scenarios(
+    clubs: pd.DataFrame,
+    grid: Mapping[str, Sequence[float]] | None = None,
+    chunk_size: int = 2_000,
+) -> pd.DataFrame:
+    """Pick the best risk-adjusted grid scenario for every club in one pass.
+
+    Returns a frame aligned to ``clubs.index`` with the winning levers and
+    its simulation outputs. Clubs are processed in chunks of ``chunk_size``
+    rows so dense grids stay within bounded memory.
+    """
+    scenarios = scenario_grid(grid)
+    levers = scenarios[SCENARIO_COLUMNS[:3]].to_numpy()
+    frames = []
+    for start in range(0, len(clubs), chunk_size):
+        chunk = clubs.iloc[start : start + chunk_size]
+        batch = simulate_batch(chunk, scenarios)
+        score = risk_adjusted_revenue(batch.projected_revenue, levers[:, 0][None, :])
+        best = np.argmax(score, axis=1)
+        rows = np.arange(len(chunk))
+        frame = pd.DataFrame(levers[best], columns=SCENARIO_COLUMNS[:3], index=chunk.index)
+        frame["risk_adjusted_revenue"] = score[rows, best]
+        for field in RESULT_FIELDS:
+            frame[field] = getattr(batch, field)[rows, best]
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=SCENARIO_COLUMNS[:3] + ["risk_adjusted_revenue"] + RESULT_FIELDS)
+    return pd.concat(frames)
+
+
+def recommendation_from_frame(best: pd.Series) -> Tuple[Dict[str, float], SimulationResult]:
+    """Split a ``recommend_scenarios`` row into levers and a ``SimulationResult``."""
+    params = {lever: float(best[lever]) for lever in SCENARIO_COLUMNS[:3]}
+    return params, SimulationResult(**{field: float(best[field]) for field in RESULT_FIELDS})
+
+
+def recommend_scenario(
+    row: pd.Series, grid: Mapping[str, Sequence[float]] | None = None
+) -> Tuple[Dict[str, float], SimulationResult]:
+    best = recommend_scenarios(row.to_frame().T, grid).iloc[0]
+    return recommendation_from_frame(best)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import logging
+import pickle
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    from src.profiling import StageProfiler
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    """One node in the pipeline graph.
+
+    ``inputs`` name upstream stages whose results are passed positionally to
+    ``func``. ``files``, ``params`` and the source of ``func``'s module plus
+    any extra ``code`` modules feed the cache key. Stages with side effects
+    list the ``outputs`` that must exist for a cache hit to count; stages
+    whose outputs depend on the data instead return their paths and set
+    ``result_outputs``.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: Sequence[str] = ()
+    files: Sequence[Path] = ()
+    outputs: Sequence[Path] = ()
+    code: Sequence[ModuleType] = ()
+    params: Mapping[str, Any] = field(default_factory=dict)
+    cache: bool = True
+    result_outputs: bool = False
+
+
+@dataclass
+class StageReport:
+    name: str
+    status: str
+    key: str
+    seconds: float
+
+
+def hash_value(value: Any) -> str:
+    """Stable content hash for frames, containers and picklable objects."""
+    digest = hashlib.sha256()
+    if isinstance(value, pd.DataFrame):
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        digest.update(repr(list(value.columns)).encode())
+        digest.update(repr([str(t) for t in value.dtypes]).encode())
+    elif isinstance(value, pd.Series):
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        digest.update(repr((value.name, str(value.dtype))).encode())
+    elif isinstance(value, Mapping):
+        for key in sorted(value, key=str):
+            digest.update(str(key).encode())
+            digest.update(hash_value(value[key]).encode())
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            digest.update(hash_value(item).encode())
+    else:
+        digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    return digest.hexdigest()
+
+
+def hash_file(path: Path) -> str:
+    if not path.exists():
+        return "missing"
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def code_version(stage: Stage) -> str:
+    """Hash the source of the stage function's module and extra ``code`` modules."""
+    digest = hashlib.sha256()
+    modules = [inspect.getmodule(stage.func), *stage.code]
+    for module in modules:
+        if module is None:
+            continue
+        source = inspect.getsourcefile(module)
+        digest.update(Path(source).read_bytes() if source else module.__name__.encode())
+    return digest.hexdigest()
+
+
+def stage_key(stage: Stage, input_hashes: Sequence[str]) -> str:
+    digest = hashlib.sha256()
+    digest.update(stage.name.encode())
+    digest.update(code_version(stage).encode())
+    for value in input_hashes:
+        digest.update(value.encode())
+    for path in stage.files:
+        digest.update(hash_file(Path(path)).encode())
+    digest.update(hash_value(dict(stage.params)).encode())
+    return digest.hexdigest()
+
+
+def _cache_path(cache_dir: Path, stage: Stage, key: str) -> Path:
+    return cache_dir / f"{stage.name}-{key[:16]}.pkl"
+
+
+def run_stages(
+    stages: Sequence[Stage], cache_dir: Path, use_cache: bool = True, profiler: Optional[StageProfiler] = None
+) -> Tuple[Dict[str, Any], List[StageReport]]:
+    """Run stages in order, skipping any whose cache key is unchanged.
+
+    With a ``profiler`` every stage, cached or not, is measured and logged.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    results: Dict[str, Any] = {}
+    hashes: Dict[str, str] = {}
+    report: List[StageReport] = []
+
+    for stage in stages:
+        start = time.perf_counter()
+        key = stage_key(stage, [hashes[name] for name in stage.inputs])
+        path = _cache_path(cache_dir, stage, key)
+        outputs_exist = all(Path(p).exists() for p in stage.outputs)
+
+        with profiler.measure(stage.name) if profiler is not None else nullcontext({}) as record:
+            cached = None
+            if use_cache and stage.cache and path.exists() and outputs_exist:
+                with path.open("rb") as fh:
+                    cached = pickle.load(fh)
+                if stage.result_outputs and not all(Path(p).exists() for p in cached[1]):
+                    cached = None
+            if cached is not None:
+                hashes[stage.name], results[stage.name] = cached
+                status = "cached"
+            else:
+                results[stage.name] = stage.func(*[results[name] for name in stage.inputs])
+                # Downstream keys use the content hash of this output, so a stage
+                # whose rebuilt output is unchanged still lets later stages hit.
+                hashes[stage.name] = hash_value(results[stage.name])
+                status = "ran"
+                if stage.cache:
+                    for stale in cache_dir.glob(f"{stage.name}-*.pkl"):
+                        stale.unlink()
+                    with path.open("wb") as fh:
+                        pickle.dump((hashes[stage.name], results[stage.name]), fh, protocol=pickle.HIGHEST_PROTOCOL)
+            record.update(status=status, result=results[stage.name])
+
+        report.append(StageReport(stage.name, status, key[:16], round(time.perf_counter() - start, 4)))
+        logger.info("Stage %s: %s (%.3fs)", stage.name, status, report[-1].seconds)
+
+    return results, report
+
+
+def write_report(report: Sequence[StageReport], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps([asdict(r) for r in report], indent=2), encoding="utf-8")
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.compaction import compact_club_metrics
+from src.datastore import file_signature
+from src.utils import PROCESSED_DIR
+
+CLUB_METRICS_CSV = PROCESSED_DIR / "club_metrics.csv"
+CLUB_METRICS_PARQUET = PROCESSED_DIR / "club_metrics.parquet"
+
+
+def club_metrics_signature() -> Tuple[Tuple[str, int, int], ...]:
+    """``file_signature`` of the processed club metrics files."""
+    return file_signature([CLUB_METRICS_PARQUET, CLUB_METRICS_CSV])
+
+
+def to_columnar(df: pd.DataFrame) -> pd.DataFrame:
+    """Typed copy for the columnar artifact (see ``compact_club_metrics``)."""
+    return compact_club_metrics(df)
+
+
+def write_columnar(df: pd.DataFrame, path: Path = CLUB_METRICS_PARQUET) -> None:
+    to_columnar(df).to_parquet(path, index=False)
+
+
+def read_club_metrics(columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Load club metrics, preferring the memory-mapped Parquet artifact.
+
+    ``columns`` limits the read to the listed columns. Falls back to the CSV
+    when the Parquet file is missing or pyarrow is unavailable.
+    """
+    columns = list(columns) if columns is not None else None
+    if CLUB_METRICS_PARQUET.exists():
+        try:
+            return pd.read_parquet(CLUB_METRICS_PARQUET, columns=columns, memory_map=True)
+        except ImportError:
+            pass
+    return pd.read_csv(CLUB_METRICS_CSV, usecols=columns)
+
+
+def compare_formats(
+    csv_path: Path = CLUB_METRICS_CSV,
+    parquet_path: Path = CLUB_METRICS_PARQUET,
+    repeats: int = 5,
+) -> pd.DataFrame:
+    """Compare on-disk size, load time and in-memory size of both formats."""
+    loaders = {
+        "csv": lambda: pd.read_csv(csv_path),
+        "parquet": lambda: pd.read_parquet(parquet_path, memory_map=True),
+    }
+    rows = []
+    for name, loader in loaders.items():
+        path = csv_path if name == "csv" else parquet_path
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            frame = loader()
+            timings.append(time.perf_counter() - start)
+        rows.append({
+            "format": name,
+            "file_bytes": path.stat().st_size,
+            "load_seconds": min(timings),
+            "memory_bytes": int(frame.memory_usage(deep=True).sum()),
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print(compare_formats().to_string(index=False))
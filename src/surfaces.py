@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.elasticity import attach_elasticities, load_elasticities
+from src.simulator import (
+    MARKET_ADJUST,
+    RESULT_FIELDS,
+    SCENARIO_COLUMNS,
+    SimulationResult,
+    risk_adjusted_revenue,
+    scenario_grid,
+    simulate_batch,
+)
+from src.utils import PROCESSED_DIR, setup_logging
+
+logger = logging.getLogger(__name__)
+
+SURFACES_DIR = PROCESSED_DIR / "surfaces"
+SURFACE_INDEX = SURFACES_DIR / "index.json"
+LEVERS = SCENARIO_COLUMNS[:3]
+# One lattice point per whole percent over the Revenue Simulator slider
+# ranges, so slider lookups land exactly on the lattice.
+SURFACE_LEVERS: Dict[str, np.ndarray] = {
+    lever: np.round(np.arange(low, high + 0.005, 0.01), 2)
+    for lever, (low, high) in {
+        "price_change_pct": (-0.10, 0.15),
+        "marketing_lift_pct": (0.0, 0.20),
+        "win_change_pct": (-0.05, 0.10),
+    }.items()
+}
+SURFACE_CONDITIONS = list(MARKET_ADJUST)
+SURFACE_FIELDS = ["projected_attendance", "projected_revenue", "confidence_low", "confidence_high"]
+SURFACE_DTYPE = np.float32
+
+
+@dataclass
+class ResponseSurface:
+    """Simulator outputs on a lever lattice for every club in one season.
+
+    ``values`` is ``(clubs, conditions, price, marketing, win, fields)`` and
+    is usually a read-only memory map, so a lookup only pages in the
+    lattice cells it touches. Lever values between lattice points are
+    interpolated multilinearly; values outside the lattice are clamped to
+    its edge.
+    """
+
+    season: int
+    variant: str
+    team_ids: np.ndarray
+    base_attendance: np.ndarray
+    base_price: np.ndarray
+    levers: Dict[str, np.ndarray]
+    conditions: List[str]
+    values: np.ndarray
+
+    def __post_init__(self) -> None:
+        self._positions = {team_id: i for i, team_id in enumerate(self.team_ids)}
+
+    def covers(self, row: pd.Series) -> bool:
+        """Whether ``row``'s club is on the surface with the same baseline."""
+        i = self._positions.get(str(row["team_id"]))
+        return i is not None and bool(
+            np.isclose(self.base_attendance[i], float(row["home_attendance"]), rtol=1e-6)
+            and np.isclose(self.base_price[i], float(row["ticket_price_proxy"]), rtol=1e-6)
+        )
+
+    def lookup(
+        self,
+        team_ids: Sequence[str],
+        price_change_pct: np.ndarray,
+        marketing_lift_pct: np.ndarray,
+        win_change_pct: np.ndarray,
+        market_condition: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        """Interpolated ``RESULT_FIELDS`` for broadcastable arrays of clubs and levers."""
+        clubs = np.array([self._positions[str(t)] for t in np.ravel(team_ids)]).reshape(np.shape(team_ids))
+        condition_index = {name: i for i, name in enumerate(self.conditions)}
+        conditions = np.vectorize(condition_index.__getitem__, otypes=[np.intp])(np.asarray(market_condition))
+        axes = [_axis_position(self.levers[lever], values) for lever, values in zip(
+            LEVERS, (price_change_pct, marketing_lift_pct, win_change_pct)
+        )]
+        clubs, conditions, *_ = np.broadcast_arrays(clubs, conditions, *(lower for lower, _ in axes))
+        shape = clubs.shape
+        out = np.zeros(shape + (self.values.shape[-1],))
+        for corner in itertools.product((0, 1), repeat=len(axes)):
+            weight = np.ones(shape)
+            index = [clubs, conditions]
+            for bit, (lower, frac) in zip(corner, axes):
+                weight = weight * (frac if bit else 1 - frac)
+                index.append(np.broadcast_to(lower + bit, shape))
+            out += weight[..., None] * self.values[tuple(index)]
+
+        result = {field: out[..., i] for i, field in enumerate(SURFACE_FIELDS)}
+        base_attendance = self.base_attendance[clubs]
+        base_revenue = base_attendance * self.base_price[clubs]
+        result["attendance_change_pct"] = result["projected_attendance"] / base_attendance - 1
+        result["revenue_change_pct"] = result["projected_revenue"] / base_revenue - 1
+        return result
+
+    def simulate(
+        self,
+        team_id: str,
+        price_change_pct: float,
+        marketing_lift_pct: float,
+        win_change_pct: float,
+        market_condition: str = "Neutral",
+    ) -> SimulationResult:
+        """``simulate_scenario`` answered from the surface."""
+        result = self.lookup(
+            np.array([team_id]), price_change_pct, marketing_lift_pct, win_change_pct, market_condition
+        )
+        return SimulationResult(**{field: float(result[field][0]) for field in RESULT_FIELDS})
+
+    def recommend(self, grid: Mapping[str, Sequence[float]] | None = None) -> pd.DataFrame:
+        """``recommend_scenarios`` for every club on the surface, indexed by ``team_id``."""
+        scenarios = scenario_grid(grid)
+        levers = scenarios[LEVERS].to_numpy()
+        result = self.lookup(
+            self.team_ids[:, None],
+            levers[None, :, 0],
+            levers[None, :, 1],
+            levers[None, :, 2],
+            scenarios["market_condition"].to_numpy()[None, :],
+        )
+        score = risk_adjusted_revenue(result["projected_revenue"], levers[None, :, 0])
+        best = np.argmax(score, axis=1)
+        rows = np.arange(len(self.team_ids))
+        frame = pd.DataFrame(levers[best], columns=LEVERS, index=pd.Index(self.team_ids, name="team_id"))
+        frame["risk_adjusted_revenue"] = score[rows, best]
+        for field in RESULT_FIELDS:
+            frame[field] = result[field][rows, best]
+        return frame
+
+
+def _axis_position(levels: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Lower lattice index and fractional offset for each value, clamped to the lattice."""
+    position = np.interp(np.asarray(values, dtype=float), levels, np.arange(len(levels)))
+    lower = np.minimum(np.floor(position).astype(np.intp), len(levels) - 2)
+    return lower, position - lower
+
+
+def lattice_scenarios(
+    levers: Mapping[str, Sequence[float]] = SURFACE_LEVERS, conditions: Sequence[str] = SURFACE_CONDITIONS
+) -> pd.DataFrame:
+    """Every lattice point as a scenario frame, condition-major then price, marketing, win."""
+    return pd.concat([scenario_grid(levers, condition) for condition in conditions], ignore_index=True)
+
+
+def surface_paths(season: int, variant: str = "default", directory: Path = SURFACES_DIR) -> Tuple[Path, Path]:
+    """Array and metadata paths for one season's surface."""
+    stem = directory / f"surface_{int(season)}_{variant}"
+    return stem.with_suffix(".npy"), stem.with_suffix(".json")
+
+
+def _replace_json(path: Path, payload: Dict) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def write_surface(
+    clubs: pd.DataFrame,
+    season: int,
+    variant: str = "default",
+    directory: Path = SURFACES_DIR,
+    levers: Mapping[str, Sequence[float]] = SURFACE_LEVERS,
+    conditions: Sequence[str] = SURFACE_CONDITIONS,
+    chunk_size: int = 32,
+) -> Path:
+    """Evaluate the lattice for one season's clubs and save it as ``.npy`` plus JSON metadata.
+
+    Clubs are simulated in chunks of ``chunk_size`` and written straight
+    into a memory-mapped file, so the full surface never sits in memory.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    values_path, meta_path = surface_paths(season, variant, directory)
+    levers = {lever: np.asarray(levers[lever], dtype=float) for lever in LEVERS}
+    scenarios = lattice_scenarios(levers, conditions)
+    lattice_shape = (len(conditions),) + tuple(len(levers[lever]) for lever in LEVERS)
+    shape = (len(clubs),) + lattice_shape + (len(SURFACE_FIELDS),)
+
+    tmp_path = values_path.with_name(values_path.name + ".tmp")
+    out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=SURFACE_DTYPE, shape=shape)
+    for start in range(0, len(clubs), chunk_size):
+        chunk = clubs.iloc[start : start + chunk_size]
+        batch = simulate_batch(chunk, scenarios)
+        fields = np.stack([getattr(batch, field) for field in SURFACE_FIELDS], axis=-1)
+        out[start : start + len(chunk)] = fields.reshape((len(chunk),) + lattice_shape + (len(SURFACE_FIELDS),))
+    out.flush()
+    del out
+    os.replace(tmp_path, values_path)
+
+    _replace_json(meta_path, {
+        "season": int(season),
+        "variant": variant,
+        "team_ids": clubs["team_id"].astype(str).tolist(),
+        "base_attendance": clubs["home_attendance"].astype(float).tolist(),
+        "base_price": clubs["ticket_price_proxy"].astype(float).tolist(),
+        "levers": {lever: values.tolist() for lever, values in levers.items()},
+        "conditions": list(conditions),
+        "fields": SURFACE_FIELDS,
+        "shape": list(shape),
+    })
+    logger.info("Wrote %s surface for %d (%d clubs, %.1f MB)", variant, season, len(clubs), values_path.stat().st_size / 1e6)
+    return values_path
+
+
+def load_surface(
+    season: int, variant: str = "default", directory: Path = SURFACES_DIR, mmap: bool = True
+) -> Optional[ResponseSurface]:
+    """Saved surface, or None when missing or inconsistent with its metadata."""
+    values_path, meta_path = surface_paths(season, variant, directory)
+    if not (values_path.exists() and meta_path.exists()):
+        return None
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    values = np.load(values_path, mmap_mode="r" if mmap else None)
+    if list(values.shape) != meta["shape"] or meta["fields"] != SURFACE_FIELDS:
+        logger.warning("Ignoring surface %s: shape or fields do not match its metadata", values_path)
+        return None
+    return ResponseSurface(
+        season=meta["season"],
+        variant=meta["variant"],
+        team_ids=np.asarray(meta["team_ids"], dtype=object),
+        base_attendance=np.asarray(meta["base_attendance"]),
+        base_price=np.asarray(meta["base_price"]),
+        levers={lever: np.asarray(values) for lever, values in meta["levers"].items()},
+        conditions=meta["conditions"],
+        values=values,
+    )
+
+
+def write_surfaces(
+    df: pd.DataFrame,
+    elasticities: Optional[pd.DataFrame] = None,
+    seasons: Optional[Iterable[int]] = None,
+    directory: Path = SURFACES_DIR,
+) -> List[Path]:
+    """Write surfaces for ``seasons`` (default: the latest) and an index of them.
+
+    With an ``elasticities`` table, each season also gets a ``club`` variant
+    built from the estimates ``attach_elasticities`` accepts.
+    """
+    seasons = [int(df["season"].max())] if seasons is None else [int(s) for s in seasons]
+    written: List[Path] = []
+    entries = []
+    for season in seasons:
+        clubs = df[df["season"] == season].reset_index(drop=True)
+        variants = {"default": clubs}
+        if elasticities is not None:
+            variants["club"] = attach_elasticities(clubs, elasticities)
+        for variant, frame in variants.items():
+            written.append(write_surface(frame, season, variant, directory))
+            entries.append({"season": season, "variant": variant, "path": written[-1].name})
+    _replace_json(directory / SURFACE_INDEX.name, {"surfaces": entries})
+    return written
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    from src.storage import read_club_metrics
+
+    parser = argparse.ArgumentParser(description="Precompute simulator response surfaces.")
+    parser.add_argument("--season", type=int, action="append", help="Season to build (repeatable; default latest).")
+    parser.add_argument("--all-seasons", action="store_true", help="Build every season in club_metrics.")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    df = read_club_metrics()
+    seasons = sorted(df["season"].unique()) if args.all_seasons else args.season
+    write_surfaces(df, load_elasticities(), seasons)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import argparse
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils import RAW_DIR, setup_logging
+
+logger = logging.getLogger(__name__)
+
+HOME_GAMES = 81
+GAME_COLUMNS = ["team_id", "season", "game_number", "game_date", "is_weekend", "attendance"]
+
+
+@dataclass
+class RawProfile:
+    """Distribution parameters for synthetic raw data.
+
+    ``calibrate`` fits these from the CSVs in ``data/raw``: market tier mix,
+    capacity and metro population by tier, the linear fit of attendance %
+    of capacity on wins with per-tier offsets, and how often clubs at or
+    above the 88-win line are flagged as playoff teams.
+    """
+
+    tiers: Tuple[str, ...] = ("Large", "Medium", "Small")
+    tier_probs: Tuple[float, ...] = (0.533, 0.367, 0.100)
+    capacity_mean: Dict[str, float] = field(default_factory=lambda: {"Large": 43_300, "Medium": 42_500, "Small": 36_600})
+    capacity_std: Dict[str, float] = field(default_factory=lambda: {"Large": 4_680, "Medium": 4_420, "Small": 8_970})
+    metro_log_mean: Dict[str, float] = field(default_factory=lambda: {"Large": 2.09, "Medium": 1.05, "Small": 1.14})
+    metro_log_std: Dict[str, float] = field(default_factory=lambda: {"Large": 0.46, "Medium": 0.31, "Small": 0.33})
+    wins_mean: float = 79.66
+    wins_std: float = 11.6
+    pct_intercept: float = -0.2215
+    pct_per_win: float = 0.01009
+    tier_pct_offset: Dict[str, float] = field(default_factory=lambda: {"Large": 0.044, "Medium": -0.036, "Small": -0.101})
+    pct_noise: float = 0.032
+    playoff_rate_at_88: float = 0.86
+    weekend_lift: float = 0.12
+    game_noise: float = 0.08
+
+
+def calibrate(raw_dir: Path = RAW_DIR) -> RawProfile:
+    """Fit a ``RawProfile`` to the existing raw CSVs."""
+    attendance = pd.read_csv(raw_dir / "attendance_by_team_year.csv")
+    market = pd.read_csv(raw_dir / "market_tiers.csv")
+    capacity = pd.read_csv(raw_dir / "stadium_capacity.csv")
+    df = attendance.merge(market, on="team_id").merge(capacity, on="team_id")
+    df["pct"] = df["home_attendance"] / (df["stadium_capacity"] * HOME_GAMES)
+
+    slope, intercept = np.polyfit(df["wins"], df["pct"], 1)
+    residual = df["pct"] - (intercept + slope * df["wins"])
+    tier_mix = market["market_tier"].value_counts(normalize=True)
+    teams = market.merge(capacity, on="team_id")
+    log_metro = np.log(teams["metro_population_m"])
+    by_tier = teams.assign(log_metro=log_metro).groupby("market_tier")
+    tier_offset = residual.groupby(df["market_tier"]).mean()
+
+    return RawProfile(
+        tiers=tuple(tier_mix.index),
+        tier_probs=tuple(float(p) for p in tier_mix.to_numpy()),
+        capacity_mean=by_tier["stadium_capacity"].mean().to_dict(),
+        capacity_std=by_tier["stadium_capacity"].std(ddof=0).fillna(0).to_dict(),
+        metro_log_mean=by_tier["log_metro"].mean().to_dict(),
+        metro_log_std=by_tier["log_metro"].std(ddof=0).fillna(0).to_dict(),
+        wins_mean=float(df["wins"].mean()),
+        wins_std=float(df["wins"].std()),
+        pct_intercept=float(intercept),
+        pct_per_win=float(slope),
+        tier_pct_offset=tier_offset.to_dict(),
+        pct_noise=float((residual - df["market_tier"].map(tier_offset)).std()),
+        playoff_rate_at_88=float(df.loc[df["wins"] >= 88, "playoff_flag"].mean()),
+    )
+
+
+def _team_tables(n_teams: int, profile: RawProfile, rng: np.random.Generator) -> Dict[str, pd.DataFrame]:
+    team_ids = np.array([f"T{i:06d}" for i in range(n_teams)])
+    tiers = rng.choice(np.array(profile.tiers), size=n_teams, p=np.asarray(profile.tier_probs) / sum(profile.tier_probs))
+    tier_series = pd.Series(tiers)
+    capacity = rng.normal(tier_series.map(profile.capacity_mean), tier_series.map(profile.capacity_std))
+    metro = rng.lognormal(tier_series.map(profile.metro_log_mean), tier_series.map(profile.metro_log_std))
+    return {
+        "teams": pd.DataFrame({
+            "team_id": team_ids,
+            "team_name": [f"Synthetic Club {i}" for i in range(n_teams)],
+            "league": np.where(np.arange(n_teams) % 2 == 0, "AL", "NL"),
+            "division": [f"Division {i % 6}" for i in range(n_teams)],
+        }),
+        "market": pd.DataFrame({
+            "team_id": team_ids,
+            "market_tier": tiers,
+            "metro_population_m": np.round(metro, 1),
+            "source_note": "Synthetic",
+        }),
+        "capacity": pd.DataFrame({
+            "team_id": team_ids,
+            "stadium_capacity": np.clip(np.round(capacity, -2), 20_000, 60_000).astype(int),
+        }),
+    }
+
+
+def _season_block(
+    team_ids: np.ndarray,
+    tiers: np.ndarray,
+    capacity: np.ndarray,
+    seasons: np.ndarray,
+    profile: RawProfile,
+    rng: np.random.Generator,
+    games: bool,
+) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+    """Season rows (and optional per-game rows) for a block of teams."""
+    n_teams, n_seasons = len(team_ids), len(seasons)
+    team_idx = np.repeat(np.arange(n_teams), n_seasons)
+    season_col = np.tile(seasons, n_teams)
+    wins = np.clip(np.round(rng.normal(profile.wins_mean, profile.wins_std, team_idx.size)), 45, 116).astype(int)
+    offset = pd.Series(tiers[team_idx]).map(profile.tier_pct_offset).fillna(0).to_numpy()
+    pct = profile.pct_intercept + profile.pct_per_win * wins + offset + rng.normal(0, profile.pct_noise, wins.size)
+    pct = np.clip(pct, 0.2, 0.98)
+    playoff = (wins >= 88) & (rng.random(wins.size) < profile.playoff_rate_at_88)
+    cap = capacity[team_idx]
+
+    game_df = None
+    if games:
+        game_number = np.tile(np.arange(1, HOME_GAMES + 1), team_idx.size)
+        row_idx = np.repeat(np.arange(team_idx.size), HOME_GAMES)
+        opening = pd.to_datetime(season_col.astype(str) + "-04-01").to_numpy()
+        game_date = opening[row_idx] + (game_number * 2 - 2).astype("timedelta64[D]")
+        is_weekend = pd.DatetimeIndex(game_date).dayofweek.to_numpy() >= 5
+        # Centre the weekend lift so the season mean stays at ``pct``.
+        lift = profile.weekend_lift * (is_weekend - is_weekend.reshape(-1, HOME_GAMES).mean(axis=1)[row_idx])
+        game_pct = np.clip(pct[row_idx] + lift + rng.normal(0, profile.game_noise, row_idx.size), 0.05, 1.0)
+        game_attendance = np.round(game_pct * cap[row_idx]).astype(int)
+        game_df = pd.DataFrame({
+            "team_id": team_ids[team_idx][row_idx],
+            "season": season_col[row_idx],
+            "game_number": game_number,
+            "game_date": pd.DatetimeIndex(game_date).strftime("%Y-%m-%d"),
+            "is_weekend": is_weekend.astype(int),
+            "attendance": game_attendance,
+        })
+        home_attendance = game_attendance.reshape(-1, HOME_GAMES).sum(axis=1)
+    else:
+        home_attendance = np.round(pct * cap * HOME_GAMES).astype(int)
+
+    season_df = pd.DataFrame({
+        "team_id": team_ids[team_idx],
+        "season": season_col,
+        "home_attendance": home_attendance,
+        "wins": wins,
+        "playoff_flag": playoff.astype(int),
+    })
+    return season_df, game_df
+
+
+def _blocks(
+    n_teams: int,
+    n_seasons: int,
+    start_season: int,
+    seed: int,
+    profile: RawProfile,
+    games: bool,
+    chunk_rows: int,
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """Yield (table, frame) pieces; season rows are generated in team blocks."""
+    rng = np.random.default_rng(np.random.SeedSequence(seed).spawn(1)[0])
+    tables = _team_tables(n_teams, profile, rng)
+    for name in ("teams", "market", "capacity"):
+        yield name, tables[name]
+
+    seasons = start_season + np.arange(n_seasons)
+    rows_per_team = n_seasons * (HOME_GAMES if games else 1)
+    block = max(1, chunk_rows // rows_per_team)
+    starts = range(0, n_teams, block)
+    team_ids = tables["teams"]["team_id"].to_numpy()
+    tiers = tables["market"]["market_tier"].to_numpy()
+    capacity = tables["capacity"]["stadium_capacity"].to_numpy()
+    for start, child in zip(starts, np.random.SeedSequence(seed).spawn(len(starts) + 1)[1:]):
+        stop = start + block
+        season_df, game_df = _season_block(
+            team_ids[start:stop], tiers[start:stop], capacity[start:stop], seasons, profile,
+            np.random.default_rng(child), games,
+        )
+        yield "attendance", season_df
+        if game_df is not None:
+            yield "games", game_df
+
+
+def synthetic_raw(
+    n_teams: int = 30,
+    n_seasons: int = 10,
+    start_season: int = 2015,
+    seed: int = 0,
+    profile: Optional[RawProfile] = None,
+) -> Dict[str, pd.DataFrame]:
+    """In-memory raw tables shaped like ``load_raw_data`` output."""
+    profile = profile or RawProfile()
+    parts: Dict[str, list] = {}
+    for name, frame in _blocks(n_teams, n_seasons, start_season, seed, profile, False, 1_000_000):
+        parts.setdefault(name, []).append(frame)
+    return {name: pd.concat(frames, ignore_index=True) for name, frames in parts.items()}
+
+
+RAW_FILES = {
+    "teams": "teams_master.csv",
+    "market": "market_tiers.csv",
+    "capacity": "stadium_capacity.csv",
+    "attendance": "attendance_by_team_year.csv",
+    "games": "attendance_by_game.csv",
+}
+
+
+def write_raw_files(
+    out_dir: Path,
+    n_teams: int,
+    n_seasons: int,
+    start_season: int = 2015,
+    seed: int = 0,
+    games: bool = False,
+    profile: Optional[RawProfile] = None,
+    chunk_rows: int = 1_000_000,
+) -> Dict[str, int]:
+    """Stream schema-compatible raw CSVs to ``out_dir``.
+
+    Rows are generated and appended in blocks of about ``chunk_rows``, so
+    memory stays flat however many seasons or games are requested. With
+    ``games`` an extra ``attendance_by_game.csv`` holds one row per home
+    game, and season totals in ``attendance_by_team_year.csv`` equal the
+    sum of those games. Returns the row count written per file.
+    """
+    profile = profile or calibrate()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    counts: Dict[str, int] = {}
+    handles = {}
+    try:
+        for name, frame in _blocks(n_teams, n_seasons, start_season, seed, profile, games, chunk_rows):
+            if name not in handles:
+                handles[name] = (out_dir / RAW_FILES[name]).open("w", newline="", encoding="utf-8")
+            frame.to_csv(handles[name], header=name not in counts, index=False)
+            counts[name] = counts.get(name, 0) + len(frame)
+            if name in ("attendance", "games"):
+                logger.info("%s: %d rows written", RAW_FILES[name], counts[name])
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return counts
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Write synthetic raw league data.")
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--teams", type=int, default=30)
+    parser.add_argument("--seasons", type=int, default=10)
+    parser.add_argument("--start-season", type=int, default=2015)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--games", action="store_true", help="Also write per-game attendance rows.")
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    counts = write_raw_files(
+        args.out_dir, args.teams, args.seasons, args.start_season, args.seed, args.games, chunk_rows=args.chunk_rows
+    )
+    logger.info("Synthetic raw data written to %s: %s", args.out_dir, counts)
+
+
+if __name__ == "__main__":
+    main()
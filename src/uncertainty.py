@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.simulator import (
+    ATTENDANCE_CHANGE_BOUNDS,
+    MARKET_ADJUST,
+    club_elasticities,
+)
+
+# Attendance change is clipped to ATTENDANCE_CHANGE_BOUNDS, so a fixed-range
+# histogram per club captures the full distribution in bounded memory.
+HISTOGRAM_BINS = 5_500
+
+
+@dataclass
+class Distribution:
+    """Sampling distribution for one uncertain model input."""
+
+    kind: str = "normal"
+    loc: float = 0.0
+    scale: float = 0.0
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        if self.kind == "normal":
+            return rng.normal(self.loc, self.scale, size)
+        if self.kind == "uniform":
+            return rng.uniform(self.loc - self.scale, self.loc + self.scale, size)
+        if self.kind == "lognormal":
+            return self.loc * rng.lognormal(0.0, self.scale, size)
+        if self.kind == "fixed":
+            return np.full(size, self.loc)
+        raise ValueError(f"Unknown distribution kind: {self.kind}")
+
+
+@dataclass
+class UncertaintyConfig:
+    """Distributions for elasticities and the market adjustment multiplier.
+
+    Elasticity draws are offsets around each club's point elasticity, so
+    ``loc`` should normally stay at 0. ``market_noise`` multiplies the
+    deterministic market-condition adjustment.
+    """
+
+    price_elasticity: Distribution = field(default_factory=lambda: Distribution("normal", 0.0, 0.08))
+    marketing_elasticity: Distribution = field(default_factory=lambda: Distribution("normal", 0.0, 0.05))
+    win_elasticity: Distribution = field(default_factory=lambda: Distribution("normal", 0.0, 0.06))
+    market_noise: Distribution = field(default_factory=lambda: Distribution("normal", 1.0, 0.04))
+
+
+def _chunk_histogram(
+    args: Tuple[np.random.SeedSequence, int, np.ndarray, Tuple[float, float, float], float, UncertaintyConfig, int]
+) -> np.ndarray:
+    """Sample one chunk and return per-club attendance-change bin counts."""
+    seed, n_samples, elasticities, levers, market_adjust, config, bins = args
+    rng = np.random.default_rng(seed)
+    price, marketing, win = levers
+    price_e = elasticities[0][None, :] + config.price_elasticity.sample(rng, n_samples)[:, None]
+    marketing_e = elasticities[1][None, :] + config.marketing_elasticity.sample(rng, n_samples)[:, None]
+    win_e = elasticities[2][None, :] + config.win_elasticity.sample(rng, n_samples)[:, None]
+    adjust = market_adjust * config.market_noise.sample(rng, n_samples)[:, None]
+
+    change = (price_e * price + marketing_e * marketing + win_e * win) * adjust
+    low, high = ATTENDANCE_CHANGE_BOUNDS
+    change = np.clip(change, low, high)
+    idx = np.minimum(((change - low) / (high - low) * bins).astype(np.int64), bins - 1)
+    n_clubs = elasticities.shape[1]
+    offsets = np.arange(n_clubs)[None, :] * bins
+    return np.bincount((idx + offsets).ravel(), minlength=n_clubs * bins).reshape(n_clubs, bins)
+
+
+def _histogram_quantiles(counts: np.ndarray, quantiles: np.ndarray) -> np.ndarray:
+    """Linearly interpolated quantiles from per-club bin counts."""
+    low, high = ATTENDANCE_CHANGE_BOUNDS
+    bins = counts.shape[1]
+    width = (high - low) / bins
+    cdf = np.cumsum(counts, axis=1) / counts.sum(axis=1, keepdims=True)
+    out = np.empty((counts.shape[0], len(quantiles)))
+    for j, q in enumerate(quantiles):
+        b = np.minimum((cdf < q).sum(axis=1), bins - 1)
+        rows = np.arange(counts.shape[0])
+        prev = np.where(b > 0, cdf[rows, b - 1], 0.0)
+        mass = cdf[rows, b] - prev
+        frac = np.divide(q - prev, mass, out=np.zeros_like(mass), where=mass > 0)
+        out[:, j] = low + (b + frac) * width
+    return out
+
+
+def monte_carlo_bands(
+    clubs: pd.DataFrame,
+    price_change_pct: float,
+    marketing_lift_pct: float,
+    win_change_pct: float,
+    market_condition: str = "Neutral",
+    config: Optional[UncertaintyConfig] = None,
+    n_samples: int = 10_000,
+    seed: int = 0,
+    percentiles: Sequence[int] = (10, 50, 90),
+    chunk_size: int = 20_000,
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Monte Carlo percentile bands for attendance and revenue per club.
+
+    Elasticities and the market adjustment are sampled from ``config``
+    around each club's point estimates. Samples are drawn in chunks of
+    ``chunk_size`` and folded into fixed-range histograms, so memory is
+    bounded by ``chunk_size * len(clubs)`` regardless of ``n_samples``.
+    Each chunk has its own child seed, so results are identical whether
+    chunks run serially or across ``workers`` processes.
+    """
+    config = config or UncertaintyConfig()
+    elasticities = np.hstack(club_elasticities(clubs)).T
+    levers = (price_change_pct, marketing_lift_pct, win_change_pct)
+    market_adjust = MARKET_ADJUST.get(market_condition, 1.0)
+
+    sizes: List[int] = [min(chunk_size, n_samples - start) for start in range(0, n_samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [
+        (s, n, elasticities, levers, market_adjust, config, HISTOGRAM_BINS) for s, n in zip(seeds, sizes)
+    ]
+
+    counts = np.zeros((len(clubs), HISTOGRAM_BINS), dtype=np.int64)
+    if workers and workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_counts in pool.map(_chunk_histogram, tasks):
+                counts += chunk_counts
+    else:
+        for task in tasks:
+            counts += _chunk_histogram(task)
+
+    change = _histogram_quantiles(counts, np.asarray(percentiles, dtype=float) / 100)
+    base_attendance = clubs["home_attendance"].to_numpy(dtype=float)[:, None]
+    base_price = clubs["ticket_price_proxy"].to_numpy(dtype=float)[:, None]
+    attendance = base_attendance * (1 + change)
+    revenue = attendance * base_price * (1 + price_change_pct)
+
+    bands = pd.DataFrame(index=clubs.index)
+    if "team_id" in clubs.columns:
+        bands["team_id"] = clubs["team_id"]
+    for j, p in enumerate(percentiles):
+        bands[f"attendance_p{p}"] = attendance[:, j]
+    for j, p in enumerate(percentiles):
+        bands[f"revenue_p{p}"] = revenue[:, j]
+    return bands
@@ -9,6 +9,7 @@ import pandas as pd
 ROOT = Path(__file__).resolve().parents[1]
 RAW_DIR = ROOT / "data" / "raw"
 PROCESSED_DIR = ROOT / "data" / "processed"
+CACHE_DIR = ROOT / "data" / "cache"
 OUTPUTS_DIR = ROOT / "outputs"
 FIGURES_DIR = OUTPUTS_DIR / "figures"
 MEMOS_DIR = OUTPUTS_DIR / "memos"
@@ -1,6 +1,17 @@
+import numpy as np
 import pandas as pd
 
-from src.benchmarking import compute_cpi
+from src.benchmarking import (
+    DRIVER_LABELS,
+    WEIGHTS,
+    assign_tiers,
+    component_matrix,
+    compute_cpi,
+    cpi_for_weights,
+    driver_attribution,
+    season_ranks,
+    weight_sweep,
+)
 
 
 def test_cpi_range():
@@ -13,3 +24,37 @@ def test_cpi_range():
     })
     scored = compute_cpi(df)
     assert scored["cpi"].between(0, 100).all()
+
+
+def test_weight_sweep_matches_compute_cpi_at_base_weights():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "team_id": [f"T{i}" for i in range(30)] * 2,
+        "season": [2023] * 30 + [2024] * 30,
+        **{name: rng.random(60) for name in WEIGHTS},
+    })
+    tiered = assign_tiers(compute_cpi(df))
+    scores = component_matrix(df)
+    np.testing.assert_array_equal(cpi_for_weights(scores, WEIGHTS)[:, 0], tiered["cpi"])
+    ranks = season_ranks(cpi_for_weights(scores, [WEIGHTS, WEIGHTS]), df["season"].to_numpy())
+    np.testing.assert_array_equal(ranks[:, 1], tiered["cpi_rank"])
+
+    sweep = weight_sweep(df, n_samples=300, chunk_size=64)
+    assert (sweep["cpi_base"] == tiered["cpi"]).all()
+    assert (sweep["rank_min"] <= tiered["cpi_rank"]).all() and (tiered["cpi_rank"] <= sweep["rank_max"]).all()
+    assert sweep["p_tier_flip"].between(0, 1).all()
+
+    fixed = weight_sweep(df, weights=np.tile([WEIGHTS[name] for name in WEIGHTS], (5, 1)))
+    assert (fixed["p_tier_flip"] == 0).all() and (fixed["rank_min"] == fixed["rank_max"]).all()
+
+
+def test_driver_attribution_matches_row_wise_sort():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({f"{name}_score": rng.integers(0, 5, 40) * 25.0 for name in WEIGHTS})
+    attributed = driver_attribution(df)
+    labels = {f"{name}_score": DRIVER_LABELS[name] for name in WEIGHTS}
+    for i, row in df.iterrows():
+        expected = sorted(labels.items(), key=lambda item: row[item[0]], reverse=True)[:3]
+        assert tuple(attributed.loc[i, ["driver_1", "driver_2", "driver_3"]]) == tuple(label for _, label in expected)
+        column, _ = expected[0]
+        assert attributed.loc[i, "driver_1_contribution"] == row[column] * WEIGHTS[column[: -len("_score")]]
@@ -0,0 +1,10 @@
+from benchmarks.run import find_regressions
+
+
+def test_regression_gate_respects_threshold_and_noise_floor():
+    baseline = {"build_dataset": {"seconds": 1.0, "peak_mb": 50.0}, "compute_cpi": {"seconds": 0.001, "peak_mb": 1.0}}
+    current = {"build_dataset": {"seconds": 1.5, "peak_mb": 52.0}, "compute_cpi": {"seconds": 0.003, "peak_mb": 1.0}}
+    regressions = find_regressions(current, baseline, threshold=0.25)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("build_dataset.seconds")
+    assert find_regressions(current, baseline, threshold=0.6) == []
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.bulk import club_inputs, read_scenarios, run_bulk
+from src.simulator import simulate_scenario
+
+
+def test_bulk_runner_streams_results_in_input_order(tmp_path):
+    metrics = pd.DataFrame({
+        "team_id": ["AAA", "BBB", "AAA", "BBB"],
+        "season": [2023, 2023, 2024, 2024],
+        "market_tier": ["Large", "Small", "Large", "Small"],
+        "home_attendance": [2_000_000.0, 1_500_000.0, 2_100_000.0, 1_400_000.0],
+        "ticket_price_proxy": [35.0, 28.0, 36.0, 27.5],
+    })
+    rng = np.random.default_rng(0)
+    n = 1_000
+    scenarios = pd.DataFrame({
+        "team_id": rng.choice(["AAA", "BBB", "ZZZ"], n),
+        "season": rng.choice([2023, 2024], n),
+        "price_change_pct": rng.uniform(-0.1, 0.15, n).round(3),
+        "marketing_lift_pct": rng.uniform(0, 0.2, n).round(3),
+        "win_change_pct": rng.uniform(-0.05, 0.1, n).round(3),
+        "market_condition": rng.choice(["Strong", "Neutral", "Soft"], n),
+    })
+    scenarios.loc[::7, "season"] = None
+    unknown = scenarios.index.isin([3, 500])
+    scenarios.loc[3, "market_condition"] = "strong"
+    scenarios.loc[500, "market_condition"] = "Hot"
+    scenarios_path = tmp_path / "scenarios.csv"
+    scenarios.to_csv(scenarios_path, index=False)
+
+    clubs = club_inputs(metrics)
+    serial = run_bulk(read_scenarios(scenarios_path, 128), tmp_path / "serial.csv", clubs, workers=1)
+    pooled = run_bulk(read_scenarios(scenarios_path, 128), tmp_path / "pooled.csv", clubs, workers=2, max_pending=3)
+    assert (tmp_path / "serial.csv").read_bytes() == (tmp_path / "pooled.csv").read_bytes()
+    assert (serial.rows, serial.chunks) == (pooled.rows, pooled.chunks) == (n, 8)
+
+    out = pd.read_csv(tmp_path / "serial.csv", dtype={"team_id": str})
+    pd.testing.assert_frame_equal(out[scenarios.columns[2:]], scenarios[scenarios.columns[2:]])
+    assert (out["season"] == scenarios["season"].fillna(2024)).all()
+    assert serial.unknown_conditions == pooled.unknown_conditions == 2
+    assert out.loc[unknown, "projected_revenue"].isna().all()
+    assert serial.unmatched == ((scenarios["team_id"] == "ZZZ") & ~unknown).sum()
+    assert out["projected_revenue"].isna().sum() == serial.unmatched + serial.unknown_conditions
+
+    indexed = metrics.set_index(["team_id", "season"])
+    for i in out.index[(out["team_id"] != "ZZZ") & ~unknown][:20]:
+        scenario = out.loc[i]
+        expected = simulate_scenario(
+            indexed.loc[(scenario["team_id"], scenario["season"])],
+            scenario["price_change_pct"],
+            scenario["marketing_lift_pct"],
+            scenario["win_change_pct"],
+            scenario["market_condition"],
+        )
+        assert scenario["projected_revenue"] == pytest.approx(expected.projected_revenue)
+        assert scenario["confidence_high"] == pytest.approx(expected.confidence_high)
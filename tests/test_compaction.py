@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from src.compaction import compact_club_metrics, memory_report, with_aliases
+
+
+def test_compaction_keeps_values_within_bounds():
+    n = 200
+    df = pd.DataFrame({
+        "team_id": [f"T{i % 20}" for i in range(n)],
+        "note": ["Public"] * n,
+        "label": [f"row {i}" for i in range(n)],
+        "revenue_potential": np.linspace(1e6, 9e7, n),
+        "cpi_rank": np.tile(np.arange(1.0, 21.0), 10),
+        "huge": np.full(n, 1e300),
+    })
+    df["revenue_proxy"] = df["revenue_potential"]
+
+    compact = compact_club_metrics(df)
+    assert "revenue_proxy" not in compact.columns
+    assert isinstance(compact["note"].dtype, pd.CategoricalDtype)
+    assert compact["label"].dtype == object
+    assert compact["cpi_rank"].dtype == "int8"
+    assert compact["huge"].dtype == "float64"
+    assert compact["revenue_potential"].dtype == "float32"
+    np.testing.assert_allclose(compact["revenue_potential"], df["revenue_potential"], rtol=1e-6)
+
+    restored = with_aliases(compact)
+    assert restored["revenue_proxy"].equals(restored["revenue_potential"])
+
+    report = memory_report(df, compact).set_index("column")
+    assert report.loc["revenue_proxy", "bytes_after"] == 0
+    assert report.loc["TOTAL", "bytes_after"] < report.loc["TOTAL", "bytes_before"]
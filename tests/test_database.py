@@ -0,0 +1,32 @@
+import pandas as pd
+
+from src import database
+
+
+def test_database_pushes_down_filters(tmp_path):
+    raw = {
+        "teams": pd.DataFrame({"team_id": ["AAA", "BBB"], "team_name": ["Alpha", "Beta"], "league": "AL", "division": "AL East"}),
+        "market": pd.DataFrame({"team_id": ["AAA", "BBB"], "market_tier": ["Large", "Small"], "metro_population_m": [9.0, 2.0]}),
+        "capacity": pd.DataFrame({"team_id": ["AAA", "BBB"], "stadium_capacity": [40000, 35000]}),
+        "attendance": pd.DataFrame({"team_id": ["AAA", "BBB"], "season": [2024, 2024], "home_attendance": [3_000_000, 2_000_000], "wins": [90, 70], "playoff_flag": [1, 0]}),
+    }
+    metrics = pd.DataFrame({
+        "team_id": ["AAA", "BBB", "AAA"],
+        "team_name": ["Alpha", "Beta", "Alpha"],
+        "season": [2024, 2024, 2023],
+        "market_tier": ["Large", "Small", "Large"],
+        "attendance_pct": [0.9, 0.6, 0.85],
+        "ticket_price_proxy": [30.0, 25.0, 29.0],
+        "cpi": [70.0, 30.0, 65.0],
+        "unused_column": [1, 2, 3],
+    })
+    path = database.build_database(raw, metrics, tmp_path / "test.db", source=[("club_metrics.csv", 1, 10)])
+    assert database.source_matches((("club_metrics.csv", 1, 10),), path)
+    assert not database.source_matches((("club_metrics.csv", 2, 10),), path)
+    assert not database.source_matches((), tmp_path / "missing.db")
+
+    assert database.latest_season(path) == 2024
+    assert database.top_clubs(n=1, path=path)["team_id"].tolist() == ["AAA"]
+    assert database.club_metrics(2024, ["Small"], columns=["team_id"], path=path)["team_id"].tolist() == ["BBB"]
+    assert database.under_monetized(2024, 0.8, 34, path=path)["team_id"].tolist() == ["AAA"]
+    assert database.demand_constrained(2024, 0.65, 32, path=path)["team_id"].tolist() == ["BBB"]
@@ -0,0 +1,20 @@
+import pandas as pd
+
+from src.datastore import build_store
+
+
+def test_store_indexes_match_boolean_filters():
+    df = pd.DataFrame({
+        "team_id": ["AAA", "BBB", "AAA", "BBB"],
+        "team_name": ["Alpha", "Beta", "Alpha", "Beta"],
+        "season": [2023, 2023, 2024, 2024],
+        "cpi": [40.0, 60.0, 55.0, 45.0],
+    })
+    store = build_store(df)
+    assert store.seasons == [2023, 2024]
+    assert store.latest_season == 2024
+    pd.testing.assert_frame_equal(store.latest, df[df["season"] == 2024])
+    pd.testing.assert_frame_equal(store.team("BBB"), df[df["team_id"] == "BBB"])
+    assert store.club_row("Beta")["cpi"] == 45.0
+    assert store.club_row("Alpha", 2023)["cpi"] == 40.0
+    assert store.season(1999).empty
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from src.elasticity import attach_elasticities, elasticity_table, estimate_elasticities
+from src.simulator import DEFAULT_GRID, simulate_batch, simulate_scenario
+
+
+def test_bootstrap_recovers_club_elasticities():
+    rng = np.random.default_rng(0)
+    rows = []
+    clubs = {
+        "AAA": (-0.8, 0.5, "Large"),
+        "BBB": (-0.2, 1.0, "Large"),
+        "DDD": (0.3, 1.2, "Small"),
+        "EEE": (-0.5, 0.8, "Medium"),
+    }
+    for team, (price_e, win_e, tier) in clubs.items():
+        price = rng.uniform(20, 60, 200)
+        wins = rng.uniform(60, 100, 200)
+        attendance = np.exp(14 + price_e * np.log(price) + win_e * np.log(wins) + rng.normal(0, 0.01, 200))
+        rows.append(pd.DataFrame({
+            "team_id": team,
+            "market_tier": tier,
+            "home_attendance": attendance,
+            "ticket_price_proxy": price,
+            "wins": wins,
+        }))
+    df = pd.concat(rows, ignore_index=True)
+
+    serial = estimate_elasticities(df, n_resamples=200, workers=1, chunk_size=64)
+    pooled = estimate_elasticities(df, n_resamples=200, workers=2, chunk_size=64)
+    pd.testing.assert_frame_equal(serial, pooled)
+    np.testing.assert_allclose(serial["price_elasticity"], [-0.8, -0.2, 0.3, -0.5], atol=0.02)
+    np.testing.assert_allclose(serial["win_elasticity"], [0.5, 1.0, 1.2, 0.8], atol=0.05)
+    assert (serial["price_elasticity_low"] <= serial["price_elasticity"]).all()
+    assert (serial["price_elasticity"] <= serial["price_elasticity_high"]).all()
+
+    clubs = df.groupby("team_id").tail(1).reset_index(drop=True)
+    clubs = pd.concat([clubs, clubs.iloc[[3]].assign(team_id="CCC")], ignore_index=True)
+    attached = attach_elasticities(clubs, elasticity_table(df, n_resamples=50, workers=1))
+    tier = estimate_elasticities(df, key="market_tier", n_resamples=0, workers=1)
+    assert attached["elasticity_source"].tolist() == ["team_id", "team_id", "default", "team_id", "market_tier"]
+    assert attached.loc[4, "price_elasticity"] == tier.set_index("key").loc["Medium", "price_elasticity"]
+    # DDD's positive estimate, and its tier's, are rejected in favour of the defaults.
+    assert np.isnan(attached.loc[2, "price_elasticity"])
+    assert not (attached["price_elasticity"] > 0).any()
+
+    scenario = {name: values[1] for name, values in DEFAULT_GRID.items()}
+    batch = simulate_batch(attached, {**{k: [v] for k, v in scenario.items()}, "market_condition": ["Neutral"]})
+    row = simulate_scenario(attached.iloc[0], *scenario.values())
+    assert batch.projected_revenue[0, 0] == row.projected_revenue
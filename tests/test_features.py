@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from src.features import attendance_pct, maybe_update_with_pybaseball, team_windows
+
+
+def test_pybaseball_update_degrades_per_year(tmp_path):
+    teams = pd.DataFrame({"team_id": ["AAA", "BBB"], "team_name": ["Alpha", "Beta"]})
+    attendance = pd.DataFrame({
+        "team_id": ["AAA", "BBB", "AAA", "BBB"],
+        "season": [2022, 2022, 2023, 2023],
+        "home_attendance": [1, 2, 3, 4],
+        "wins": [80, 80, 80, 80],
+        "playoff_flag": [0, 0, 0, 0],
+    })
+    calls = []
+
+    def fetcher(year):
+        calls.append(year)
+        if year == 2023:
+            raise ConnectionError("offline")
+        return [pd.DataFrame({"Tm": ["Alpha*", "Beta"], "W": [95, 70]})]
+
+    updated = maybe_update_with_pybaseball(attendance, teams, fetcher=fetcher, cache_dir=tmp_path)
+    assert updated["wins"].tolist() == [95, 70, 80, 80]
+    assert updated["playoff_flag"].tolist() == [1, 0, 0, 0]
+
+    maybe_update_with_pybaseball(attendance, teams, fetcher=fetcher, cache_dir=tmp_path)
+    assert sorted(calls) == [2022, 2023, 2023]
+
+
+def test_team_windows_match_grouped_rolling_in_any_row_order():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "team_id": np.repeat(["AAA", "BBB", "CCC"], 5),
+        "season": np.tile(np.arange(2018, 2023), 3),
+        "playoff_flag": rng.integers(0, 2, 15),
+        "home_attendance": rng.integers(1_000_000, 3_000_000, 15),
+        "stadium_capacity": 40_000,
+        "wins": rng.integers(60, 100, 15),
+    })
+    expected = team_windows(df)
+    grouped = df.groupby("team_id")
+    pd.testing.assert_series_equal(
+        expected["playoff_rate"],
+        grouped["playoff_flag"].rolling(3, min_periods=1).mean().reset_index(level=0, drop=True),
+        check_names=False,
+    )
+    pd.testing.assert_series_equal(
+        expected["attendance_yoy_growth"], grouped["home_attendance"].pct_change(), check_names=False
+    )
+    pct = attendance_pct(df).groupby(df["team_id"]).rolling(4, min_periods=2).std()
+    pd.testing.assert_series_equal(
+        expected["attendance_pct_std"], pct.reset_index(level=0, drop=True), check_names=False
+    )
+
+    shuffled = df.sample(frac=1, random_state=1)
+    pd.testing.assert_frame_equal(team_windows(shuffled), expected.loc[shuffled.index])
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from src.figures import save_figures
+
+
+def test_unchanged_figures_are_skipped(tmp_path):
+    df = pd.DataFrame({
+        "season": [2023, 2023, 2024, 2024],
+        "team_name": ["Alpha", "Beta", "Alpha", "Beta"],
+        "market_tier": ["Large", "Small", "Large", "Small"],
+        "home_attendance": [3_000_000, 1_800_000, 3_100_000, 1_700_000],
+        "ticket_price_proxy": [30.0, 25.0, 31.0, 26.0],
+        "attendance_pct": [0.9, 0.6, 0.85, 0.55],
+    })
+    first = save_figures(df, tmp_path, workers=1)
+    assert set(first.values()) == {"rendered"}
+    assert (tmp_path / "demand_vs_price.json").exists()
+
+    df.loc[0, "ticket_price_proxy"] = 99.0
+    second = save_figures(df, tmp_path, workers=1)
+    assert second == {"league_attendance_trend": "unchanged", "demand_vs_price": "unchanged"}
+
+    df.loc[3, "attendance_pct"] = 0.5
+    third = save_figures(df, tmp_path, workers=1)
+    assert third["demand_vs_price"] == "rendered"
+    assert third["league_attendance_trend"] == "unchanged"
@@ -0,0 +1,27 @@
+import pandas as pd
+
+from src.features import load_raw_data
+from src.ingest import GAME_FILE, aggregate_games, iter_game_chunks
+from src.pipeline import build_dataset
+from src.synthetic import write_raw_files
+
+
+def test_game_ingestion_matches_season_totals(tmp_path):
+    write_raw_files(tmp_path, n_teams=6, n_seasons=4, seed=3, games=True)
+    seasons = load_raw_data(tmp_path)
+    from_games = load_raw_data(tmp_path, games=True)
+
+    attendance = from_games["attendance"]
+    assert len(attendance) == len(seasons["attendance"])
+    assert attendance["home_attendance"].tolist() == seasons["attendance"]["home_attendance"].tolist()
+    assert (attendance["games"] == 81).all()
+    assert attendance["sellout_rate"].between(0, 1).all()
+    assert (attendance["weekend_avg_attendance"] > attendance["weekday_avg_attendance"]).mean() > 0.8
+
+    capacity = seasons["capacity"]
+    small = aggregate_games(iter_game_chunks(tmp_path / GAME_FILE, chunksize=97), capacity)
+    large = aggregate_games(iter_game_chunks(tmp_path / GAME_FILE), capacity)
+    pd.testing.assert_frame_equal(small, large)
+
+    df = build_dataset(from_games)
+    assert {"sellout_rate", "weekend_avg_attendance", "cpi"} <= set(df.columns)
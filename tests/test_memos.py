@@ -0,0 +1,36 @@
+import pandas as pd
+
+from src.memos import build_club_memo, memo_paths, write_memos
+
+
+def _metrics():
+    return pd.DataFrame({
+        "team_id": ["AAA", "BBB", "AAA", "BBB"],
+        "team_name": ["Alpha", "Beta", "Alpha", "Beta"],
+        "season": [2023, 2023, 2024, 2024],
+        "cpi_tier": ["Top 5", "Bottom 5", "Top 5", "Bottom 5"],
+        "cpi": [70.0, 30.0, 72.5, 28.0],
+        "fan_demand_score": [90.0, 10.0, 80.0, 20.0],
+        "revenue_potential_score": [60.0, 40.0, 85.0, 15.0],
+        "engagement_momentum_score": [50.0, 50.0, 50.0, 50.0],
+        "operational_efficiency_score": [70.0, 30.0, 60.0, 40.0],
+        "attendance_pct": [0.9, 0.6, 0.85, 0.55],
+        "ticket_price_proxy": [30.0, 25.0, 31.0, 26.0],
+        "engagement_momentum": [0.2, -0.1, 0.3, -0.2],
+        "sponsorship_proxy": [110.0, 90.0, 112.0, 88.0],
+        "home_attendance": [3_000_000, 1_800_000, 3_100_000, 1_700_000],
+        "market_tier": ["Large", "Small", "Large", "Small"],
+    })
+
+
+def test_write_memos_skips_unchanged_files(tmp_path):
+    df = _metrics()
+    assert write_memos(df, tmp_path, all_seasons=True) == 2 + 4 + 1 + 2
+    assert write_memos(df, tmp_path, all_seasons=True) == 0
+
+    latest = df[df["season"] == 2024]
+    memo = (tmp_path / "AAA.md").read_text(encoding="utf-8")
+    assert memo == build_club_memo(latest.iloc[0])
+    assert "- Revenue Potential\n- Fan Demand\n" in memo
+    assert (tmp_path / "2023" / "BBB.md").exists()
+    assert sorted(memo_paths(df, tmp_path, all_seasons=True)) == sorted(tmp_path.rglob("*.md"))
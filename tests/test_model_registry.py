@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from src import model_registry
+from src.model_registry import get_price_model, predict
+from src.pipeline import build_dataset
+from src.synthetic import synthetic_raw
+
+
+def test_price_model_is_refit_only_when_training_data_changes(tmp_path, monkeypatch):
+    path = tmp_path / "price_model.pkl"
+    df = build_dataset(synthetic_raw(n_teams=12, n_seasons=4, seed=2))
+    fits = []
+    fit = model_registry.build_price_sensitivity_model
+
+    def counting_fit(frame):
+        fits.append(len(frame))
+        return fit(frame)
+
+    monkeypatch.setattr(model_registry, "build_price_sensitivity_model", counting_fit)
+
+    first = get_price_model(df, path)
+    again = get_price_model(df, path)
+    assert len(fits) == 1
+    assert again.data_hash == first.data_hash
+
+    changed = df.assign(wins=df["wins"] + 1)
+    refit = get_price_model(changed, path)
+    assert len(fits) == 2
+    assert refit.data_hash != first.data_hash
+
+    columns = {"ticket_price_proxy": df["ticket_price_proxy"], "wins": df["wins"]}
+    for name in first.result.feature_names[2:]:
+        columns[name] = (df["market_tier"] == name[len("tier_"):]).astype(float)
+    expected = first.result.model.predict(pd.DataFrame(columns, columns=first.result.feature_names))
+    np.testing.assert_allclose(predict(first.result, df, chunk_size=7), expected)
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from src.panel import Panel, rank_pct
+from src.pipeline import build_dataset
+from src.synthetic import synthetic_raw
+
+
+def test_panel_round_trip_and_rank():
+    df = pd.DataFrame({
+        "team_id": ["B", "A", "A", "C"],
+        "season": [2020, 2021, 2020, 2021],
+        "wins": [80, 90, 70, 90],
+        "market_tier": ["Large", "Small", "Small", "Medium"],
+    }, index=[10, 11, 12, 13])
+    panel = Panel.from_long(df)
+    assert panel.mask.tolist() == [[True, True], [True, False], [False, True]]
+    pd.testing.assert_frame_equal(panel.to_long(), df)
+
+    expected = df.groupby("season")["wins"].rank(pct=True)
+    ranks = rank_pct(panel["wins"], panel.mask)[panel.rows]
+    np.testing.assert_array_equal(ranks, expected.to_numpy())
+
+
+def test_panel_features_match_long_format():
+    raw = synthetic_raw(n_teams=12, n_seasons=6, seed=4)
+    # Drop a few team seasons so windows have to skip gaps.
+    raw["attendance"] = raw["attendance"].drop(index=[3, 8, 40]).reset_index(drop=True)
+    long = build_dataset(raw)
+    dense = build_dataset(raw, use_panel=True)
+    pd.testing.assert_frame_equal(dense, long, check_dtype=False)
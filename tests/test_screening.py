@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.screening import SCREENS, screen, screen_masks, screen_summary, sweep_membership, threshold_sweep
+
+
+def _clubs() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 500
+    return pd.DataFrame({
+        "team_id": [f"T{i % 50:02d}" for i in range(n)],
+        "team_name": [f"Team {i % 50}" for i in range(n)],
+        "season": 2015 + np.arange(n) // 50,
+        "attendance_pct": rng.uniform(0.3, 1.0, n).round(2),
+        "ticket_price_proxy": rng.uniform(20, 55, n).round(0),
+    })
+
+
+def test_masks_match_row_filters():
+    df = _clubs()
+    masks = screen_masks(df, thresholds={"under_monetized": {"max_ticket_price": 40}})
+    expected = {
+        "under_monetized": (df["attendance_pct"] > 0.80) & (df["ticket_price_proxy"] < 40),
+        "demand_constrained": (df["attendance_pct"] < 0.65) & (df["ticket_price_proxy"] < 32),
+        "price_lift": (df["attendance_pct"] >= 0.82) & (df["ticket_price_proxy"] < 35),
+    }
+    for name, mask in expected.items():
+        assert masks[name].tolist() == mask.tolist()
+
+    members = screen(df, "demand_constrained", season=2020)
+    assert members["season"].eq(2020).all()
+    assert members["attendance_pct"].is_monotonic_increasing
+    assert len(members) == (expected["demand_constrained"] & df["season"].eq(2020)).sum()
+
+    summary = screen_summary(df)
+    assert summary.loc[2020, SCREENS["under_monetized"].label] == (
+        (df["attendance_pct"] > 0.80) & (df["ticket_price_proxy"] < 34) & df["season"].eq(2020)
+    ).sum()
+    with pytest.raises(ValueError):
+        screen_masks(df, ["under_monetized"], {"under_monetized": {"max_price": 30}})
+
+
+def test_threshold_sweep_counts_every_combination():
+    df = _clubs()
+    grid = {"min_attendance_pct": [0.8, 0.7, 0.9], "max_ticket_price": [30, 45, 35, 40]}
+    membership = sweep_membership(df, "under_monetized", grid)
+    assert membership.shape == (len(df), 3, 4)
+
+    sweep = threshold_sweep(df, "under_monetized", grid)
+    assert len(sweep) == df["season"].nunique() * 12
+    assert sweep.groupby(["min_attendance_pct", "max_ticket_price"], sort=False)["members"].sum().tolist() == (
+        membership.sum(axis=0).ravel().tolist()
+    )
+    for row in sweep.sample(10, random_state=0).itertuples():
+        members = screen(
+            df,
+            "under_monetized",
+            season=row.season,
+            thresholds={"min_attendance_pct": row.min_attendance_pct, "max_ticket_price": row.max_ticket_price},
+        )
+        assert row.members == len(members)
+
+    df.loc[::9, "ticket_price_proxy"] = np.nan
+    sweep = threshold_sweep(df, "demand_constrained", {"max_ticket_price": [25, 50]}, {"max_attendance_pct": 0.7})
+    expected = [len(screen(df, "demand_constrained", 2016, {"max_attendance_pct": 0.7, "max_ticket_price": t})) for t in (25, 50)]
+    assert sweep[sweep["season"] == 2016]["members"].tolist() == expected
@@ -0,0 +1,85 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from src.service import LRUCache, ScenarioService, request
+from src.simulator import simulate_scenario
+
+
+def _clubs() -> pd.DataFrame:
+    return pd.DataFrame({
+        "team_id": ["AAA", "BBB", "AAA", "BBB"],
+        "team_name": ["Aces", "Bees", "Aces", "Bees"],
+        "market_tier": ["Large", "Small", "Large", "Small"],
+        "season": [2023, 2023, 2024, 2024],
+        "home_attendance": [2_000_000.0, 1_500_000.0, 2_100_000.0, 1_400_000.0],
+        "ticket_price_proxy": [35.0, 28.0, 36.0, 27.5],
+        "cpi": [0.7, 0.4, 0.3, 0.6],
+        "cpi_rank": [1, 2, 2, 1],
+        "cpi_tier": ["Top", "Bottom", "Bottom", "Top"],
+    })
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 1, "misses": 1}
+
+
+def test_service_over_http():
+    service = ScenarioService(_clubs())
+    scenarios = [
+        {"team_id": "AAA", "price_change_pct": 0.05, "marketing_lift_pct": 0.1, "market_condition": "Strong"},
+        {"team_id": "BBB", "season": 2023, "win_change_pct": 0.02},
+        {"team_id": "AAA", "price_change_pct": 0.05, "marketing_lift_pct": 0.1, "market_condition": "Strong"},
+    ]
+
+    async def session():
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        responses = [
+            await request(reader, writer, "GET", "/rankings?season=2024"),
+            await request(reader, writer, "GET", "/clubs/BBB?columns=team_name,cpi"),
+            await request(reader, writer, "POST", "/simulate", {"scenarios": scenarios}),
+            await request(reader, writer, "GET", "/recommend?team_id=AAA,BBB"),
+            await request(reader, writer, "GET", "/clubs/ZZZ"),
+            await request(reader, writer, "POST", "/simulate", {"scenarios": [{"team_id": "AAA", "market_condition": "Hot"}]}),
+        ]
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    rankings, club, simulated, recommended, missing, invalid = asyncio.run(session())
+    assert rankings[0] == 200
+    assert [r["team_id"] for r in rankings[1]["rankings"]] == ["BBB", "AAA"]
+    assert club == (200, {"team_name": "Bees", "cpi": 0.6})
+
+    assert simulated[0] == 200
+    results = simulated[1]["results"]
+    clubs = _clubs().set_index(["team_id", "season"])
+    for scenario, result in zip(scenarios, results):
+        row = clubs.loc[(scenario["team_id"], scenario.get("season", 2024))]
+        expected = simulate_scenario(
+            row,
+            scenario.get("price_change_pct", 0.0),
+            scenario.get("marketing_lift_pct", 0.0),
+            scenario.get("win_change_pct", 0.0),
+            scenario.get("market_condition", "Neutral"),
+        )
+        assert result["projected_revenue"] == pytest.approx(expected.projected_revenue)
+        assert result["confidence_low"] == pytest.approx(expected.confidence_low)
+    assert service.cache.stats()["hits"] == 0
+    assert service.simulate({"scenarios": scenarios[:1]})["results"] == results[:1]
+    assert service.cache.stats()["hits"] == 1
+
+    assert recommended[0] == 200
+    assert [r["team_id"] for r in recommended[1]["recommendations"]] == ["AAA", "BBB"]
+    assert missing[0] == 404
+    assert invalid[0] == 400
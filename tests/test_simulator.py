@@ -1,6 +1,14 @@
 import pandas as pd
+import pytest
 
-from src.simulator import simulate_scenario
+from src.simulator import (
+    DEFAULT_GRID,
+    recommend_scenario,
+    recommend_scenarios,
+    risk_adjusted_revenue,
+    simulate_batch,
+    simulate_scenario,
+)
 
 
 def test_price_increase_raises_revenue():
@@ -11,3 +19,47 @@ def test_price_increase_raises_revenue():
     base = simulate_scenario(row, 0.0, 0.0, 0.0, "Neutral")
     higher = simulate_scenario(row, 0.05, 0.0, 0.0, "Neutral")
     assert higher.projected_revenue > base.projected_revenue
+
+
+def test_batch_matches_scalar():
+    clubs = pd.DataFrame({
+        "team_id": ["AAA", "BBB"],
+        "home_attendance": [2_000_000, 1_500_000],
+        "ticket_price_proxy": [35.0, 28.0],
+    })
+    scenarios = [(0.05, 0.1, 0.02, "Strong"), (-0.1, 0.0, 0.0, "Soft"), (1.0, 0.0, 0.0, "Neutral")]
+    batch = simulate_batch(clubs, scenarios)
+    assert batch.projected_revenue.shape == (2, 3)
+    for i, (_, row) in enumerate(clubs.iterrows()):
+        for j, scenario in enumerate(scenarios):
+            scalar = simulate_scenario(row, *scenario)
+            assert batch.projected_revenue[i, j] == pytest.approx(scalar.projected_revenue)
+            assert batch.attendance_change_pct[i, j] == pytest.approx(scalar.attendance_change_pct)
+            assert batch.confidence_high[i, j] == pytest.approx(scalar.confidence_high)
+    assert len(batch.to_frame()) == 6
+
+
+def test_recommendations_match_scalar_grid_search():
+    clubs = pd.DataFrame({
+        "team_id": ["AAA", "BBB", "CCC"],
+        "home_attendance": [2_000_000, 1_500_000, 900_000],
+        "ticket_price_proxy": [35.0, 28.0, 52.0],
+    })
+    best = recommend_scenarios(clubs)
+    assert len(best) == 3
+    for i, row in clubs.iterrows():
+        candidates = []
+        for price in DEFAULT_GRID["price_change_pct"]:
+            for marketing in DEFAULT_GRID["marketing_lift_pct"]:
+                for win in DEFAULT_GRID["win_change_pct"]:
+                    result = simulate_scenario(row, price, marketing, win, "Neutral")
+                    score = risk_adjusted_revenue(result.projected_revenue, price)
+                    candidates.append((score, (price, marketing, win), result))
+        score, levers, result = max(candidates, key=lambda candidate: candidate[0])
+        assert tuple(best.loc[i, ["price_change_pct", "marketing_lift_pct", "win_change_pct"]]) == levers
+        assert best.loc[i, "risk_adjusted_revenue"] == pytest.approx(score)
+        assert best.loc[i, "projected_revenue"] == pytest.approx(result.projected_revenue)
+
+        params, row_result = recommend_scenario(row)
+        assert tuple(params.values()) == levers
+        assert row_result.confidence_high == pytest.approx(result.confidence_high)
@@ -0,0 +1,95 @@
+import inspect
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from src import screening
+from src.pipeline import pipeline_stages
+from src.profiling import StageProfiler, load_profile
+from src.stages import Stage, run_stages, stage_key
+
+
+def test_unchanged_stages_are_cache_hits(tmp_path):
+    calls = []
+
+    def source():
+        calls.append("source")
+        return pd.DataFrame({"season": [2023, 2024], "wins": [80, 90]})
+
+    def total(df):
+        calls.append("total")
+        return int(df["wins"].sum())
+
+    stages = [Stage("source", source), Stage("total", total, ["source"])]
+    results, report = run_stages(stages, tmp_path)
+    assert results["total"] == 170
+    assert [r.status for r in report] == ["ran", "ran"]
+
+    results, report = run_stages(stages, tmp_path)
+    assert results["total"] == 170
+    assert [r.status for r in report] == ["cached", "cached"]
+    assert calls == ["source", "total"]
+
+    _, report = run_stages(stages, tmp_path, use_cache=False)
+    assert [r.status for r in report] == ["ran", "ran"]
+
+
+def test_missing_result_outputs_rerun_the_stage(tmp_path):
+    out = tmp_path / "out"
+
+    def write(df):
+        out.mkdir(exist_ok=True)
+        paths = [out / f"{season}.txt" for season in df["season"]]
+        for path in paths:
+            path.write_text("memo")
+        return paths
+
+    stages = [
+        Stage("source", lambda: pd.DataFrame({"season": [2023, 2024]})),
+        Stage("write", write, ["source"], result_outputs=True),
+    ]
+    run_stages(stages, tmp_path / "cache")
+    _, report = run_stages(stages, tmp_path / "cache")
+    assert report[1].status == "cached"
+
+    (out / "2023.txt").unlink()
+    _, report = run_stages(stages, tmp_path / "cache")
+    assert report[1].status == "ran"
+    assert (out / "2023.txt").exists()
+
+
+def test_screening_thresholds_invalidate_memos(tmp_path, monkeypatch):
+    memos = next(stage for stage in pipeline_stages() if stage.name == "memos")
+    before = stage_key(memos, ["dataset-hash"])
+
+    edited = tmp_path / "screening.py"
+    edited.write_text(Path(screening.__file__).read_text().replace("0.82", "0.85"))
+    sourcefile = inspect.getsourcefile
+    monkeypatch.setattr(inspect, "getsourcefile", lambda module: str(edited) if module is screening else sourcefile(module))
+    assert stage_key(memos, ["dataset-hash"]) != before
+
+
+def test_profiler_records_each_stage(tmp_path):
+    stages = [
+        Stage("source", lambda: pd.DataFrame({"season": [2023, 2024], "wins": [80, 90]})),
+        Stage("total", lambda df: int(df["wins"].sum()), ["source"]),
+    ]
+    profiler = StageProfiler(tmp_path / "profile.jsonl", cprofile_dir=tmp_path / "prof")
+    with profiler:
+        run_stages(stages, tmp_path / "cache", profiler=profiler)
+    assert not tracemalloc.is_tracing()
+
+    profile = load_profile(tmp_path / "profile.jsonl")
+    assert profile["stage"].tolist() == ["source", "total"]
+    assert profile["status"].tolist() == ["ran", "ran"]
+    assert profile.loc[0, ["rows", "columns"]].tolist() == [2, 2]
+    assert (profile["wall_seconds"] >= 0).all()
+    assert (tmp_path / "prof" / "total.prof").exists()
+
+
+def test_raw_stage_reloads_when_standings_are_live(monkeypatch):
+    monkeypatch.setenv("USE_PYBASEBALL", "0")
+    assert pipeline_stages()[0].cache
+    monkeypatch.setenv("USE_PYBASEBALL", "1")
+    assert not pipeline_stages()[0].cache
@@ -0,0 +1,11 @@
+from benchmarks.startup import APP_ENTRYPOINTS, HEAVY_MODULES, STARTUP_BUDGET_SECONDS, app_imports, importtime
+
+
+def test_app_startup_skips_heavy_modules_and_fits_budget():
+    # One interpreter importing every page's modules bounds each page alone.
+    modules = sorted({module for path in APP_ENTRYPOINTS for module in app_imports(path)})
+    assert "components.data" in modules
+    times = importtime(modules)
+    loaded = set(times["module"].str.split(".").str[0])
+    assert not loaded & set(HEAVY_MODULES)
+    assert times.loc[times["depth"] == 0, "cumulative_seconds"].sum() < STARTUP_BUDGET_SECONDS
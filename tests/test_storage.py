@@ -0,0 +1,16 @@
+import pandas as pd
+
+from src.storage import to_columnar
+
+
+def test_columnar_types_are_compact():
+    df = pd.DataFrame({
+        "team_id": ["AAA", "BBB", "AAA"],
+        "season": [2023, 2023, 2024],
+        "cpi": [45.5, 60.25, 52.0],
+    })
+    typed = to_columnar(df)
+    assert isinstance(typed["team_id"].dtype, pd.CategoricalDtype)
+    assert typed["season"].dtype.itemsize < 8
+    assert typed["cpi"].dtype == "float32"
+    assert typed["cpi"].astype(float).tolist() == df["cpi"].tolist()
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.simulator import recommend_scenarios, simulate_scenario
+from src.surfaces import load_surface, write_surfaces
+
+
+def test_surface_lookups_match_simulator(tmp_path):
+    clubs = pd.DataFrame({
+        "team_id": ["AAA", "BBB", "CCC"],
+        "season": 2024,
+        "home_attendance": [2_000_000.0, 1_500_000.0, 3_100_000.0],
+        "ticket_price_proxy": [35.0, 28.0, 52.5],
+        "price_elasticity": [np.nan, -0.6, np.nan],
+    })
+    write_surfaces(clubs, directory=tmp_path)
+    surface = load_surface(2024, directory=tmp_path)
+    assert isinstance(surface.values, np.memmap)
+    assert surface.covers(clubs.iloc[1])
+    assert not surface.covers(clubs.iloc[1].copy().replace({28.0: 30.0}))
+
+    for _, row in clubs.iterrows():
+        for levers in [(0.05, 0.1, 0.02, "Strong"), (-0.1, 0.0, -0.05, "Soft"), (0.15, 0.2, 0.1, "Neutral")]:
+            expected = simulate_scenario(row, *levers)
+            result = surface.simulate(row["team_id"], *levers)
+            assert result.projected_revenue == pytest.approx(expected.projected_revenue, rel=1e-6)
+            assert result.attendance_change_pct == pytest.approx(expected.attendance_change_pct, abs=1e-6)
+            assert result.confidence_high == pytest.approx(expected.confidence_high, rel=1e-6)
+
+    # Between lattice points attendance is interpolated exactly (it is linear
+    # in the levers); revenue, a product of price and attendance, nearly so.
+    expected = simulate_scenario(clubs.iloc[0], 0.033, 0.071, 0.015, "Neutral")
+    result = surface.simulate("AAA", 0.033, 0.071, 0.015, "Neutral")
+    assert result.projected_attendance == pytest.approx(expected.projected_attendance, rel=1e-6)
+    assert result.projected_revenue == pytest.approx(expected.projected_revenue, rel=1e-4)
+
+    recommended = surface.recommend()
+    reference = recommend_scenarios(clubs).set_index(clubs["team_id"])
+    pd.testing.assert_frame_equal(
+        recommended[["price_change_pct", "marketing_lift_pct", "win_change_pct"]],
+        reference[["price_change_pct", "marketing_lift_pct", "win_change_pct"]],
+    )
+    np.testing.assert_allclose(recommended["projected_revenue"], reference["projected_revenue"], rtol=1e-6)
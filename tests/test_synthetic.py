@@ -0,0 +1,26 @@
+import pandas as pd
+
+from src.features import load_raw_data
+from src.synthetic import GAME_COLUMNS, HOME_GAMES, write_raw_files
+from src.utils import RAW_DIR
+
+
+def test_write_raw_files_matches_raw_schemas(tmp_path):
+    counts = write_raw_files(tmp_path, n_teams=7, n_seasons=3, seed=1, games=True, chunk_rows=500)
+    assert counts["attendance"] == 21
+    assert counts["games"] == 21 * HOME_GAMES
+
+    raw = load_raw_data(tmp_path)
+    real = load_raw_data(RAW_DIR)
+    for name, frame in raw.items():
+        assert list(frame.columns) == list(real[name].columns)
+
+    games = pd.read_csv(tmp_path / "attendance_by_game.csv")
+    assert list(games.columns) == GAME_COLUMNS
+    totals = games.groupby(["team_id", "season"])["attendance"].sum()
+    season = raw["attendance"].set_index(["team_id", "season"])["home_attendance"]
+    assert totals.sort_index().tolist() == season.sort_index().tolist()
+
+    again = write_raw_files(tmp_path / "again", n_teams=7, n_seasons=3, seed=1, games=True, chunk_rows=500)
+    assert again == counts
+    assert (tmp_path / "again" / "attendance_by_game.csv").read_bytes() == (tmp_path / "attendance_by_game.csv").read_bytes()
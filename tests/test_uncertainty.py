@@ -0,0 +1,16 @@
+import pandas as pd
+
+from src.uncertainty import monte_carlo_bands
+
+
+def test_monte_carlo_bands_are_ordered_and_seeded():
+    clubs = pd.DataFrame({
+        "team_id": ["AAA", "BBB"],
+        "home_attendance": [2_000_000, 1_500_000],
+        "ticket_price_proxy": [35.0, 28.0],
+    })
+    bands = monte_carlo_bands(clubs, 0.05, 0.05, 0.02, n_samples=5_000, seed=7, chunk_size=1_000)
+    assert (bands["revenue_p10"] <= bands["revenue_p50"]).all()
+    assert (bands["revenue_p50"] <= bands["revenue_p90"]).all()
+    again = monte_carlo_bands(clubs, 0.05, 0.05, 0.02, n_samples=5_000, seed=7, chunk_size=1_000)
+    pd.testing.assert_frame_equal(bands, again)